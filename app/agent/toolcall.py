@@ -32,6 +32,8 @@ class ToolCallAgent(ReActAgent):
 
     tool_calls: List[ToolCall] = Field(default_factory=list)
     _current_base64_image: Optional[str] = None
+    # Set while a caller runs several requests and cleans up once at the end
+    _defer_cleanup: bool = False
 
     max_steps: int = 30
     max_observe: Optional[Union[int, bool]] = None
@@ -247,4 +249,5 @@ class ToolCallAgent(ReActAgent):
         try:
             return await super().run(request)
         finally:
-            await self.cleanup()
+            if not self._defer_cleanup:
+                await self.cleanup()
@@ -1,4 +1,5 @@
 import math
+from functools import lru_cache
 from typing import Dict, List, Optional, Union
 
 import tiktoken
@@ -54,12 +55,20 @@ class TokenCounter:
     HIGH_DETAIL_TARGET_SHORT_SIDE = 768
     TILE_SIZE = 512
 
+    # Distinct texts whose token counts are memoized per counter
+    TEXT_CACHE_SIZE = 1024
+
     def __init__(self, tokenizer):
         self.tokenizer = tokenizer
+        # The system prompt and conversation history are re-counted on every
+        # request, so encode each distinct text only once
+        self._encoded_length = lru_cache(maxsize=self.TEXT_CACHE_SIZE)(
+            lambda text: len(self.tokenizer.encode(text))
+        )
 
     def count_text(self, text: str) -> int:
         """Calculate tokens for a text string"""
-        return 0 if not text else len(self.tokenizer.encode(text))
+        return 0 if not text else self._encoded_length(text)
 
     def count_image(self, image_item: dict) -> int:
         """
@@ -228,9 +237,7 @@ class LLM:
 
     def count_tokens(self, text: str) -> int:
         """Calculate the number of tokens in a text"""
-        if not text:
-            return 0
-        return len(self.tokenizer.encode(text))
+        return self.token_counter.count_text(text)
 
     def count_message_tokens(self, messages: List[dict]) -> int:
         return self.token_counter.count_message_tokens(messages)
@@ -5,12 +5,88 @@ Provides a simplified interface to OpenCog's AtomSpace for knowledge representat
 and symbolic manipulation optimized for agent workflows.
 """
 
+import gc
 import json
-from typing import Any, Dict, List, Optional, Set, Union
-from pydantic import BaseModel, Field
+import math
+import sys
+import threading
+from functools import wraps
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+import numpy as np
+import orjson
+from pydantic import BaseModel, Field, PrivateAttr
 from app.logger import logger
 
 
+# Truth value components in [0, 1] are quantized to 0.._TV_LEVELS; the spare
+# byte value _TV_UNQUANTIZED marks components outside that range
+_TV_LEVELS = 254
+_TV_UNQUANTIZED = 255
+
+
+def _quantize_component(value: float) -> int:
+    """Quantize one truth value component to a byte."""
+    if 0.0 <= value <= 1.0:
+        return round(value * _TV_LEVELS)
+    return _TV_UNQUANTIZED
+
+
+def _pack_truth_value(truth_value: Optional[Dict[str, float]]) -> int:
+    """Pack a truth value into a uint16: strength in the high byte, confidence in the low."""
+    truth_value = truth_value or {}
+    return (
+        _quantize_component(truth_value.get("strength", 1.0)) << 8
+        | _quantize_component(truth_value.get("confidence", 1.0))
+    )
+
+
+def _pack_truth_values(truth_values: List[Dict[str, float]]) -> np.ndarray:
+    """Pack many truth values at once; vectorized equivalent of _pack_truth_value."""
+    def quantize(key):
+        values = np.fromiter((tv.get(key, 1.0) for tv in truth_values), dtype=np.float64, count=len(truth_values))
+        in_range = (values >= 0.0) & (values <= 1.0)
+        return np.where(in_range, np.round(values * _TV_LEVELS), _TV_UNQUANTIZED).astype(np.uint16)
+    
+    return quantize("strength") << 8 | quantize("confidence")
+
+
+def _threshold_bands(quantized: np.ndarray, threshold: float):
+    """
+    Compare quantized components against a threshold.
+    
+    Quantization error is at most half a level, so components more than one
+    level away from the threshold compare the same way as the exact values.
+    
+    Args:
+        quantized: Quantized components
+        threshold: Threshold on the exact values
+    
+    Returns:
+        Tuple of masks (certainly at or above threshold, too close to tell)
+    """
+    scaled = float(threshold) * _TV_LEVELS
+    if math.isnan(scaled):
+        return np.zeros(len(quantized), dtype=bool), np.ones(len(quantized), dtype=bool)
+    
+    # Integer bounds of the band, clamped to just outside the byte range
+    low = math.ceil(min(max(scaled - 1, -1.0), 256.0))
+    high = math.floor(min(max(scaled + 1, -1.0), 256.0))
+    quantized = quantized.astype(np.int16)
+    unquantized = quantized == _TV_UNQUANTIZED
+    near = unquantized | ((quantized >= low) & (quantized <= high))
+    return ~unquantized & (quantized > high), near
+
+
+def _synchronized(method):
+    """Run an AtomSpaceManager method while holding the manager's lock."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class Atom(BaseModel):
     """Represents an OpenCog atom with type, name, and truth value."""
     
@@ -37,13 +113,99 @@ class AtomSpaceManager(BaseModel):
     """
     
     atoms: Dict[int, Atom] = Field(default_factory=dict)
-    name_index: Dict[str, Set[int]] = Field(default_factory=dict)
-    type_index: Dict[str, Set[int]] = Field(default_factory=dict)
     next_id: int = Field(default=1)
+    version: int = Field(default=0, description="Incremented on every mutation")
+    generation: int = Field(default=0, description="Incremented whenever atoms may be removed")
+    
+    # Structure-of-arrays copy of the scalar atom fields, one row per atom in
+    # insertion order, for vectorized scans across the whole AtomSpace.
+    # Types and names are stored as codes interned in _type_codes/_name_codes.
+    _row_ids: np.ndarray = np.empty(0, dtype=np.int64)
+    _type_column: np.ndarray = np.empty(0, dtype=np.int32)
+    _name_column: np.ndarray = np.empty(0, dtype=np.int32)
+    _tv_packed: np.ndarray = np.empty(0, dtype=np.uint16)
+    _rows: Dict[int, int] = {}
+    _type_codes: Dict[str, int] = {}
+    _name_codes: Dict[str, int] = {}
+    
+    # Names by code and their lowercased forms, extended lazily from
+    # _name_codes by _lowered_names for vectorized substring scans
+    _code_names: List[str] = []
+    _lower_names: np.ndarray = np.empty(0, dtype=str)
+    
+    # Atom name -> atom IDs and atom type -> atom IDs, read through the
+    # name_index and type_index properties
+    _name_index: Dict[str, Set[int]] = {}
+    _type_index: Dict[str, Set[int]] = {}
+    
+    # Lowercased name trigram -> distinct atom names containing it
+    _name_trigrams: Dict[str, Set[str]] = {}
+    
+    # Set by import_from_dict and model_post_init, which leave _name_index,
+    # _type_index and _name_trigrams empty; _ensure_indexes builds them on first use
+    _indexes_stale: bool = False
+    
+    # (type, name, outgoing tuple) -> atom ID, for O(1) duplicate detection
+    _atom_keys: Dict[tuple, int] = {}
+    
+    # Memoized find_atoms_by_name results, valid while version equals
+    # _name_lookups_version
+    _name_lookups: Dict[str, List[int]] = {}
+    _name_lookups_version: int = -1
+    
+    # Compressed sparse row (indptr, indices) copies of the outgoing and
+    # incoming sets, rows indexed by atom ID, built lazily per direction and
+    # valid while (generation, next_id) equals _csr_stamp
+    _csr_arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    _csr_stamp: tuple = ()
+    
+    # Serializes mutations and memoized lookups across threads; reentrant so
+    # synchronized methods may call each other
+    _lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
     
     class Config:
         arbitrary_types_allowed = True
     
+    def model_post_init(self, __context: Any):
+        """Build the private stores for atoms passed to the constructor, e.g. from model_dump."""
+        if not self.atoms:
+            return
+        
+        atom_keys = {}
+        for atom_id, atom in self.atoms.items():
+            atom_keys.setdefault((atom.type, atom.name, tuple(atom.outgoing)), atom_id)
+        self._atom_keys = atom_keys
+        self._rebuild_columns()
+        self._indexes_stale = True
+    
+    def __eq__(self, other: Any) -> bool:
+        """Compare the public fields; the private stores are derived from them."""
+        if not isinstance(other, AtomSpaceManager):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in type(self).model_fields)
+    
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "AtomSpaceManager":
+        """Deep copy the AtomSpace under its lock, giving the copy a fresh lock."""
+        memo = {} if memo is None else memo
+        with self._lock:
+            # Locks cannot be copied; deepcopy returns memoized objects as is
+            memo[id(self._lock)] = threading.RLock()
+            return super().__deepcopy__(memo)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle state without the lock, which __setstate__ recreates."""
+        with self._lock:
+            state = super().__getstate__()
+        private = dict(state["__pydantic_private__"])
+        private.pop("_lock", None)
+        return {**state, "__pydantic_private__": private}
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        """Restore pickled state with a new lock."""
+        super().__setstate__(state)
+        self._lock = threading.RLock()
+    
+    @_synchronized
     def add_atom(self, atom_type: str, name: str, 
                  truth_value: Optional[Dict[str, float]] = None,
                  outgoing: Optional[List[int]] = None) -> int:
@@ -59,6 +221,11 @@ class AtomSpaceManager(BaseModel):
         Returns:
             ID of the created atom
         """
+        # Intern type and name so every atom shares one string object per
+        # distinct value and index lookups compare by identity
+        atom_type = sys.intern(atom_type)
+        name = sys.intern(name)
+        
         # Check if atom already exists
         existing_id = self._find_existing_atom(atom_type, name, outgoing or [])
         if existing_id:
@@ -75,41 +242,181 @@ class AtomSpaceManager(BaseModel):
         )
         
         self.atoms[atom_id] = atom
+        self._record_columns(atom_id, atom)
+        self._atom_keys[(atom_type, name, tuple(atom.outgoing))] = atom_id
         
         # Update indices
-        if name not in self.name_index:
-            self.name_index[name] = set()
-        self.name_index[name].add(atom_id)
+        self._ensure_indexes()
+        if name not in self._name_index:
+            self._name_index[name] = set()
+            self._index_name_trigrams(name)
+        self._name_index[name].add(atom_id)
         
-        if atom_type not in self.type_index:
-            self.type_index[atom_type] = set()
-        self.type_index[atom_type].add(atom_id)
+        if atom_type not in self._type_index:
+            self._type_index[atom_type] = set()
+        self._type_index[atom_type].add(atom_id)
         
         # Update incoming sets for outgoing atoms
         for out_id in atom.outgoing:
             if out_id in self.atoms:
                 self.atoms[out_id].incoming.append(atom_id)
         
-        logger.debug(f"Added atom {atom_id}: {atom_type}({name})")
+        self.version += 1
+        logger.debug("Added atom {}: {}({})", atom_id, atom_type, name)
         return atom_id
     
     def get_atom(self, atom_id: int) -> Optional[Atom]:
         """Get an atom by ID."""
         return self.atoms.get(atom_id)
     
+    def get_atoms(self, atom_ids: List[int]) -> List[Optional[Atom]]:
+        """Get several atoms by ID in one call; missing IDs map to None."""
+        get = self.atoms.get
+        return [get(atom_id) for atom_id in atom_ids]
+    
     def find_atoms_by_name(self, name: str) -> List[int]:
-        """Find all atoms with the given name."""
-        return list(self.name_index.get(name, set()))
+        """
+        Find all atoms with the given name.
+        
+        Results are memoized until the next mutation, so repeated lookups of
+        the same name return the same list object. Callers must not modify it.
+        Names no atom has are answered by a single membership test on the
+        name index, without taking the lock or adding to the memo, so probes
+        that mostly miss stay cheap.
+        
+        Args:
+            name: Atom name to look up
+        
+        Returns:
+            IDs of atoms with that name
+        """
+        if name not in self.name_index:
+            return []
+        
+        with self._lock:
+            if self._name_lookups_version != self.version:
+                self._name_lookups = {}
+                self._name_lookups_version = self.version
+            lookups = self._name_lookups
+            atom_ids = lookups.get(name)
+            if atom_ids is None:
+                atom_ids = lookups[name] = list(self._name_index.get(name, ()))
+            return atom_ids
     
     def find_atoms_by_type(self, atom_type: str) -> List[int]:
         """Find all atoms of the given type."""
         return list(self.type_index.get(atom_type, set()))
     
+    def find_atoms_by_name_substring(self, text: str) -> List[int]:
+        """
+        Find atoms whose name contains text, ignoring case.
+        
+        Names are narrowed with the trigram index before the substring check,
+        so only names sharing every trigram of the text are examined. Texts
+        shorter than a trigram are matched against all names at once with a
+        vectorized scan.
+        
+        Args:
+            text: Substring to search for
+        
+        Returns:
+            Matching atom IDs in ascending order
+        """
+        text = text.lower()
+        self._ensure_indexes()
+        
+        if len(text) < 3:
+            # Too short for the trigram index: scan every name in one vectorized pass
+            matches = np.flatnonzero(np.char.find(self._lowered_names(), text) >= 0)
+            return sorted(
+                atom_id for code in matches for atom_id in self._name_index[self._code_names[code]]
+            )
+        
+        # Bind the indexes locally: private attribute access on the model
+        # is much slower than a local lookup inside the loops below
+        name_index = self._name_index
+        trigrams = self._name_trigrams
+        postings = []
+        for i in range(len(text) - 2):
+            posting = trigrams.get(text[i:i + 3])
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        
+        atom_ids = []
+        for name in postings[0].intersection(*postings[1:]):
+            if text in name.lower():
+                atom_ids.extend(name_index[name])
+        return sorted(atom_ids)
+    
     def add_concept(self, concept: str, 
                    truth_value: Optional[Dict[str, float]] = None) -> int:
         """Add a ConceptNode to the AtomSpace."""
         return self.add_atom("ConceptNode", concept, truth_value)
     
+    @_synchronized
+    def add_concepts_bulk(self, concepts: Iterable[str],
+                          truth_value: Optional[Dict[str, float]] = None) -> List[int]:
+        """
+        Add many ConceptNodes in one call.
+        
+        Produces the same atoms and IDs as calling add_concept for each name
+        in order, but resolves the indexes once, appends the column rows in a
+        single batch and logs one message instead of one per atom.
+        
+        Args:
+            concepts: Concept names; repeated and existing names keep one atom
+            truth_value: Optional truth value for newly created concepts
+        
+        Returns:
+            Atom ID for each name, in input order
+        """
+        truth_value = truth_value or {"strength": 1.0, "confidence": 1.0}
+        self._ensure_indexes()
+        
+        atom_keys = self._atom_keys
+        atoms = self.atoms
+        name_index = self._name_index
+        name_codes = self._name_codes
+        trigrams = self._name_trigrams
+        
+        atom_ids = []
+        new_ids = []
+        new_name_codes = []
+        for name in concepts:
+            name = sys.intern(name)
+            key = ("ConceptNode", name, ())
+            atom_id = atom_keys.get(key)
+            if atom_id is None:
+                atom_id = self.next_id + len(new_ids)
+                atom_keys[key] = atom_id
+                atoms[atom_id] = Atom(type="ConceptNode", name=name, truth_value=truth_value)
+                new_ids.append(atom_id)
+                new_name_codes.append(name_codes.setdefault(name, len(name_codes)))
+                
+                if name not in name_index:
+                    name_index[name] = set()
+                    name_lower = name.lower()
+                    for i in range(len(name_lower) - 2):
+                        trigrams.setdefault(name_lower[i:i + 3], set()).add(name)
+                name_index[name].add(atom_id)
+            atom_ids.append(atom_id)
+        
+        if new_ids:
+            self._type_index.setdefault("ConceptNode", set()).update(new_ids)
+            self._append_rows(
+                new_ids,
+                self._type_codes.setdefault("ConceptNode", len(self._type_codes)),
+                new_name_codes,
+                truth_value
+            )
+            self.next_id += len(new_ids)
+            self.version += 1
+            logger.debug("Added {} concepts in bulk", len(new_ids))
+        
+        return atom_ids
+    
     def add_predicate(self, predicate: str,
                      truth_value: Optional[Dict[str, float]] = None) -> int:
         """Add a PredicateNode to the AtomSpace."""
@@ -120,6 +427,11 @@ class AtomSpaceManager(BaseModel):
         """Add an InheritanceLink between child and parent concepts."""
         child_id = self.add_concept(child)
         parent_id = self.add_concept(parent)
+        return self.add_inheritance_ids(child_id, parent_id, truth_value)
+    
+    def add_inheritance_ids(self, child_id: int, parent_id: int,
+                            truth_value: Optional[Dict[str, float]] = None) -> int:
+        """Add an InheritanceLink between concepts already resolved to atom IDs."""
         return self.add_atom("InheritanceLink", "", truth_value, [child_id, parent_id])
     
     def add_evaluation(self, predicate: str, *args: str,
@@ -127,7 +439,11 @@ class AtomSpaceManager(BaseModel):
         """Add an EvaluationLink for a predicate applied to arguments."""
         pred_id = self.add_predicate(predicate)
         arg_ids = [self.add_concept(arg) for arg in args]
-        
+        return self.add_evaluation_ids(pred_id, arg_ids, truth_value)
+    
+    def add_evaluation_ids(self, pred_id: int, arg_ids: List[int],
+                           truth_value: Optional[Dict[str, float]] = None) -> int:
+        """Add an EvaluationLink for a predicate and arguments already resolved to atom IDs."""
         if len(arg_ids) == 1:
             # Single argument - direct evaluation
             return self.add_atom("EvaluationLink", "", truth_value, [pred_id, arg_ids[0]])
@@ -158,6 +474,56 @@ class AtomSpaceManager(BaseModel):
         
         return matches
     
+    def find_low_confidence_atoms(self, threshold: float) -> List[int]:
+        """Find all atoms whose truth value confidence is below the threshold."""
+        count = len(self._rows)
+        above, near = _threshold_bands(self._tv_packed[:count] & 0xFF, threshold)
+        mask = ~above & ~near
+        
+        # Settle rows too close to the threshold on their exact truth values
+        row_ids = self._row_ids[:count]
+        near_rows = np.flatnonzero(near)
+        if len(near_rows):
+            _, confidences = self._exact_truth_values(row_ids[near_rows])
+            mask[near_rows] = confidences < np.float32(threshold)
+        return row_ids[mask].tolist()
+    
+    def find_atoms_by_truth_value(self, min_strength: float = 0.0,
+                                  min_confidence: float = 0.0,
+                                  atom_type: Optional[str] = None) -> List[int]:
+        """
+        Find atoms whose truth value meets both minimums.
+        
+        Args:
+            min_strength: Minimum truth value strength
+            min_confidence: Minimum truth value confidence
+            atom_type: Optional atom type to restrict the search to
+        
+        Returns:
+            Matching atom IDs in insertion order
+        """
+        count = len(self._rows)
+        packed = self._tv_packed[:count]
+        strength_above, strength_near = _threshold_bands(packed >> 8, min_strength)
+        confidence_above, confidence_near = _threshold_bands(packed & 0xFF, min_confidence)
+        mask = (strength_above | strength_near) & (confidence_above | confidence_near)
+        if atom_type is not None:
+            type_code = self._type_codes.get(atom_type)
+            if type_code is None:
+                return []
+            mask &= self._type_column[:count] == type_code
+        
+        # Settle rows too close to either minimum on their exact truth values
+        row_ids = self._row_ids[:count]
+        near_rows = np.flatnonzero(mask & (strength_near | confidence_near))
+        if len(near_rows):
+            strengths, confidences = self._exact_truth_values(row_ids[near_rows])
+            mask[near_rows] = (
+                (strengths >= np.float32(min_strength))
+                & (confidences >= np.float32(min_confidence))
+            )
+        return row_ids[mask].tolist()
+    
     def get_incoming(self, atom_id: int) -> List[int]:
         """Get atoms that have this atom in their outgoing set."""
         atom = self.atoms.get(atom_id)
@@ -168,61 +534,333 @@ class AtomSpaceManager(BaseModel):
         atom = self.atoms.get(atom_id)
         return atom.outgoing if atom else []
     
+    def get_incoming_view(self, atom_id: int) -> memoryview:
+        """Get the incoming set of an atom as a read-only view of the CSR store."""
+        return self._csr_view("incoming", atom_id)
+    
+    def get_outgoing_view(self, atom_id: int) -> memoryview:
+        """
+        Get the outgoing set of an atom as a read-only view of the CSR store.
+        
+        The view shares memory with the compressed sparse row arrays instead
+        of building a list. It keeps showing the state it was taken from
+        after later mutations.
+        
+        Args:
+            atom_id: Atom to look up; unknown IDs give an empty view
+        
+        Returns:
+            memoryview of int32 atom IDs
+        """
+        return self._csr_view("outgoing", atom_id)
+    
+    def get_incoming_bulk(self, atom_ids: Iterable[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the incoming sets of several atoms as flat values plus offsets."""
+        return self._csr_bulk("incoming", atom_ids)
+    
+    def get_outgoing_bulk(self, atom_ids: Iterable[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the outgoing sets of several atoms in one vectorized gather.
+        
+        Args:
+            atom_ids: Atoms to look up; unknown IDs have empty sets
+        
+        Returns:
+            Tuple of (values, offsets): the int32 IDs of all sets concatenated,
+            and int64 offsets with the set of atom_ids[i] at
+            values[offsets[i]:offsets[i + 1]]
+        """
+        return self._csr_bulk("outgoing", atom_ids)
+    
+    @_synchronized
     def update_truth_value(self, atom_id: int, truth_value: Dict[str, float]):
         """Update the truth value of an atom."""
         if atom_id in self.atoms:
             self.atoms[atom_id].truth_value = truth_value
-            logger.debug(f"Updated truth value for atom {atom_id}: {truth_value}")
+            self._record_truth_value(self._rows[atom_id], truth_value)
+            self.version += 1
+            logger.debug("Updated truth value for atom {}: {}", atom_id, truth_value)
     
     def export_to_dict(self) -> Dict[str, Any]:
         """Export AtomSpace to a dictionary for serialization."""
         return {
-            "atoms": {str(k): v.dict() for k, v in self.atoms.items()},
+            "atoms": {str(k): v.model_dump() for k, v in self.atoms.items()},
             "next_id": self.next_id
         }
     
+    def export_to_bytes(self) -> bytes:
+        """Export AtomSpace to JSON bytes, in the export_to_dict layout."""
+        return orjson.dumps(self.export_to_dict())
+    
+    def import_from_bytes(self, data: bytes):
+        """Import AtomSpace from JSON bytes written by export_to_bytes."""
+        self.import_from_dict(orjson.loads(data))
+    
+    @_synchronized
     def import_from_dict(self, data: Dict[str, Any]):
-        """Import AtomSpace from a dictionary."""
-        self.atoms = {}
-        self.name_index = {}
-        self.type_index = {}
-        
-        for atom_id_str, atom_data in data["atoms"].items():
-            atom_id = int(atom_id_str)
-            atom = Atom(**atom_data)
-            self.atoms[atom_id] = atom
-            
-            # Rebuild indices
-            if atom.name not in self.name_index:
-                self.name_index[atom.name] = set()
-            self.name_index[atom.name].add(atom_id)
+        """
+        Import AtomSpace from a dictionary.
+        
+        The name and type indexes are not rebuilt here: they are left empty
+        and marked stale, and _ensure_indexes builds them in a single scan on
+        first use, so an import that is queried little or not at all skips
+        that work.
+        
+        Args:
+            data: Result of export_to_dict
+        """
+        intern = sys.intern
+        atoms = {}
+        atom_keys = {}
+        
+        # Creating this many objects triggers repeated cyclic garbage collection
+        # passes over the growing heap, which would dominate the import; none of
+        # the objects form cycles, so collection is paused until they are built
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for atom_id_str, atom_data in data["atoms"].items():
+                atom_id = int(atom_id_str)
+                atom = atoms[atom_id] = Atom(**{
+                    **atom_data,
+                    "type": intern(atom_data["type"]),
+                    "name": intern(atom_data["name"])
+                })
+                atom_keys.setdefault((atom.type, atom.name, tuple(atom.outgoing)), atom_id)
             
-            if atom.type not in self.type_index:
-                self.type_index[atom.type] = set()
-            self.type_index[atom.type].add(atom_id)
+            self.atoms = atoms
+            self._atom_keys = atom_keys
+            self._rebuild_columns()
+            self._name_index = {}
+            self._type_index = {}
+            self._name_trigrams = {}
+            self._indexes_stale = True
+        finally:
+            if gc_enabled:
+                gc.enable()
         
         self.next_id = data["next_id"]
+        self.version += 1
+        self.generation += 1
         logger.info(f"Imported AtomSpace with {len(self.atoms)} atoms")
     
+    @property
+    def name_index(self) -> Dict[str, Set[int]]:
+        """Atom name -> atom IDs, built first if an import left it stale."""
+        self._ensure_indexes()
+        return self._name_index
+    
+    @property
+    def type_index(self) -> Dict[str, Set[int]]:
+        """Atom type -> atom IDs, built first if an import left it stale."""
+        self._ensure_indexes()
+        return self._type_index
+    
+    def _ensure_indexes(self):
+        """Build the indexes if an import left them stale, taking the lock only then."""
+        if self._indexes_stale:
+            self._build_indexes()
+    
+    @_synchronized
+    def _build_indexes(self):
+        """Build the name and type indexes and name trigrams in one scan."""
+        if not self._indexes_stale:
+            return
+        
+        name_index: Dict[str, Set[int]] = {}
+        type_index: Dict[str, Set[int]] = {}
+        for atom_id, atom in self.atoms.items():
+            atom_ids = name_index.get(atom.name)
+            if atom_ids is None:
+                atom_ids = name_index[atom.name] = set()
+            atom_ids.add(atom_id)
+            
+            atom_ids = type_index.get(atom.type)
+            if atom_ids is None:
+                atom_ids = type_index[atom.type] = set()
+            atom_ids.add(atom_id)
+        
+        trigrams: Dict[str, Set[str]] = {}
+        for name in name_index:
+            name_lower = name.lower()
+            for i in range(len(name_lower) - 2):
+                trigrams.setdefault(name_lower[i:i + 3], set()).add(name)
+        
+        self._name_index = name_index
+        self._type_index = type_index
+        self._name_trigrams = trigrams
+        self._indexes_stale = False
+    
     def _find_existing_atom(self, atom_type: str, name: str, outgoing: List[int]) -> Optional[int]:
         """Find existing atom with same type, name, and outgoing set."""
-        candidates = self.type_index.get(atom_type, set())
+        return self._atom_keys.get((atom_type, name, tuple(outgoing)))
+    
+    def _record_columns(self, atom_id: int, atom: Atom):
+        """Append an atom's scalar fields to the structure-of-arrays store."""
+        row = len(self._rows)
+        if row == len(self._row_ids):
+            # Grow geometrically so appends stay amortized O(1)
+            capacity = max(16, 2 * row)
+            self._row_ids = np.resize(self._row_ids, capacity)
+            self._type_column = np.resize(self._type_column, capacity)
+            self._name_column = np.resize(self._name_column, capacity)
+            self._tv_packed = np.resize(self._tv_packed, capacity)
+        
+        self._row_ids[row] = atom_id
+        self._type_column[row] = self._type_codes.setdefault(atom.type, len(self._type_codes))
+        self._name_column[row] = self._name_codes.setdefault(atom.name, len(self._name_codes))
+        self._record_truth_value(row, atom.truth_value)
+        self._rows[atom_id] = row
+    
+    def _append_rows(self, atom_ids: List[int], type_code: int, name_codes: List[int],
+                     truth_value: Dict[str, float]):
+        """Append column rows for several new atoms sharing a type and truth value."""
+        start = len(self._rows)
+        end = start + len(atom_ids)
+        if end > len(self._row_ids):
+            capacity = max(16, 2 * end)
+            self._row_ids = np.resize(self._row_ids, capacity)
+            self._type_column = np.resize(self._type_column, capacity)
+            self._name_column = np.resize(self._name_column, capacity)
+            self._tv_packed = np.resize(self._tv_packed, capacity)
+        
+        self._row_ids[start:end] = atom_ids
+        self._type_column[start:end] = type_code
+        self._name_column[start:end] = name_codes
+        self._tv_packed[start:end] = _pack_truth_value(truth_value)
+        self._rows.update(zip(atom_ids, range(start, end)))
+    
+    def _rebuild_columns(self):
+        """Rebuild the structure-of-arrays store from the atoms in one pass."""
+        self._reset_columns()
+        type_codes = self._type_codes
+        name_codes = self._name_codes
+        atoms = list(self.atoms.values())
+        count = len(atoms)
         
-        for atom_id in candidates:
-            atom = self.atoms[atom_id]
-            if atom.name == name and atom.outgoing == outgoing:
-                return atom_id
+        self._row_ids = np.fromiter(self.atoms, dtype=np.int64, count=count)
+        self._type_column = np.fromiter(
+            (type_codes.setdefault(atom.type, len(type_codes)) for atom in atoms),
+            dtype=np.int32, count=count
+        )
+        self._name_column = np.fromiter(
+            (name_codes.setdefault(atom.name, len(name_codes)) for atom in atoms),
+            dtype=np.int32, count=count
+        )
+        self._tv_packed = _pack_truth_values([atom.truth_value or {} for atom in atoms])
+        self._rows = dict(zip(self.atoms, range(count)))
+    
+    def _record_truth_value(self, row: int, truth_value: Optional[Dict[str, float]]):
+        """Store a truth value in the packed truth value column."""
+        self._tv_packed[row] = _pack_truth_value(truth_value)
+    
+    def _exact_truth_values(self, atom_ids: np.ndarray):
+        """Return the unquantized strengths and confidences of atoms as float32 arrays."""
+        atoms = self.atoms
+        truth_values = [atoms[atom_id].truth_value or {} for atom_id in atom_ids.tolist()]
+        return (
+            np.array([tv.get("strength", 1.0) for tv in truth_values], dtype=np.float32),
+            np.array([tv.get("confidence", 1.0) for tv in truth_values], dtype=np.float32)
+        )
+    
+    @_synchronized
+    def _csr(self, direction: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the (indptr, indices) arrays of the "outgoing" or "incoming" sets.
         
-        return None
+        Atoms are never removed without a generation bump and every insert
+        advances next_id, so the arrays are rebuilt only when (generation,
+        next_id) changes; truth value updates leave them valid.
+        """
+        stamp = (self.generation, self.next_id)
+        if self._csr_stamp != stamp:
+            self._csr_arrays = {}
+            self._csr_stamp = stamp
+        arrays = self._csr_arrays.get(direction)
+        if arrays is None:
+            atoms = self.atoms
+            atom_ids = sorted(atoms)
+            sets = [getattr(atoms[atom_id], direction) for atom_id in atom_ids]
+            
+            lengths = np.zeros(self.next_id + 1, dtype=np.int64)
+            lengths[np.asarray(atom_ids, dtype=np.int64) + 1] = [len(ids) for ids in sets]
+            indptr = np.cumsum(lengths)
+            indices = np.fromiter(chain.from_iterable(sets), dtype=np.int32, count=int(indptr[-1]))
+            
+            # Views are handed out to callers, so keep the arrays immutable
+            indptr.flags.writeable = False
+            indices.flags.writeable = False
+            arrays = self._csr_arrays[direction] = (indptr, indices)
+        return arrays
+    
+    def _csr_view(self, direction: str, atom_id: int) -> memoryview:
+        """Return one atom's set in a direction as a view of the CSR indices."""
+        indptr, indices = self._csr(direction)
+        if not 0 < atom_id < len(indptr) - 1:
+            return memoryview(indices)[0:0]
+        return memoryview(indices)[int(indptr[atom_id]):int(indptr[atom_id + 1])]
+    
+    def _csr_bulk(self, direction: str, atom_ids: Iterable[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Gather several atoms' sets in a direction into flat values plus offsets."""
+        indptr, indices = self._csr(direction)
+        atom_ids = np.fromiter(atom_ids, dtype=np.int64)
+        
+        # Unknown IDs read row 0, which is always empty
+        atom_ids[(atom_ids < 0) | (atom_ids >= len(indptr) - 1)] = 0
+        starts = indptr[atom_ids]
+        lengths = indptr[atom_ids + 1] - starts
+        offsets = np.zeros(len(atom_ids) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        
+        # Position of every gathered value in indices: its row start plus its
+        # index within the row
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return indices[positions], offsets
+    
+    def _index_name_trigrams(self, name: str):
+        """Add a newly seen atom name to the trigram index."""
+        name_lower = name.lower()
+        for i in range(len(name_lower) - 2):
+            self._name_trigrams.setdefault(name_lower[i:i + 3], set()).add(name)
+    
+    def _lowered_names(self) -> np.ndarray:
+        """Return the lowercased atom names indexed by name code."""
+        known = len(self._code_names)
+        if known < len(self._name_codes):
+            new_names = list(islice(self._name_codes, known, None))
+            self._code_names.extend(new_names)
+            self._lower_names = np.concatenate(
+                [self._lower_names, np.array([name.lower() for name in new_names], dtype=str)]
+            )
+        return self._lower_names
+    
+    def _reset_columns(self):
+        """Drop all rows from the structure-of-arrays store."""
+        self._row_ids = np.empty(0, dtype=np.int64)
+        self._type_column = np.empty(0, dtype=np.int32)
+        self._name_column = np.empty(0, dtype=np.int32)
+        self._tv_packed = np.empty(0, dtype=np.uint16)
+        self._rows = {}
+        self._type_codes = {}
+        self._name_codes = {}
+        self._code_names = []
+        self._lower_names = np.empty(0, dtype=str)
     
     def size(self) -> int:
         """Return the number of atoms in the AtomSpace."""
         return len(self.atoms)
     
+    @_synchronized
     def clear(self):
         """Clear all atoms from the AtomSpace."""
         self.atoms.clear()
-        self.name_index.clear()
-        self.type_index.clear()
+        self._name_index = {}
+        self._type_index = {}
+        self._name_trigrams = {}
+        self._indexes_stale = False
+        self._atom_keys = {}
+        self._reset_columns()
         self.next_id = 1
+        self.version += 1
+        self.generation += 1
         logger.info("AtomSpace cleared")
\ No newline at end of file
@@ -5,10 +5,13 @@ Extends the ToolCallAgent with symbolic reasoning, knowledge representation,
 and advanced pattern matching capabilities from OpenCog.
 """
 
-from typing import Dict, List, Optional, Any
+import json
+from collections import OrderedDict
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple, Any
 from pydantic import Field
 from app.agent.toolcall import ToolCallAgent
 from app.logger import logger
+from app.opencog import kb_io
 from app.opencog.atomspace import AtomSpaceManager
 from app.opencog.reasoning import ReasoningEngine
 from app.opencog.pattern_matcher import PatternMatcher
@@ -22,6 +25,67 @@ from app.opencog.tools.knowledge_query_tool import KnowledgeQueryTool
 from app.prompt.opencog.cognitive_agent import COGNITIVE_AGENT_SYSTEM_PROMPT, COGNITIVE_AGENT_NEXT_STEP_PROMPT
 
 
+# Keys populated in query_knowledge results when no projection is requested
+QUERY_RESULT_FIELDS = frozenset({"atom_id", "type", "name", "truth_value", "relevance", "bindings"})
+
+# Number of query_knowledge result lists kept, valid until the AtomSpace changes
+QUERY_CACHE_SIZE = 1024
+
+
+def read_knowledge_file(filepath: str) -> Optional[Dict[str, Any]]:
+    """
+    Read exported knowledge from a JSON or columnar (.npz) file.
+    
+    Does not touch any agent, so it can run on a worker thread while the
+    agent that will import the knowledge is still being set up.
+    
+    Args:
+        filepath: Path to load knowledge from
+    
+    Returns:
+        Exported AtomSpace data, or None if the file could not be read
+    """
+    try:
+        if kb_io.is_columnar_path(filepath):
+            return kb_io.load(filepath)
+        with open(filepath, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Error loading knowledge: {e}")
+        return None
+
+
+def write_knowledge_file(filepath: str, knowledge_data: Dict[str, Any]) -> bool:
+    """
+    Write exported knowledge to a file.
+    
+    Paths ending in .npz get the compressed columnar format of kb_io;
+    anything else is written as JSON. Takes an already exported snapshot,
+    so it can run on a worker thread while the agent goes on using or
+    clearing its AtomSpace.
+    
+    Args:
+        filepath: Path to save knowledge
+        knowledge_data: Result of AtomSpaceManager.export_to_dict
+    
+    Returns:
+        Success status
+    """
+    try:
+        if kb_io.is_columnar_path(filepath):
+            kb_io.save(knowledge_data, filepath)
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(knowledge_data, f, indent=2)
+        
+        logger.info(f"Knowledge saved to {filepath}")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error saving knowledge: {e}")
+        return False
+
+
 class CognitiveAgent(ToolCallAgent):
     """
     Cognitive agent with OpenCog symbolic AI capabilities.
@@ -57,6 +121,18 @@ class CognitiveAgent(ToolCallAgent):
         description="Persist knowledge between agent runs"
     )
     
+    # Atom counts for get_cognitive_status, keyed by AtomSpace identity and version
+    _status_cache: Optional[tuple] = None
+    
+    # query_knowledge results keyed by (query, fields), tagged with the
+    # AtomSpace identity and version they were computed against
+    _query_cache: Optional[OrderedDict] = None
+    
+    # Knowledge already inserted through add_knowledge/add_knowledge_bulk,
+    # valid for the AtomSpace identity and generation in _seen_stamp
+    _seen_knowledge: Optional[set] = None
+    _seen_stamp: Optional[tuple] = None
+    
     # Add cognitive tools to the tool collection
     available_tools: ToolCollection = Field(
         default_factory=lambda: ToolCollection(
@@ -74,6 +150,8 @@ class CognitiveAgent(ToolCallAgent):
     
     def __init__(self, **data):
         super().__init__(**data)
+        self._query_cache = OrderedDict()
+        self._seen_knowledge = set()
         self._initialize_cognitive_systems()
         self._setup_tools()
     
@@ -145,6 +223,17 @@ class CognitiveAgent(ToolCallAgent):
         
         logger.debug("Added default knowledge to AtomSpace")
     
+    def reset_knowledge(self):
+        """
+        Reset the knowledge base to the default knowledge of a new agent.
+        
+        Reasoning rules, tools and the LLM client are kept, so this is much
+        cheaper than constructing a new agent.
+        """
+        self.atomspace.clear()
+        self._query_cache.clear()
+        self._add_default_knowledge()
+    
     async def think(self) -> bool:
         """Enhanced thinking process with symbolic reasoning."""
         # First do standard thinking
@@ -219,7 +308,20 @@ class CognitiveAgent(ToolCallAgent):
             object_: Object (for relations and facts)
             truth_value: Optional truth value
         """
+        if knowledge_type == "concept":
+            key = ("concept", subject)
+        elif knowledge_type == "relation":
+            key = ("relation", subject, object_)
+        else:
+            key = ("fact", subject, predicate, object_)
+        
+        seen = self._current_seen_knowledge()
+        if key in seen:
+            logger.debug("Skipping already added {}: {}", knowledge_type, subject)
+            return
+        
         try:
+            atom_id = None
             if knowledge_type == "concept":
                 atom_id = self.atomspace.add_concept(subject, truth_value)
                 logger.debug(f"Added concept: {subject}")
@@ -232,11 +334,14 @@ class CognitiveAgent(ToolCallAgent):
             elif knowledge_type == "fact":
                 if predicate:
                     if object_:
-                        atom_id = self.atomspace.add_evaluation(predicate, subject, object_, truth_value)
+                        atom_id = self.atomspace.add_evaluation(predicate, subject, object_, truth_value=truth_value)
                     else:
-                        atom_id = self.atomspace.add_evaluation(predicate, subject, truth_value)
+                        atom_id = self.atomspace.add_evaluation(predicate, subject, truth_value=truth_value)
                     logger.debug(f"Added fact: {predicate}({subject}, {object_ or ''})")
             
+            if atom_id is not None:
+                seen.add(key)
+            
             # Trigger reasoning if enabled
             if self.enable_auto_reasoning:
                 # Run a limited reasoning cycle
@@ -247,16 +352,147 @@ class CognitiveAgent(ToolCallAgent):
         except Exception as e:
             logger.error(f"Error adding knowledge: {e}")
     
-    def query_knowledge(self, query: str) -> List[Dict[str, Any]]:
+    def _current_seen_knowledge(self) -> set:
+        """
+        Return the set of knowledge keys already inserted into the AtomSpace.
+        
+        The set is emptied whenever the AtomSpace is replaced, cleared or
+        re-imported, since its atoms may no longer be present.
+        """
+        stamp = (id(self.atomspace), self.atomspace.generation)
+        if stamp != self._seen_stamp:
+            self._seen_knowledge.clear()
+            self._seen_stamp = stamp
+        return self._seen_knowledge
+    
+    def add_knowledge_bulk(self, concepts: Iterable[str] = (),
+                           relations: Iterable[Tuple[str, str]] = (),
+                           facts: Iterable[Tuple[str, str, Optional[str]]] = (),
+                           truth_value: Optional[Dict[str, float]] = None):
+        """
+        Add a batch of knowledge to the cognitive agent's knowledge base.
+        
+        Repeated entries and entries added earlier are skipped before
+        insertion, and auto-reasoning runs once for the whole batch instead
+        of once per item.
+        
+        Args:
+            concepts: Concept names
+            relations: (child, parent) inheritance pairs
+            facts: (subject, predicate, object) triples; object may be None
+            truth_value: Optional truth value applied to every added atom
+        """
+        try:
+            seen = self._current_seen_knowledge()
+            concepts = [c for c in dict.fromkeys(concepts) if ("concept", c) not in seen]
+            relations = [r for r in dict.fromkeys(relations) if ("relation", *r) not in seen]
+            facts = [f for f in dict.fromkeys(facts) if ("fact", *f) not in seen]
+            if not (concepts or relations or facts):
+                logger.debug("Skipping knowledge batch: everything already added")
+                return
+            
+            # Resolve each name to its atom ID once per batch; links are
+            # then added by ID instead of looking the names up again
+            atomspace = self.atomspace
+            concept_ids = dict(zip(concepts, atomspace.add_concepts_bulk(concepts, truth_value)))
+            predicate_ids: Dict[str, int] = {}
+            
+            def concept_id(name: str) -> int:
+                atom_id = concept_ids.get(name)
+                if atom_id is None:
+                    atom_id = concept_ids[name] = atomspace.add_concept(name)
+                return atom_id
+            
+            for child, parent in relations:
+                atomspace.add_inheritance_ids(concept_id(child), concept_id(parent), truth_value)
+            
+            for subject, predicate, object_ in facts:
+                pred_id = predicate_ids.get(predicate)
+                if pred_id is None:
+                    pred_id = predicate_ids[predicate] = atomspace.add_predicate(predicate)
+                arg_ids = [concept_id(subject), concept_id(object_)] if object_ else [concept_id(subject)]
+                atomspace.add_evaluation_ids(pred_id, arg_ids, truth_value)
+            
+            seen.update(("concept", c) for c in concepts)
+            seen.update(("relation", *r) for r in relations)
+            seen.update(("fact", *f) for f in facts)
+            
+            logger.debug(
+                "Added knowledge batch: {} concepts, {} relations, {} facts",
+                len(concepts), len(relations), len(facts)
+            )
+            
+            # Trigger reasoning once for the whole batch
+            if self.enable_auto_reasoning:
+                inferences = self.reasoning_engine.forward_chain(max_inferences=3)
+                if inferences:
+                    logger.debug("Knowledge batch triggered {} inferences", len(inferences))
+        
+        except Exception as e:
+            logger.error("Error adding knowledge batch: {}", e)
+    
+    def query_knowledge(self, query: str,
+                        fields: Optional[AbstractSet[str]] = None) -> List[Dict[str, Any]]:
         """
         Query the knowledge base.
         
+        Results are cached per query until the AtomSpace is next modified.
+        
         Args:
             query: Natural language or pattern query
+            fields: Optional subset of QUERY_RESULT_FIELDS to populate in each
+                result; all fields are included when omitted
             
         Returns:
             List of relevant knowledge items
         """
+        key = (query, None if fields is None else frozenset(fields))
+        version = (id(self.atomspace), self.atomspace.version)
+        cached = self._query_cache.get(key)
+        if cached is not None and cached[0] == version:
+            self._query_cache.move_to_end(key)
+            return [dict(item) for item in cached[1]]
+        
+        results = self._run_query(query, fields)
+        
+        # Only cache successful queries against the AtomSpace state they saw
+        if results is not None and version == (id(self.atomspace), self.atomspace.version):
+            self._query_cache[key] = (version, results)
+            self._query_cache.move_to_end(key)
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+            return [dict(item) for item in results]
+        
+        return results or []
+    
+    def query_knowledge_batch(self, queries: Iterable[str],
+                              fields: Optional[AbstractSet[str]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Query the knowledge base with several queries at once.
+        
+        Each distinct query is run once; every position in the batch
+        receives its own copies of the result items.
+        
+        Args:
+            queries: Natural language or pattern queries
+            fields: Optional subset of QUERY_RESULT_FIELDS to populate in each
+                result; all fields are included when omitted
+        
+        Returns:
+            One list of relevant knowledge items per query, in query order
+        """
+        queries = list(queries)
+        results = {query: self.query_knowledge(query, fields) for query in dict.fromkeys(queries)}
+        return [[dict(item) for item in results[query]] for query in queries]
+    
+    def _run_query(self, query: str,
+                   fields: Optional[AbstractSet[str]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Run a knowledge query against the reasoning engine and pattern matcher.
+        
+        Returns:
+            List of knowledge items, or None if the query failed
+        """
         try:
             # Try reasoning-based query first
             reasoning_results = self.reasoning_engine.query_knowledge(query)
@@ -264,33 +500,52 @@ class CognitiveAgent(ToolCallAgent):
             # Try pattern matching
             pattern_results = self.pattern_matcher.match_query(query)
             
-            # Combine and deduplicate results
-            all_results = reasoning_results.copy()
+            # Combine and deduplicate candidates as (relevance, atom_id, bindings)
+            candidates = [
+                (r.get("relevance", 0), r["atom_id"], None) for r in reasoning_results
+            ]
+            seen_ids = {atom_id for _, atom_id, _ in candidates}
             
             for match in pattern_results:
-                atom = self.atomspace.get_atom(match.atom_id)
-                if atom:
-                    result_item = {
-                        "atom_id": match.atom_id,
-                        "type": atom.type,
-                        "name": atom.name,
-                        "truth_value": atom.truth_value,
-                        "relevance": match.score,
-                        "bindings": match.bindings
-                    }
-                    
-                    # Check for duplicates
-                    if not any(r.get("atom_id") == match.atom_id for r in all_results):
-                        all_results.append(result_item)
+                if match.atom_id not in seen_ids and self.atomspace.get_atom(match.atom_id):
+                    seen_ids.add(match.atom_id)
+                    candidates.append((match.score, match.atom_id, match.bindings))
             
             # Sort by relevance
-            all_results.sort(key=lambda x: x.get("relevance", 0), reverse=True)
+            candidates.sort(key=lambda x: x[0], reverse=True)
             
-            return all_results[:20]  # Return top 20 results
+            # Only build result dicts for the top 20 results
+            wanted = QUERY_RESULT_FIELDS if fields is None else fields
+            return [
+                self._knowledge_item(atom_id, relevance, bindings, wanted)
+                for relevance, atom_id, bindings in candidates[:20]
+            ]
             
         except Exception as e:
             logger.error(f"Error querying knowledge: {e}")
-            return []
+            return None
+    
+    def _knowledge_item(self, atom_id: int, relevance: float,
+                        bindings: Optional[Dict[str, Any]],
+                        fields: AbstractSet[str]) -> Dict[str, Any]:
+        """Build a query result dict containing only the requested fields."""
+        atom = self.atomspace.get_atom(atom_id)
+        item = {}
+        
+        if "atom_id" in fields:
+            item["atom_id"] = atom_id
+        if "type" in fields:
+            item["type"] = atom.type
+        if "name" in fields:
+            item["name"] = atom.name
+        if "truth_value" in fields:
+            item["truth_value"] = atom.truth_value
+        if "relevance" in fields:
+            item["relevance"] = relevance
+        if bindings is not None and "bindings" in fields:
+            item["bindings"] = bindings
+        
+        return item
     
     def explain_reasoning(self, atom_id: int) -> Dict[str, Any]:
         """
@@ -310,13 +565,20 @@ class CognitiveAgent(ToolCallAgent):
     
     def get_cognitive_status(self) -> Dict[str, Any]:
         """Get status of cognitive systems."""
+        # Atom counts only change when the AtomSpace does
+        cache_key = (id(self.atomspace), self.atomspace.version)
+        if self._status_cache is None or self._status_cache[0] != cache_key:
+            self._status_cache = (cache_key, {
+                "atomspace_size": self.atomspace.size(),
+                "total_atoms": len(self.atomspace.atoms),
+                "concept_nodes": len(self.atomspace.type_index.get("ConceptNode", ())),
+                "predicate_nodes": len(self.atomspace.type_index.get("PredicateNode", ())),
+                "inheritance_links": len(self.atomspace.type_index.get("InheritanceLink", ())),
+                "evaluation_links": len(self.atomspace.type_index.get("EvaluationLink", ()))
+            })
+        
         return {
-            "atomspace_size": self.atomspace.size(),
-            "total_atoms": len(self.atomspace.atoms),
-            "concept_nodes": len(self.atomspace.find_atoms_by_type("ConceptNode")),
-            "predicate_nodes": len(self.atomspace.find_atoms_by_type("PredicateNode")),
-            "inheritance_links": len(self.atomspace.find_atoms_by_type("InheritanceLink")),
-            "evaluation_links": len(self.atomspace.find_atoms_by_type("EvaluationLink")),
+            **self._status_cache[1],
             "reasoning_rules": len(self.reasoning_engine.rules),
             "auto_reasoning": self.enable_auto_reasoning,
             "knowledge_persistence": self.knowledge_persistence
@@ -333,18 +595,12 @@ class CognitiveAgent(ToolCallAgent):
             Success status
         """
         try:
-            import json
             knowledge_data = self.atomspace.export_to_dict()
-            
-            with open(filepath, 'w') as f:
-                json.dump(knowledge_data, f, indent=2)
-            
-            logger.info(f"Knowledge saved to {filepath}")
-            return True
-            
         except Exception as e:
             logger.error(f"Error saving knowledge: {e}")
             return False
+        
+        return write_knowledge_file(filepath, knowledge_data)
     
     def load_knowledge(self, filepath: str) -> bool:
         """
@@ -356,25 +612,64 @@ class CognitiveAgent(ToolCallAgent):
         Returns:
             Success status
         """
-        try:
-            import json
-            
-            with open(filepath, 'r') as f:
-                knowledge_data = json.load(f)
+        knowledge_data = read_knowledge_file(filepath)
+        if knowledge_data is None:
+            return False
+        
+        if self.import_knowledge(knowledge_data):
+            logger.info(f"Knowledge loaded from {filepath}")
+            return True
+        return False
+    
+    def import_knowledge(self, knowledge_data: Dict[str, Any]) -> bool:
+        """
+        Replace current knowledge with exported AtomSpace data.
+        
+        Args:
+            knowledge_data: Data from read_knowledge_file or export_to_dict
             
+        Returns:
+            Success status
+        """
+        try:
             self.atomspace.import_from_dict(knowledge_data)
             
             # Reinitialize connected systems
             self.reasoning_engine.atomspace = self.atomspace
             self.pattern_matcher.atomspace = self.atomspace
-            
-            logger.info(f"Knowledge loaded from {filepath}")
             return True
             
         except Exception as e:
             logger.error(f"Error loading knowledge: {e}")
             return False
     
+    async def run_many(self, requests: Iterable[str]) -> List[str]:
+        """
+        Run several requests as one session.
+        
+        Requests run in order on the same conversation and knowledge base, so
+        each LLM call after the first shares the previous prompt as a prefix
+        that the provider can reuse. run() normally cleans up (and so clears
+        the AtomSpace) after every request; here cleanup is deferred to the end.
+        
+        Args:
+            requests: User requests to process
+        
+        Returns:
+            The execution summary of each request, in order
+        """
+        results = []
+        self._defer_cleanup = True
+        try:
+            for request in requests:
+                # Every request gets the full step budget
+                self.current_step = 0
+                results.append(await self.run(request))
+        finally:
+            self._defer_cleanup = False
+            await self.cleanup()
+        return results
+    
     async def cleanup(self):
         """Cleanup cognitive agent with optional knowledge persistence."""
         if self.knowledge_persistence:
@@ -411,18 +706,27 @@ class CognitiveAgent(ToolCallAgent):
             stats = self.get_cognitive_status()
             validation_results["statistics"] = stats
             
-            # Check for circular inheritance
+            # Check for circular inheritance. Build the child -> parent graph
+            # once; a link that is one of its edges closes a cycle exactly when
+            # its child and parent share a strongly connected component.
             inheritance_links = self.atomspace.find_atoms_by_type("InheritanceLink")
+            parents = self._inheritance_parents()
+            components = self._inheritance_components(parents)
             circular_chains = []
             
             for link_id in inheritance_links:
                 link_atom = self.atomspace.get_atom(link_id)
                 if link_atom and len(link_atom.outgoing) == 2:
                     child_id, parent_id = link_atom.outgoing
+                    child_atom = self.atomspace.get_atom(child_id)
                     
-                    # Simple cycle detection (could be enhanced)
-                    if self._has_inheritance_path(parent_id, child_id):
-                        child_atom = self.atomspace.get_atom(child_id)
+                    if child_atom and link_id in child_atom.incoming:
+                        circular = child_id == parent_id or components[child_id] == components[parent_id]
+                    else:
+                        # Not recorded on its child, so not an edge of the graph
+                        circular = self._has_inheritance_path(parent_id, child_id, parents)
+                    
+                    if circular:
                         parent_atom = self.atomspace.get_atom(parent_id)
                         if child_atom and parent_atom:
                             circular_chains.append(f"{child_atom.name} -> {parent_atom.name}")
@@ -471,29 +775,88 @@ class CognitiveAgent(ToolCallAgent):
                 "issues": [{"type": "validation_error", "description": str(e)}]
             }
     
-    def _has_inheritance_path(self, start_id: int, target_id: int, visited: Optional[set] = None) -> bool:
-        """Check if there's an inheritance path from start to target (for cycle detection)."""
-        if visited is None:
-            visited = set()
+    def _inheritance_parents(self) -> Dict[int, List[int]]:
+        """
+        Build the inheritance graph as a child -> parents adjacency mapping.
         
-        if start_id in visited:
-            return False
+        Edges come from two-atom InheritanceLinks recorded in their child's
+        incoming set, the same edges get_incoming exposes. Every atom on an
+        edge has an entry.
+        """
+        atoms = self.atomspace.atoms
+        parents: Dict[int, List[int]] = {}
+        for link_id in self.atomspace.type_index.get("InheritanceLink", ()):
+            outgoing = atoms[link_id].outgoing
+            if len(outgoing) == 2:
+                child = atoms.get(outgoing[0])
+                if child is not None and link_id in child.incoming:
+                    parents.setdefault(outgoing[0], []).append(outgoing[1])
+                    parents.setdefault(outgoing[1], [])
+        return parents
+    
+    def _inheritance_components(self, parents: Dict[int, List[int]]) -> Dict[int, int]:
+        """
+        Label atoms by strongly connected component of the inheritance graph.
         
-        if start_id == target_id:
-            return True
+        Uses an iterative Tarjan search, so deep hierarchies cannot exhaust
+        the recursion limit.
         
-        visited.add(start_id)
+        Args:
+            parents: Graph from _inheritance_parents
         
-        # Find inheritance links where start_id is the child
-        incoming_links = self.atomspace.get_incoming(start_id)
-        for link_id in incoming_links:
-            link_atom = self.atomspace.get_atom(link_id)
-            if (link_atom and link_atom.type == "InheritanceLink" and 
-                len(link_atom.outgoing) == 2 and link_atom.outgoing[0] == start_id):
-                parent_id = link_atom.outgoing[1]
-                if self._has_inheritance_path(parent_id, target_id, visited.copy()):
-                    return True
+        Returns:
+            Mapping from atom ID to component number for every atom in parents
+        """
+        index: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        components: Dict[int, int] = {}
+        stack: List[int] = []
         
+        for root in parents:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            work = [(root, iter(parents[root]))]
+            
+            while work:
+                node, edges = work[-1]
+                for parent in edges:
+                    if parent not in index:
+                        index[parent] = lowlink[parent] = len(index)
+                        stack.append(parent)
+                        work.append((parent, iter(parents[parent])))
+                        break
+                    if parent not in components:
+                        lowlink[node] = min(lowlink[node], index[parent])
+                else:
+                    work.pop()
+                    if work:
+                        caller = work[-1][0]
+                        lowlink[caller] = min(lowlink[caller], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = len(components)
+                        while True:
+                            member = stack.pop()
+                            components[member] = component
+                            if member == node:
+                                break
+        
+        return components
+    
+    def _has_inheritance_path(self, start_id: int, target_id: int,
+                              parents: Dict[int, List[int]]) -> bool:
+        """Check if there's an inheritance path from start to target (for cycle detection)."""
+        visited = {start_id}
+        pending = [start_id]
+        while pending:
+            atom_id = pending.pop()
+            if atom_id == target_id:
+                return True
+            for parent_id in parents.get(atom_id, ()):
+                if parent_id not in visited:
+                    visited.add(parent_id)
+                    pending.append(parent_id)
         return False
     
     def generate_knowledge_insights(self) -> Dict[str, Any]:
@@ -0,0 +1,130 @@
+"""
+On-disk cache of knowledge bases for OpenManus cognitive agents.
+
+Building the same knowledge into a fresh agent on every run (demos, sample
+domains) repeats identical AtomSpace work. This module stores the AtomSpace
+that results from a set of insertions and restores it on later runs.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from app.logger import logger
+
+
+# Default location of cached AtomSpace snapshots
+DEFAULT_CACHE_DIR = Path.home() / ".opencog_cache"
+
+# Part of every cache key; bump when the snapshot layout changes
+CACHE_FORMAT_VERSION = 1
+
+# id(AtomSpace) -> (weak reference, (generation, version), digest of its
+# contents). AtomSpaces are unhashable, so entries are keyed by id and removed
+# when the AtomSpace is collected. Entries are recorded by load_or_build, whose
+# cache key identifies the state it leaves, so chained loads never serialize
+# the AtomSpace to key the next one.
+_state_digests: Dict[int, Tuple[weakref.ref, Tuple[int, int], str]] = {}
+
+
+def _state_digest(atomspace) -> str:
+    """Return a digest of the AtomSpace contents, reusing the recorded one while unchanged."""
+    recorded = _state_digests.get(id(atomspace))
+    if (recorded is not None and recorded[0]() is atomspace
+            and recorded[1] == (atomspace.generation, atomspace.version)):
+        return recorded[2]
+    
+    digest = hashlib.sha256(
+        json.dumps(atomspace.export_to_dict(), sort_keys=True).encode()
+    ).hexdigest()
+    _record_state(atomspace, digest)
+    return digest
+
+
+def _record_state(atomspace, digest: str):
+    """Record the digest identifying the AtomSpace's current state."""
+    key = id(atomspace)
+    ref = weakref.ref(atomspace, lambda _: _state_digests.pop(key, None))
+    _state_digests[key] = (ref, (atomspace.generation, atomspace.version), digest)
+
+
+def cache_key(agent, insertions: Any) -> str:
+    """
+    Compute the cache key for applying insertions to an agent's current state.
+    
+    The key covers the snapshot format, the insertions themselves, the
+    AtomSpace contents they are applied to, and the reasoning setup that may
+    add inferred atoms on insert. The contents are only serialized when the
+    AtomSpace has changed since load_or_build last recorded its state.
+    
+    Args:
+        agent: CognitiveAgent instance
+        insertions: Description of the knowledge to add; must have a stable repr
+    
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256(repr((CACHE_FORMAT_VERSION, insertions)).encode())
+    digest.update(repr((
+        agent.enable_auto_reasoning,
+        [rule.name for rule in agent.reasoning_engine.rules]
+    )).encode())
+    digest.update(_state_digest(agent.atomspace).encode())
+    return digest.hexdigest()
+
+
+def load_or_build(agent, insertions: Any, builder: Callable[[], None],
+                  cache_dir: Optional[Union[str, Path]] = None) -> bool:
+    """
+    Add knowledge to an agent, restoring a cached AtomSpace when available.
+    
+    On a cache miss builder is called and the resulting AtomSpace is saved
+    for the next run. Cache read and write failures fall back to building.
+    
+    Args:
+        agent: CognitiveAgent instance
+        insertions: Description of what builder adds, used in the cache key
+        builder: Callable that adds the knowledge to the agent
+        cache_dir: Directory holding snapshots (defaults to DEFAULT_CACHE_DIR)
+    
+    Returns:
+        True if the knowledge was restored from the cache
+    """
+    key = cache_key(agent, insertions)
+    path = Path(cache_dir or DEFAULT_CACHE_DIR) / f"{key}.json"
+    
+    if path.exists():
+        try:
+            agent.atomspace.import_from_bytes(path.read_bytes())
+            logger.debug("Restored knowledge base from cache {}", path)
+            _record_state(agent.atomspace, key)
+            return True
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable knowledge cache {}: {}", path, e)
+    
+    builder()
+    _record_state(agent.atomspace, key)
+    
+    data = agent.atomspace.export_to_bytes()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file of this writer's own first, so readers never
+        # see a partial snapshot and concurrent writers of a key never share one
+        tmp_file = tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False
+        )
+        try:
+            with tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_file.name, path)
+        except OSError:
+            os.unlink(tmp_file.name)
+            raise
+        logger.debug("Saved knowledge base to cache {}", path)
+    except OSError as e:
+        logger.warning("Could not write knowledge cache {}: {}", path, e)
+    
+    return False
@@ -0,0 +1,180 @@
+"""
+Columnar storage of exported knowledge bases for OpenManus cognitive agents.
+
+Knowledge exported with AtomSpaceManager.export_to_dict is stored as a
+compressed NumPy archive with one array per atom field instead of one JSON
+object per atom. Atom types and names are interned, outgoing and incoming
+sets are kept as offset/value pairs, and truth values as two float columns.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+import numpy as np
+
+
+# Version of the archive layout, stored in every file
+FORMAT_VERSION = 1
+
+# Suffix of files written in this format; other knowledge files are JSON
+KB_SUFFIX = ".npz"
+
+# Truth value keys stored as columns; values with other keys are kept as JSON
+_TV_KEYS = ("strength", "confidence")
+
+
+def is_columnar_path(path: Union[str, Path]) -> bool:
+    """Return True if path names a file in the columnar knowledge format."""
+    return Path(path).suffix == KB_SUFFIX
+
+
+def save(knowledge_data: Dict[str, Any], path: Union[str, Path]):
+    """
+    Write exported knowledge to a compressed columnar archive.
+    
+    Args:
+        knowledge_data: Result of AtomSpaceManager.export_to_dict
+        path: Destination file, normally ending in KB_SUFFIX
+    """
+    atoms = knowledge_data["atoms"]
+    types: Dict[str, int] = {}
+    names: Dict[str, int] = {}
+    count = len(atoms)
+    
+    atom_ids = np.empty(count, dtype=np.int64)
+    type_codes = np.empty(count, dtype=np.int32)
+    name_codes = np.empty(count, dtype=np.int32)
+    strengths = np.full(count, np.nan)
+    confidences = np.full(count, np.nan)
+    outgoing: List[List[int]] = []
+    incoming: List[List[int]] = []
+    extra_rows = []
+    extra_values = []
+    
+    for row, (atom_id, atom) in enumerate(atoms.items()):
+        atom_ids[row] = int(atom_id)
+        type_codes[row] = types.setdefault(atom["type"], len(types))
+        name_codes[row] = names.setdefault(atom["name"], len(names))
+        outgoing.append(atom["outgoing"])
+        incoming.append(atom["incoming"])
+        
+        truth_value = atom["truth_value"]
+        if truth_value is not None and truth_value.keys() == set(_TV_KEYS):
+            strengths[row] = truth_value["strength"]
+            confidences[row] = truth_value["confidence"]
+        else:
+            extra_rows.append(row)
+            extra_values.append(json.dumps(truth_value))
+    
+    type_bytes, type_offsets = _pack_strings(types)
+    name_bytes, name_offsets = _pack_strings(names)
+    extra_bytes, extra_offsets = _pack_strings(extra_values)
+    outgoing_values, outgoing_offsets = _pack_lists(outgoing)
+    incoming_values, incoming_offsets = _pack_lists(incoming)
+    
+    with open(path, "wb") as f:
+        np.savez_compressed(
+            f,
+            format_version=np.int64(FORMAT_VERSION),
+            next_id=np.int64(knowledge_data["next_id"]),
+            atom_ids=atom_ids,
+            type_codes=type_codes,
+            name_codes=name_codes,
+            type_bytes=type_bytes,
+            type_offsets=type_offsets,
+            name_bytes=name_bytes,
+            name_offsets=name_offsets,
+            strengths=strengths,
+            confidences=confidences,
+            extra_tv_rows=np.array(extra_rows, dtype=np.int64),
+            extra_tv_bytes=extra_bytes,
+            extra_tv_offsets=extra_offsets,
+            outgoing_values=outgoing_values,
+            outgoing_offsets=outgoing_offsets,
+            incoming_values=incoming_values,
+            incoming_offsets=incoming_offsets,
+        )
+
+
+def load(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Read a columnar archive back into export_to_dict form.
+    
+    Args:
+        path: File written by save
+    
+    Returns:
+        Data accepted by AtomSpaceManager.import_from_dict
+    
+    Raises:
+        ValueError: If the file is not a supported columnar archive
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        if "format_version" not in archive or int(archive["format_version"]) != FORMAT_VERSION:
+            raise ValueError(f"Unsupported knowledge archive format in {path}")
+        columns = {key: archive[key] for key in archive.files}
+    
+    types = _unpack_strings(columns["type_bytes"], columns["type_offsets"])
+    names = _unpack_strings(columns["name_bytes"], columns["name_offsets"])
+    outgoing = _unpack_lists(columns["outgoing_values"], columns["outgoing_offsets"])
+    incoming = _unpack_lists(columns["incoming_values"], columns["incoming_offsets"])
+    
+    truth_values: List[Any] = [
+        {"strength": strength, "confidence": confidence}
+        for strength, confidence in zip(columns["strengths"].tolist(), columns["confidences"].tolist())
+    ]
+    extra_values = _unpack_strings(columns["extra_tv_bytes"], columns["extra_tv_offsets"])
+    for row, value in zip(columns["extra_tv_rows"].tolist(), extra_values):
+        truth_values[row] = json.loads(value)
+    
+    atoms = {}
+    rows = zip(
+        columns["atom_ids"].tolist(), columns["type_codes"].tolist(), columns["name_codes"].tolist(),
+        truth_values, incoming, outgoing
+    )
+    for atom_id, type_code, name_code, truth_value, atom_incoming, atom_outgoing in rows:
+        atoms[str(atom_id)] = {
+            "type": types[type_code],
+            "name": names[name_code],
+            "truth_value": truth_value,
+            "incoming": atom_incoming,
+            "outgoing": atom_outgoing,
+        }
+    
+    return {"atoms": atoms, "next_id": int(columns["next_id"])}
+
+
+def _pack_strings(strings) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode strings as one UTF-8 byte array plus end offsets."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.cumsum([len(b) for b in encoded], dtype=np.int64)
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(data: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """Decode strings packed by _pack_strings."""
+    raw = data.tobytes()
+    strings = []
+    start = 0
+    for end in offsets.tolist():
+        strings.append(raw[start:end].decode("utf-8"))
+        start = end
+    return strings
+
+
+def _pack_lists(lists: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Flatten integer lists into one value array plus end offsets."""
+    offsets = np.cumsum([len(values) for values in lists], dtype=np.int64)
+    flat = [value for values in lists for value in values]
+    return np.array(flat, dtype=np.int64), offsets
+
+
+def _unpack_lists(values: np.ndarray, offsets: np.ndarray) -> List[List[int]]:
+    """Split a flattened value array back into lists."""
+    flat = values.tolist()
+    lists = []
+    start = 0
+    for end in offsets.tolist():
+        lists.append(flat[start:end])
+        start = end
+    return lists
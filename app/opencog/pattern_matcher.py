@@ -6,12 +6,42 @@ and knowledge retrieval from the AtomSpace.
 """
 
 import re
-from typing import Dict, List, Optional, Set, Any, Union
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set, Any, Tuple, Union
+import numpy as np
 from pydantic import BaseModel, Field
 from app.logger import logger
 from app.opencog.atomspace import AtomSpaceManager, Atom
 
 
+# Simple query syntax: Type(name) or Type($variable)
+TYPED_QUERY_RE = re.compile(r"(\w+)\(([^)]+)\)")
+
+
+@lru_cache(maxsize=512)
+def _compile_query(query_str: str) -> Optional[Tuple[Optional[str], str, bool]]:
+    """
+    Parse a query string into (atom_type, name, is_variable).
+    
+    Agents repeat the same queries often, so parsed forms are cached.
+    """
+    query_str = query_str.strip()
+    
+    match = TYPED_QUERY_RE.match(query_str)
+    if match:
+        atom_type, name = match.groups()
+        if name.startswith("$"):
+            return atom_type, name[1:], True
+        return atom_type, name, False
+    
+    # Simple concept search: just a name
+    if query_str and not query_str.startswith("$"):
+        return None, query_str, False
+    
+    return None
+
+
 class Variable(BaseModel):
     """Represents a pattern matching variable."""
     
@@ -120,67 +150,77 @@ class PatternMatcher(BaseModel):
             variables=variables
         )
     
-    def match_pattern(self, pattern: Pattern) -> List[MatchResult]:
+    def match_pattern(self, pattern: Pattern,
+                      max_results: Optional[int] = None) -> List[MatchResult]:
         """
         Match a pattern against the AtomSpace.
         
         Args:
             pattern: Pattern to match
+            max_results: Result limit for this call (defaults to self.max_results)
             
         Returns:
             List of match results with variable bindings
         """
         results = []
         
-        # Get candidate atoms based on type constraint
-        if pattern.type:
-            candidates = self.atomspace.find_atoms_by_type(pattern.type)
-        else:
-            candidates = list(self.atomspace.atoms.keys())
+        # Get candidate atoms based on type and name constraints
+        candidates = self._candidate_ids(pattern)
         
-        for atom_id in candidates:
-            atom = self.atomspace.get_atom(atom_id)
+        matcher = self._compile_pattern(pattern)
+        
+        for atom_id, atom in zip(candidates, self.atomspace.get_atoms(candidates)):
             if not atom:
                 continue
             
-            match_result = self._match_atom_against_pattern(atom, atom_id, pattern)
-            if match_result:
-                results.append(match_result)
+            bindings = {}
+            score = matcher(atom, bindings, 1.0)
+            if score is not None:
+                results.append(MatchResult(
+                    atom_id=atom_id,
+                    bindings=bindings,
+                    score=score
+                ))
         
         # Sort by match score
         results.sort(key=lambda x: x.score, reverse=True)
         
         # Limit results
-        if len(results) > self.max_results:
-            results = results[:self.max_results]
+        limit = max_results or self.max_results
+        if len(results) > limit:
+            results = results[:limit]
         
-        logger.debug(f"Pattern matching found {len(results)} matches")
+        logger.debug("Pattern matching found {} matches", len(results))
         return results
     
-    def match_query(self, query_str: str) -> List[MatchResult]:
+    def match_query(self, query_str: str,
+                    max_results: Optional[int] = None) -> List[MatchResult]:
         """
         Match a string query pattern against the AtomSpace.
         
         Args:
             query_str: String representation of query pattern
+            max_results: Result limit for this call (defaults to self.max_results)
             
         Returns:
             List of match results
         """
         pattern = self._parse_query_string(query_str)
         if pattern:
-            return self.match_pattern(pattern)
+            return self.match_pattern(pattern, max_results)
         else:
             return []
     
     def find_similar_atoms(self, target_atom_id: int, 
-                          similarity_threshold: float = 0.7) -> List[MatchResult]:
+                          similarity_threshold: float = 0.7,
+                          max_results: Optional[int] = None) -> List[MatchResult]:
         """
         Find atoms similar to a target atom.
         
         Args:
             target_atom_id: ID of atom to find similarities for
             similarity_threshold: Minimum similarity score
+            max_results: Result limit for this call (defaults to self.max_results)
             
         Returns:
             List of similar atoms with similarity scores
@@ -189,12 +229,19 @@ class PatternMatcher(BaseModel):
         if not target_atom:
             return []
         
+        if similarity_threshold <= 0.0:
+            # Every atom qualifies, including other types at score 0
+            candidate_ids = [atom_id for atom_id in self.atomspace.atoms if atom_id != target_atom_id]
+        else:
+            # Atoms of other types always score 0, so only same-type atoms can pass
+            candidate_ids = sorted(self.atomspace.type_index.get(target_atom.type, set()))
+            candidate_ids = self._prune_similarity_candidates(
+                target_atom, target_atom_id, candidate_ids, similarity_threshold
+            )
+        
         results = []
         
-        for atom_id, atom in self.atomspace.atoms.items():
-            if atom_id == target_atom_id:
-                continue
-            
+        for atom_id, atom in zip(candidate_ids, self.atomspace.get_atoms(candidate_ids)):
             similarity = self._calculate_atom_similarity(target_atom, atom)
             if similarity >= similarity_threshold:
                 results.append(MatchResult(
@@ -204,173 +251,356 @@ class PatternMatcher(BaseModel):
                 ))
         
         results.sort(key=lambda x: x.score, reverse=True)
-        return results[:self.max_results]
+        return results[:max_results or self.max_results]
     
     def find_connected_atoms(self, start_atom_id: int, 
                            max_depth: int = 3,
-                           connection_types: Optional[List[str]] = None) -> List[MatchResult]:
+                           connection_types: Optional[List[str]] = None,
+                           max_results: Optional[int] = None) -> List[MatchResult]:
         """
         Find atoms connected to a starting atom through links.
         
+        Atoms are visited breadth-first, so each is reported at its shortest
+        distance from the start.
+        
         Args:
             start_atom_id: Starting atom ID
             max_depth: Maximum traversal depth
             connection_types: Optional list of link types to follow
+            max_results: Result limit for this call (defaults to self.max_results)
             
         Returns:
             List of connected atoms
         """
-        visited = set()
+        if not self.atomspace.get_atom(start_atom_id):
+            return []
+        
+        # One byte per atom ID instead of a set of visited IDs
+        visited = bytearray(self.atomspace.next_id)
+        visited[start_atom_id] = 1
+        frontier = deque([start_atom_id])
         results = []
         
-        def traverse(atom_id: int, depth: int):
-            if depth > max_depth or atom_id in visited:
-                return
-            
-            visited.add(atom_id)
-            atom = self.atomspace.get_atom(atom_id)
-            if not atom:
-                return
-            
-            # Add current atom to results (except starting atom)
-            if atom_id != start_atom_id:
+        for depth in range(1, max_depth + 1):
+            next_frontier = deque()
+            for connected_id in self._expand_frontier(frontier, visited, connection_types):
+                if visited[connected_id]:
+                    continue
+                visited[connected_id] = 1
+                next_frontier.append(connected_id)
                 results.append(MatchResult(
-                    atom_id=atom_id,
+                    atom_id=connected_id,
                     bindings={"depth": depth},
                     score=1.0 / depth  # Closer atoms have higher score
                 ))
             
-            # Traverse incoming and outgoing connections
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        
+        results.sort(key=lambda x: x.score, reverse=True)
+        return results[:max_results or self.max_results]
+    
+    def _expand_frontier(self, frontier, visited: bytearray,
+                         connection_types: Optional[List[str]]) -> List[int]:
+        """
+        Collect unvisited neighbours of the frontier that pass the type filter.
+        
+        IDs outside visited are skipped: outgoing sets may name atoms that do
+        not exist, and atoms added after the traversal started are not part of
+        its snapshot.
+        """
+        candidates = []
+        size = len(visited)
+        for atom_id in frontier:
+            atom = self.atomspace.get_atom(atom_id)
             for connected_id in atom.incoming + atom.outgoing:
+                if not 0 <= connected_id < size or visited[connected_id]:
+                    continue
                 connected_atom = self.atomspace.get_atom(connected_id)
-                if connected_atom:
-                    # Check connection type filter
-                    if connection_types is None or connected_atom.type in connection_types:
-                        traverse(connected_id, depth + 1)
+                if not connected_atom:
+                    continue
+                # Check connection type filter
+                if connection_types is not None and connected_atom.type not in connection_types:
+                    continue
+                candidates.append(connected_id)
+        return candidates
+    
+    def find_path_length(self, start_atom_id: int, target_atom_id: int,
+                         max_depth: int = 5,
+                         connection_types: Optional[List[str]] = None) -> Optional[int]:
+        """
+        Find the length of the shortest link path between two atoms.
         
-        traverse(start_atom_id, 0)
+        Unlike find_connected_atoms, the search stops as soon as the target is
+        reached instead of expanding the whole neighbourhood first.
         
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:self.max_results]
+        Args:
+            start_atom_id: Starting atom ID
+            target_atom_id: Atom ID to reach
+            max_depth: Maximum traversal depth
+            connection_types: Optional list of link types to follow
+        
+        Returns:
+            Number of hops to the target, or None if it is not reachable
+        """
+        if not self.atomspace.get_atom(start_atom_id):
+            return None
+        if start_atom_id == target_atom_id:
+            return 0
+        
+        visited = {start_atom_id}
+        frontier = [start_atom_id]
+        
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for atom_id in frontier:
+                atom = self.atomspace.get_atom(atom_id)
+                for connected_id in atom.incoming + atom.outgoing:
+                    if connected_id in visited:
+                        continue
+                    connected_atom = self.atomspace.get_atom(connected_id)
+                    if not connected_atom:
+                        continue
+                    if connection_types is not None and connected_atom.type not in connection_types:
+                        continue
+                    if connected_id == target_atom_id:
+                        return depth
+                    visited.add(connected_id)
+                    next_frontier.append(connected_id)
+            
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        
+        return None
+    
+    def _candidate_ids(self, pattern: Pattern) -> List[int]:
+        """
+        Narrow the atoms a pattern's root can match using the AtomSpace indices.
+        
+        Candidates keep the order a full scan would visit them in, so ties in
+        match score are ordered as before.
+        """
+        name = pattern.name
+        exact_name = (
+            isinstance(name, str) and not name.startswith("$")
+            and not self.enable_fuzzy_matching
+        )
+        
+        if pattern.type:
+            candidates = self.atomspace.find_atoms_by_type(pattern.type)
+            if exact_name:
+                name_ids = self.atomspace.name_index.get(name, set())
+                candidates = [atom_id for atom_id in candidates if atom_id in name_ids]
+            return candidates
+        
+        if exact_name:
+            return sorted(self.atomspace.name_index.get(name, set()))
+        if isinstance(name, Variable) and name.type_constraint:
+            return sorted(self.atomspace.type_index.get(name.type_constraint, set()))
+        
+        return list(self.atomspace.atoms.keys())
     
-    def _match_atom_against_pattern(self, atom: Atom, atom_id: int, 
-                                   pattern: Pattern) -> Optional[MatchResult]:
-        """Match a single atom against a pattern."""
-        bindings = {}
-        score = 1.0
+    def _compile_pattern(self, pattern: Pattern) -> Callable[[Atom, Dict[str, Any], float], Optional[float]]:
+        """
+        Compile a pattern into a matcher function.
+        
+        Dispatch on the kind of each constraint, regex compilation and variable
+        lookups happen once here rather than once per candidate atom. The
+        returned function takes (atom, bindings, score), records variable
+        bindings into the given dict, and returns the updated score or None if
+        the atom does not match.
+        """
+        get_atom = self.atomspace.atoms.get
+        checks = []
+        
+        def variable_check(var: Variable, bind_name: str, bind_id: bool):
+            """Check an atom against a variable's constraints and bind it."""
+            type_constraint = var.type_constraint
+            value_re = re.compile(var.value_constraint) if var.value_constraint else None
+            
+            def check(atom, atom_id, bindings):
+                if type_constraint and atom.type != type_constraint:
+                    return False
+                if value_re and not value_re.match(atom.name):
+                    return False
+                bindings[bind_name] = atom_id if bind_id else atom.name
+                return True
+            return check
         
         # Check type constraint
-        if pattern.type and atom.type != pattern.type:
-            return None
+        if pattern.type:
+            pattern_type = pattern.type
+            checks.append(lambda atom, bindings, score: score if atom.type == pattern_type else None)
         
         # Check name constraint
-        if pattern.name is not None:
-            if isinstance(pattern.name, Variable):
-                var = pattern.name
-                if var.type_constraint and atom.type != var.type_constraint:
-                    return None
-                if var.value_constraint and not re.match(var.value_constraint, atom.name):
-                    return None
-                bindings[var.name] = atom.name
-            elif isinstance(pattern.name, str):
-                if pattern.name.startswith("$"):
-                    # Variable reference
-                    var_name = pattern.name[1:]
-                    if var_name in pattern.variables:
-                        var = pattern.variables[var_name]
-                        if var.type_constraint and atom.type != var.type_constraint:
-                            return None
-                        if var.value_constraint and not re.match(var.value_constraint, atom.name):
-                            return None
-                    bindings[var_name] = atom.name
-                else:
-                    # Exact match required
-                    if self.enable_fuzzy_matching:
-                        similarity = self._calculate_string_similarity(pattern.name, atom.name)
-                        if similarity < self.fuzzy_threshold:
-                            return None
-                        score *= similarity
-                    else:
-                        if atom.name != pattern.name:
-                            return None
+        name = pattern.name
+        name_check = None
+        if isinstance(name, Variable):
+            name_check = variable_check(name, name.name, False)
+        elif isinstance(name, str) and name.startswith("$"):
+            # Variable reference, constrained only if the pattern declares it
+            var_name = name[1:]
+            name_check = variable_check(pattern.variables.get(var_name, Variable(name=var_name)), var_name, False)
+        elif isinstance(name, str):
+            if self.enable_fuzzy_matching:
+                fuzzy_threshold = self.fuzzy_threshold
+                
+                def fuzzy_name_check(atom, bindings, score):
+                    similarity = self._calculate_string_similarity(name, atom.name)
+                    if similarity < fuzzy_threshold:
+                        return None
+                    return score * similarity
+                checks.append(fuzzy_name_check)
+            else:
+                checks.append(lambda atom, bindings, score: score if atom.name == name else None)
+        
+        if name_check:
+            checks.append(lambda atom, bindings, score: score if name_check(atom, None, bindings) else None)
         
         # Check outgoing constraints
         if pattern.outgoing is not None:
-            if len(pattern.outgoing) != len(atom.outgoing):
-                return None
-            
-            for i, pattern_out in enumerate(pattern.outgoing):
-                atom_out_id = atom.outgoing[i]
-                
+            slot_checks = []
+            for pattern_out in pattern.outgoing:
                 if isinstance(pattern_out, int):
                     # Exact atom ID match
-                    if atom_out_id != pattern_out:
-                        return None
+                    slot_checks.append(
+                        lambda out_id, bindings, score, expected=pattern_out:
+                            score if out_id == expected else None
+                    )
+                elif isinstance(pattern_out, str) and pattern_out.startswith("$"):
+                    # Variable binding
+                    def bind_slot(out_id, bindings, score, var_name=pattern_out[1:]):
+                        bindings[var_name] = out_id
+                        return score
+                    slot_checks.append(bind_slot)
                 elif isinstance(pattern_out, str):
-                    if pattern_out.startswith("$"):
-                        # Variable binding
-                        var_name = pattern_out[1:]
-                        bindings[var_name] = atom_out_id
-                    else:
-                        # Match by name
-                        out_atom = self.atomspace.get_atom(atom_out_id)
-                        if not out_atom or out_atom.name != pattern_out:
+                    # Match by name
+                    def name_slot(out_id, bindings, score, expected=pattern_out):
+                        out_atom = get_atom(out_id)
+                        if not out_atom or out_atom.name != expected:
                             return None
+                        return score
+                    slot_checks.append(name_slot)
                 elif isinstance(pattern_out, Variable):
                     # Variable with constraints
-                    out_atom = self.atomspace.get_atom(atom_out_id)
-                    if not out_atom:
-                        return None
-                    
-                    if pattern_out.type_constraint and out_atom.type != pattern_out.type_constraint:
-                        return None
-                    if pattern_out.value_constraint and not re.match(pattern_out.value_constraint, out_atom.name):
-                        return None
-                    
-                    bindings[pattern_out.name] = atom_out_id
+                    def variable_slot(out_id, bindings, score,
+                                      check=variable_check(pattern_out, pattern_out.name, True)):
+                        out_atom = get_atom(out_id)
+                        if not out_atom or not check(out_atom, out_id, bindings):
+                            return None
+                        return score
+                    slot_checks.append(variable_slot)
                 elif isinstance(pattern_out, Pattern):
                     # Recursive pattern match
-                    out_atom = self.atomspace.get_atom(atom_out_id)
-                    if not out_atom:
-                        return None
-                    
-                    sub_match = self._match_atom_against_pattern(out_atom, atom_out_id, pattern_out)
-                    if not sub_match:
+                    def pattern_slot(out_id, bindings, score,
+                                     sub_matcher=self._compile_pattern(pattern_out)):
+                        out_atom = get_atom(out_id)
+                        if not out_atom:
+                            return None
+                        
+                        sub_bindings = {}
+                        sub_score = sub_matcher(out_atom, sub_bindings, 1.0)
+                        if sub_score is None:
+                            return None
+                        
+                        # Merge bindings
+                        bindings.update(sub_bindings)
+                        return score * sub_score
+                    slot_checks.append(pattern_slot)
+                else:
+                    slot_checks.append(lambda out_id, bindings, score: score)
+            
+            arity = len(slot_checks)
+            
+            def outgoing_check(atom, bindings, score):
+                if len(atom.outgoing) != arity:
+                    return None
+                for slot_check, out_id in zip(slot_checks, atom.outgoing):
+                    score = slot_check(out_id, bindings, score)
+                    if score is None:
                         return None
-                    
-                    # Merge bindings
-                    bindings.update(sub_match.bindings)
-                    score *= sub_match.score
-        
-        return MatchResult(
-            atom_id=atom_id,
-            bindings=bindings,
-            score=score
-        )
+                return score
+            checks.append(outgoing_check)
+        
+        def matcher(atom, bindings, score):
+            for check in checks:
+                score = check(atom, bindings, score)
+                if score is None:
+                    return None
+            return score
+        return matcher
     
     def _parse_query_string(self, query_str: str) -> Optional[Pattern]:
         """Parse a string query into a pattern."""
         # Simplified query parsing - extend for more complex syntax
-        query_str = query_str.strip()
+        compiled = _compile_query(query_str)
+        if compiled is None:
+            return None
         
-        # Simple pattern: Type(name)
-        match = re.match(r"(\w+)\(([^)]+)\)", query_str)
-        if match:
-            atom_type, name = match.groups()
-            
-            if name.startswith("$"):
-                # Variable
-                var = self.create_variable(name[1:])
-                return self.create_pattern(atom_type, var)
-            else:
-                # Literal name
-                return self.create_pattern(atom_type, name)
+        atom_type, name, is_variable = compiled
+        if is_variable:
+            return self.create_pattern(atom_type, self.create_variable(name))
+        return self.create_pattern(atom_type, name)
+    
+    def _prune_similarity_candidates(self, target_atom: Atom, target_atom_id: int,
+                                     candidate_ids: List[int], threshold: float) -> List[int]:
+        """
+        Drop same-type candidates whose best possible similarity is below threshold.
         
-        # Simple concept search: just a name
-        if query_str and not query_str.startswith("$"):
-            return self.create_pattern(name=query_str)
+        The structure and truth value terms of _calculate_atom_similarity are
+        computed exactly in vectorized form. The name term is bounded above by
+        the length difference, which caps how similar two names can be, so the
+        Levenshtein distance only runs for candidates that can still qualify.
+        """
+        candidate_ids = [atom_id for atom_id in candidate_ids if atom_id != target_atom_id]
+        if not candidate_ids:
+            return []
         
-        return None
+        atoms = self.atomspace.get_atoms(candidate_ids)
+        count = len(atoms)
+        name_lengths = np.fromiter((len(a.name) for a in atoms), dtype=np.float64, count=count)
+        outgoing_lengths = np.fromiter((len(a.outgoing) for a in atoms), dtype=np.int64, count=count)
+        
+        # Name similarity bound: at least |len1 - len2| edits are needed
+        target_length = len(target_atom.name)
+        max_lengths = np.maximum(name_lengths, target_length)
+        name_bound = np.where(
+            max_lengths > 0,
+            1.0 - np.abs(name_lengths - target_length) / np.maximum(max_lengths, 1.0),
+            1.0
+        )
+        if target_length == 0:
+            # Empty names only match other empty names
+            name_bound = np.where(name_lengths == 0, 1.0, 0.0)
+        
+        structure_sim = np.where(outgoing_lengths == len(target_atom.outgoing), 1.0, 0.5)
+        
+        tv_sim = np.ones(count)
+        target_tv = target_atom.truth_value
+        if target_tv:
+            has_tv = np.fromiter((bool(a.truth_value) for a in atoms), dtype=bool, count=count)
+            strengths = np.fromiter(
+                (a.truth_value.get("strength", 1.0) if a.truth_value else 1.0 for a in atoms),
+                dtype=np.float64, count=count
+            )
+            confidences = np.fromiter(
+                (a.truth_value.get("confidence", 1.0) if a.truth_value else 1.0 for a in atoms),
+                dtype=np.float64, count=count
+            )
+            tv_sim = np.where(
+                has_tv,
+                1.0 - (np.abs(strengths - target_tv.get("strength", 1.0))
+                       + np.abs(confidences - target_tv.get("confidence", 1.0))) / 2.0,
+                1.0
+            )
+        
+        upper_bound = 0.5 * name_bound + 0.3 * structure_sim + 0.2 * tv_sim
+        
+        # Small tolerance so rounding never drops an atom the exact score would keep
+        keep = np.nonzero(upper_bound >= threshold - 1e-9)[0]
+        return [candidate_ids[i] for i in keep]
     
     def _calculate_atom_similarity(self, atom1: Atom, atom2: Atom) -> float:
         """Calculate similarity between two atoms."""
@@ -6,12 +6,32 @@ backward chaining, and probabilistic logic networks (PLN) style reasoning.
 """
 
 import math
-from typing import Dict, List, Optional, Set, Tuple, Any
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
+import numpy as np
 from pydantic import BaseModel, Field
 from app.logger import logger
 from app.opencog.atomspace import AtomSpaceManager, Atom
 
 
+# Pattern fields an atom is matched against, resolved once per pattern.
+# name is the literal name to match, or None when any name matches
+# (no name, or a variable); is_var marks a variable name.
+CompiledPattern = namedtuple("CompiledPattern", "type name is_var outgoing")
+
+
+def _compile_pattern(pattern: Dict[str, Any]) -> CompiledPattern:
+    """Resolve a pattern's type and name filters for repeated matching."""
+    name = pattern.get("name")
+    is_var = isinstance(name, str) and name.startswith("$")
+    return CompiledPattern(
+        type=pattern.get("type"),
+        name=name if name and not is_var else None,
+        is_var=is_var,
+        outgoing=tuple(pattern.get("outgoing") or ())
+    )
+
+
 class Rule(BaseModel):
     """Represents a reasoning rule with premises and conclusions."""
     
@@ -115,13 +135,38 @@ class ReasoningEngine(BaseModel):
         inferences = []
         iteration = 0
         
+        # Semi-naive evaluation. Atoms are only added while chaining, so each
+        # rule tracks the first atom ID it has not seen yet, and later rounds
+        # only look for bindings with at least one premise among the atoms
+        # added since the rule last ran: once per premise position, with that
+        # premise drawn from the new atoms and the others from the whole
+        # AtomSpace. Bindings already handled in this call are skipped.
+        seen_up_to = [0] * len(self.rules)
+        derived_signatures: Set[tuple] = set()
+        
         while len(inferences) < max_inferences and iteration < self.max_iterations:
             iteration += 1
             new_inferences = []
             
-            for rule in self.rules:
-                rule_inferences = self._apply_rule_forward(rule)
-                new_inferences.extend(rule_inferences)
+            for i, rule in enumerate(self.rules):
+                delta = range(seen_up_to[i], self.atomspace.next_id)
+                seen_up_to[i] = self.atomspace.next_id
+                
+                # When every atom is new, the first premise alone covers all bindings
+                positions = range(len(rule.premises)) if delta.start > 0 else range(1)
+                for position in positions:
+                    premise_type = rule.premises[position].get("type") if rule.premises else None
+                    bucket = self.atomspace.type_index.get(premise_type, set())
+                    if len(delta) > len(bucket):
+                        candidate_ids = sorted(atom_id for atom_id in bucket if atom_id >= delta.start)
+                    else:
+                        candidate_ids = [atom_id for atom_id in delta if atom_id in bucket]
+                    if not candidate_ids and position > 0:
+                        continue
+                    
+                    new_inferences.extend(self._apply_rule_forward(
+                        rule, candidate_ids, position, derived_signatures
+                    ))
             
             if not new_inferences:
                 break  # No new inferences possible
@@ -189,14 +234,40 @@ class ReasoningEngine(BaseModel):
         
         return results
     
-    def _apply_rule_forward(self, rule: Rule) -> List[InferenceResult]:
-        """Apply a rule in forward chaining mode."""
+    def _apply_rule_forward(self, rule: Rule,
+                            candidate_ids: Optional[List[int]] = None,
+                            position: int = 0,
+                            derived_signatures: Optional[Set[tuple]] = None) -> List[InferenceResult]:
+        """
+        Apply a rule in forward chaining mode.
+        
+        Args:
+            rule: Rule to apply
+            candidate_ids: Sorted atom IDs to try against the premise at
+                position (defaults to every atom of its type)
+            position: Index of the premise the candidates are matched against
+            derived_signatures: Optional set of bindings already handled;
+                matching bindings are skipped and new ones are added
+        
+        Returns:
+            List of new inferences
+        """
         inferences = []
+        scratch = {}
         
-        # Find all possible variable bindings for the premises
-        bindings_list = self._find_variable_bindings(rule.premises)
+        # Find all possible variable bindings, matching the chosen premise first
+        premises = rule.premises[position:position + 1] + rule.premises[:position] + rule.premises[position + 1:]
+        bindings_list = self._find_variable_bindings(premises, candidate_ids)
         
         for bindings in bindings_list:
+            if derived_signatures is not None:
+                # Variable names are unique, so sorting never compares values;
+                # rules are told apart by identity since names may repeat
+                signature = (id(rule), tuple(sorted(bindings.items())))
+                if signature in derived_signatures:
+                    continue
+                derived_signatures.add(signature)
+            
             # Check if conclusion would be new
             instantiated_conclusion = self._instantiate_pattern(rule.conclusion, bindings)
             
@@ -207,7 +278,7 @@ class ReasoningEngine(BaseModel):
                 if atom_id:
                     # Calculate confidence based on premises
                     premise_ids = [
-                        self._find_atom_from_pattern(self._instantiate_pattern(p, bindings))
+                        self._find_atom_from_pattern(self._instantiate_pattern_into(p, bindings, scratch))
                         for p in rule.premises
                     ]
                     premise_ids = [pid for pid in premise_ids if pid is not None]
@@ -227,29 +298,123 @@ class ReasoningEngine(BaseModel):
         
         return inferences
     
-    def _find_variable_bindings(self, premises: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Find all possible variable bindings for a set of premises."""
+    def _find_variable_bindings(self, premises: List[Dict[str, Any]],
+                                candidate_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Find all possible variable bindings for a set of premises.
+        
+        Atoms matching the first premise are joined with the atoms matching
+        each remaining premise once instantiated with the bindings so far.
+        
+        Args:
+            premises: Premise patterns
+            candidate_ids: Sorted atom IDs to try against the first premise
+                (defaults to every atom of its type)
+        
+        Returns:
+            List of variable bindings
+        """
         if not premises:
             return [{}]
         
         # Start with first premise
         first_premise = premises[0]
+        compiled = _compile_pattern(first_premise)
         all_bindings = []
+        scratch = {}
         
         # Find atoms that match the first premise
-        for atom_id, atom in self.atomspace.atoms.items():
-            if self._atom_matches_pattern(atom, first_premise):
-                # Extract variable bindings from this match
-                bindings = self._extract_variable_bindings(atom, first_premise)
-                if bindings is not None:
-                    # Check if these bindings work for all other premises
-                    if self._validate_bindings_for_premises(bindings, premises[1:]):
-                        all_bindings.append(bindings)
+        candidate_ids = self._matching_ids(compiled, candidate_ids)
+        for atom_id, atom in zip(candidate_ids, self.atomspace.get_atoms(candidate_ids)):
+            # Extract variable bindings from this match
+            bindings = self._extract_variable_bindings(atom, first_premise)
+            if bindings is None:
+                continue
+            
+            # Extend the bindings through the remaining premises
+            partial = [bindings]
+            for premise in premises[1:]:
+                partial = [
+                    extended
+                    for bound in partial
+                    for extended in self._extend_bindings(premise, bound, scratch)
+                ]
+                if not partial:
+                    break
+            all_bindings.extend(partial)
         
         return all_bindings
     
+    def _extend_bindings(self, premise: Dict[str, Any], bindings: Dict[str, Any],
+                         scratch: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Return bindings extended by each atom matching the instantiated premise.
+        
+        Each distinct extension is returned once. A premise that binds no new
+        variables only has to match some atom, and then keeps the bindings
+        unchanged instead of repeating them once per matching atom.
+        
+        The premise is instantiated into scratch when given, which is
+        overwritten on every call.
+        """
+        instantiated = self._instantiate_pattern_into(
+            premise, bindings, scratch if scratch is not None else {}
+        )
+        compiled = _compile_pattern(instantiated)
+        
+        extended = []
+        seen = set()
+        for atom_id in sorted(self._pattern_candidates(compiled)):
+            atom = self.atomspace.get_atom(atom_id)
+            if atom is None or (compiled.name is not None and atom.name != compiled.name):
+                continue
+            new_bindings = self._extract_variable_bindings(atom, instantiated)
+            if new_bindings is None:
+                continue
+            if not new_bindings:
+                return [bindings]
+            # Variable names are unique, so sorting never compares values
+            key = tuple(sorted(new_bindings.items()))
+            if key not in seen:
+                seen.add(key)
+                extended.append({**bindings, **new_bindings})
+        return extended
+    
+    def _pattern_candidates(self, compiled: CompiledPattern):
+        """
+        Return the IDs of atoms that may match a compiled pattern.
+        
+        A pattern with atom IDs in its outgoing set is narrowed to the smallest
+        incoming set among them; otherwise the type bucket, intersected with
+        the name bucket for a literal name, is used.
+        """
+        type_bucket = self.atomspace.type_index.get(compiled.type, set())
+        anchors = [out for out in compiled.outgoing if isinstance(out, int)]
+        if anchors:
+            smallest = None
+            for anchor_id in anchors:
+                anchor = self.atomspace.get_atom(anchor_id)
+                if anchor is None:
+                    return set()
+                if smallest is None or len(anchor.incoming) < len(smallest):
+                    smallest = anchor.incoming
+            return {atom_id for atom_id in smallest if atom_id in type_bucket}
+        if compiled.name is not None:
+            return type_bucket & self.atomspace.name_index.get(compiled.name, set())
+        return type_bucket
+    
     def _extract_variable_bindings(self, atom: Atom, pattern: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Extract variable bindings from matching an atom against a pattern."""
+        """
+        Extract variable bindings from matching an atom against a pattern.
+        
+        Name variables bind to the atom's name and outgoing variables to the
+        atom IDs at their positions. Atom IDs in the pattern's outgoing set must
+        match exactly.
+        
+        Returns:
+            The bindings, or None if the atom's outgoing set does not fit the
+            pattern or binds a repeated variable inconsistently
+        """
         bindings = {}
         
         # Check name binding
@@ -257,29 +422,20 @@ class ReasoningEngine(BaseModel):
         if isinstance(pattern_name, str) and pattern_name.startswith("$"):
             bindings[pattern_name] = atom.name
         
-        # Check outgoing bindings
+        # Check outgoing bindings; the pattern covers a prefix of the outgoing set
         pattern_outgoing = pattern.get("outgoing", [])
-        if pattern_outgoing and len(atom.outgoing) >= len(pattern_outgoing):
-            for i, pattern_out in enumerate(pattern_outgoing):
+        if pattern_outgoing:
+            if len(atom.outgoing) < len(pattern_outgoing):
+                return None
+            for pattern_out, out_id in zip(pattern_outgoing, atom.outgoing):
                 if isinstance(pattern_out, str) and pattern_out.startswith("$"):
-                    if i < len(atom.outgoing):
-                        bindings[pattern_out] = atom.outgoing[i]
+                    if bindings.setdefault(pattern_out, out_id) != out_id:
+                        return None
+                elif isinstance(pattern_out, int) and pattern_out != out_id:
+                    return None
         
         return bindings
     
-    def _validate_bindings_for_premises(self, bindings: Dict[str, Any], 
-                                      premises: List[Dict[str, Any]]) -> bool:
-        """Validate that bindings work for all remaining premises."""
-        for premise in premises:
-            # Instantiate premise with current bindings
-            instantiated = self._instantiate_pattern(premise, bindings)
-            
-            # Check if instantiated premise exists in atomspace
-            if not self._pattern_exists(instantiated):
-                return False
-        
-        return True
-    
     def _pattern_matches(self, pattern1: Dict[str, Any], pattern2: Dict[str, Any]) -> bool:
         """Check if two patterns match (considering variables)."""
         # Simplified pattern matching
@@ -291,53 +447,78 @@ class ReasoningEngine(BaseModel):
     
     def _pattern_exists(self, pattern: Dict[str, Any]) -> bool:
         """Check if a pattern exists in the atomspace."""
-        atom_type = pattern.get("type")
-        if not atom_type:
-            return False
-        
-        candidates = self.atomspace.find_atoms_by_type(atom_type)
-        
-        # Simplified existence check
-        for atom_id in candidates:
-            atom = self.atomspace.get_atom(atom_id)
-            if atom and self._atom_matches_pattern(atom, pattern):
-                return True
-        
-        return False
+        return self._find_atom_from_pattern(pattern) is not None
     
-    def _atom_matches_pattern(self, atom: Atom, pattern: Dict[str, Any]) -> bool:
-        """Check if an atom matches a pattern."""
-        if atom.type != pattern.get("type"):
-            return False
+    def _atom_matches_pattern(self, atom: Atom, compiled: CompiledPattern) -> bool:
+        """Check if an atom matches a pattern compiled with _compile_pattern."""
+        # Could extend for outgoing pattern matching
+        return atom.type == compiled.type and (compiled.name is None or atom.name == compiled.name)
+    
+    def _matching_ids(self, compiled: CompiledPattern,
+                      atom_ids: Optional[Iterable[int]] = None) -> List[int]:
+        """
+        Return the sorted IDs of atoms matching a compiled pattern's type and name.
         
-        pattern_name = pattern.get("name")
-        if pattern_name and not pattern_name.startswith("$") and atom.name != pattern_name:
-            return False
+        Matching atoms are resolved from the type and name indexes, so no atom
+        is fetched. IDs of atoms not in the AtomSpace do not match.
         
-        # Could extend for outgoing pattern matching
-        return True
+        Args:
+            compiled: Pattern from _compile_pattern
+            atom_ids: Atom IDs to check (defaults to every atom)
+        
+        Returns:
+            Sorted IDs of the matching atoms
+        """
+        matching = self.atomspace.type_index.get(compiled.type, set())
+        if compiled.name is not None:
+            matching = matching & self.atomspace.name_index.get(compiled.name, set())
+        if atom_ids is None:
+            return sorted(matching)
+        return sorted(matching.intersection(atom_ids))
     
     def _instantiate_pattern(self, pattern: Dict[str, Any], bindings: Dict[str, Any]) -> Dict[str, Any]:
         """Instantiate a pattern with variable bindings."""
-        instantiated = pattern.copy()
-        
-        # Replace variables in name
-        if "name" in instantiated and isinstance(instantiated["name"], str):
-            for var, value in bindings.items():
-                if instantiated["name"] == var:
-                    instantiated["name"] = str(value)
-        
-        # Replace variables in outgoing
-        if "outgoing" in instantiated and isinstance(instantiated["outgoing"], list):
-            new_outgoing = []
-            for item in instantiated["outgoing"]:
+        return self._instantiate_pattern_into(pattern, bindings, {})
+    
+    def _instantiate_pattern_into(self, pattern: Dict[str, Any], bindings: Dict[str, Any],
+                                  out: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Instantiate a pattern with variable bindings into caller-provided storage.
+        
+        out is cleared and refilled in place, and a list it already holds under
+        "outgoing" is overwritten instead of replaced, so reusing one dict
+        across calls allocates nothing per call. Callers must not keep the
+        result past the next call with the same out.
+        
+        Args:
+            pattern: Pattern to instantiate
+            bindings: Variable bindings
+            out: Dict to fill with the instantiated pattern
+        
+        Returns:
+            out
+        """
+        outgoing = out.get("outgoing")
+        out.clear()
+        out.update(pattern)
+        
+        # Replace a variable name
+        name = out.get("name")
+        if isinstance(name, str) and name in bindings:
+            out["name"] = str(bindings[name])
+        
+        # Replace variables in outgoing, never writing into the pattern's own list
+        pattern_outgoing = pattern.get("outgoing")
+        if isinstance(pattern_outgoing, list):
+            if not isinstance(outgoing, list) or outgoing is pattern_outgoing:
+                outgoing = []
+            outgoing[:] = pattern_outgoing
+            for i, item in enumerate(pattern_outgoing):
                 if isinstance(item, str) and item in bindings:
-                    new_outgoing.append(bindings[item])
-                else:
-                    new_outgoing.append(item)
-            instantiated["outgoing"] = new_outgoing
+                    outgoing[i] = bindings[item]
+            out["outgoing"] = outgoing
         
-        return instantiated
+        return out
     
     def _create_atom_from_pattern(self, pattern: Dict[str, Any]) -> Optional[int]:
         """Create an atom in the atomspace from a pattern."""
@@ -352,17 +533,31 @@ class ReasoningEngine(BaseModel):
     
     def _find_atom_from_pattern(self, pattern: Dict[str, Any]) -> Optional[int]:
         """Find an atom ID that matches a pattern."""
-        atom_type = pattern.get("type")
-        if not atom_type:
+        compiled = _compile_pattern(pattern)
+        if not compiled.type:
             return None
         
-        candidates = self.atomspace.find_atoms_by_type(atom_type)
-        for atom_id in candidates:
-            atom = self.atomspace.get_atom(atom_id)
-            if atom and self._atom_matches_pattern(atom, pattern):
-                return atom_id
+        if compiled.outgoing:
+            # Links: check the outgoing set against the smallest candidate set
+            for atom_id in self._pattern_candidates(compiled):
+                atom = self.atomspace.get_atom(atom_id)
+                if (atom and (compiled.name is None or atom.name == compiled.name)
+                        and self._extract_variable_bindings(atom, pattern) is not None):
+                    return atom_id
+            return None
         
-        return None
+        candidates = self.atomspace.type_index.get(compiled.type, set())
+        if compiled.name is None:
+            # Any atom of the type matches
+            return next(iter(candidates), None)
+        
+        # Intersect with the name index instead of scanning the type bucket;
+        # the intersection iterates the smaller of the two sets
+        matches = candidates & self.atomspace.name_index.get(compiled.name, set())
+        if len(matches) <= 1:
+            return next(iter(matches), None)
+        # Keep the type bucket's order when several atoms qualify
+        return next(atom_id for atom_id in candidates if atom_id in matches)
     
     def _calculate_inference_confidence(self, rule_confidence: float, 
                                       premise_ids: List[int]) -> float:
@@ -391,6 +586,53 @@ class ReasoningEngine(BaseModel):
         
         return rule_confidence
     
+    def calculate_inference_confidence_batch(self, rule_confidence: float,
+                                             premise_id_matrix) -> np.ndarray:
+        """
+        Calculate inference confidences for many premise sets at once.
+        
+        Each row matches _calculate_inference_confidence on that row's premise
+        IDs, up to rounding in the final root. Truth values are looked up once
+        per distinct premise and the products are computed column by column.
+        
+        Args:
+            rule_confidence: Confidence of the rule being applied
+            premise_id_matrix: Array-like of shape (inferences, premises)
+        
+        Returns:
+            Float64 array with one confidence per row
+        """
+        premise_id_matrix = np.asarray(premise_id_matrix, dtype=np.int64)
+        rows, premise_count = premise_id_matrix.shape
+        if premise_count == 0:
+            return np.full(rows, rule_confidence, dtype=np.float64)
+        
+        # Dense per-ID table; IDs that cannot be in the AtomSpace share the
+        # spare last slot, which keeps the neutral value 1.0
+        next_id = self.atomspace.next_id
+        slots = np.where(
+            (premise_id_matrix >= 0) & (premise_id_matrix < next_id), premise_id_matrix, next_id
+        )
+        used = np.zeros(next_id + 1, dtype=bool)
+        used[slots.ravel()] = True
+        used[next_id] = False
+        
+        atoms = self.atomspace.atoms
+        values = np.ones(next_id + 1, dtype=np.float64)
+        for atom_id in np.flatnonzero(used).tolist():
+            atom = atoms.get(atom_id)
+            if atom and atom.truth_value:
+                values[atom_id] = (
+                    atom.truth_value.get("confidence", 1.0) * atom.truth_value.get("strength", 1.0)
+                )
+        premise_values = values[slots]
+        
+        # Multiply left to right, matching math.prod in the scalar version
+        product = premise_values[:, 0].copy()
+        for column in range(1, premise_count):
+            product *= premise_values[:, column]
+        return rule_confidence * np.power(product, 1.0 / premise_count)
+    
     def _create_inference_from_rule(self, rule: Rule, 
                                    premise_results: List[InferenceResult]) -> Optional[InferenceResult]:
         """Create an inference result from applying a rule."""
@@ -437,17 +679,16 @@ class ReasoningEngine(BaseModel):
         results = []
         
         # Simple keyword-based matching
-        query_lower = query.lower()
-        
-        for atom_id, atom in self.atomspace.atoms.items():
-            if query_lower in atom.name.lower():
-                results.append({
-                    "atom_id": atom_id,
-                    "type": atom.type,
-                    "name": atom.name,
-                    "truth_value": atom.truth_value,
-                    "relevance": 1.0  # Could implement more sophisticated relevance scoring
-                })
+        atom_ids = self.atomspace.find_atoms_by_name_substring(query)
+        
+        for atom_id, atom in zip(atom_ids, self.atomspace.get_atoms(atom_ids)):
+            results.append({
+                "atom_id": atom_id,
+                "type": atom.type,
+                "name": atom.name,
+                "truth_value": atom.truth_value,
+                "relevance": 1.0  # Could implement more sophisticated relevance scoring
+            })
         
         # Sort by relevance
         results.sort(key=lambda x: x["relevance"], reverse=True)
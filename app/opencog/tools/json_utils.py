@@ -0,0 +1,41 @@
+"""
+JSON and output helpers shared by the OpenCog tools.
+
+Tool arguments arrive from the LLM as JSON strings, and agents tend to resend
+the same patterns, rules and type lists many times within a session.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+import orjson
+
+
+# Longer strings are parsed without caching to bound the memory held by the cache
+MAX_CACHED_JSON_LENGTH = 16 * 1024
+
+# Results listed individually in tool output; the rest are summarized by count
+MAX_LISTED_RESULTS = 25
+
+
+@lru_cache(maxsize=256)
+def _parse_json_cached(text: str) -> Any:
+    return orjson.loads(text)
+
+
+def parse_json(text: str) -> Any:
+    """
+    Parse a JSON string, reusing the result for recently seen strings.
+    
+    The returned object may be shared with other callers and must be treated
+    as read-only. Invalid input raises orjson.JSONDecodeError, a subclass
+    of json.JSONDecodeError, so callers catch the stdlib exception.
+    """
+    if len(text) > MAX_CACHED_JSON_LENGTH:
+        return orjson.loads(text)
+    return _parse_json_cached(text)
+
+
+def dump_json(obj: Any) -> str:
+    """Serialize an object to a compact JSON string."""
+    return orjson.dumps(obj).decode()
@@ -128,8 +128,11 @@ class KnowledgeQueryTool(BaseTool):
         include_reasoning = kwargs.get("include_reasoning", True)
         max_results = kwargs.get("max_results", 10)
         
-        # Use cognitive agent's query method
-        results = self._cognitive_agent.query_knowledge(query_text)
+        # Use cognitive agent's query method, fetching only the fields shown below
+        fields = {"type", "name", "truth_value", "relevance", "bindings"}
+        if include_reasoning:
+            fields.add("atom_id")
+        results = self._cognitive_agent.query_knowledge(query_text, fields=fields)
         
         if results:
             # Limit results
@@ -269,25 +272,16 @@ class KnowledgeQueryTool(BaseTool):
         source_id = source_atoms[0]
         target_id = target_atoms[0]
         
-        # Find paths using connected atoms search
-        connected_from_source = pattern_matcher.find_connected_atoms(source_id, max_path_length)
+        # Search towards the target, stopping as soon as it is reached
+        depth = pattern_matcher.find_path_length(source_id, target_id, max_path_length)
         
-        # Check if target is reachable
-        paths_found = []
-        for match in connected_from_source:
-            if match.atom_id == target_id:
-                paths_found.append(match)
-        
-        if paths_found:
-            output = f"Found {len(paths_found)} path(s) from '{source_concept}' to '{target_concept}':\n\n"
+        if depth:
+            output = f"Found 1 path(s) from '{source_concept}' to '{target_concept}':\n\n"
+            output += f"Path 1: Length {depth}, Score: {1.0 / depth:.3f}\n"
             
-            for i, path in enumerate(paths_found, 1):
-                depth = path.bindings.get("depth", "?")
-                output += f"Path {i}: Length {depth}, Score: {path.score:.3f}\n"
-                
-                # For detailed path, we would need to implement path reconstruction
-                # For now, just show that a path exists
-                output += f"  Connection found within {depth} hops\n\n"
+            # For detailed path, we would need to implement path reconstruction
+            # For now, just show that a path exists
+            output += f"  Connection found within {depth} hops\n\n"
         else:
             output = f"No paths found from '{source_concept}' to '{target_concept}' "
             output += f"within {max_path_length} hops"
@@ -367,7 +361,9 @@ class KnowledgeQueryTool(BaseTool):
             return ToolResult(error="topic parameter required")
         
         # Query for topic-related knowledge
-        results = self._cognitive_agent.query_knowledge(topic)
+        results = self._cognitive_agent.query_knowledge(
+            topic, fields={"type", "name", "truth_value"}
+        )
         
         if not results:
             return ToolResult(output=f"No knowledge found about topic '{topic}'")
@@ -425,16 +421,13 @@ class KnowledgeQueryTool(BaseTool):
         inconsistencies = []
         
         # Look for atoms with very low confidence
-        low_confidence_atoms = []
-        for atom_id, atom in atomspace.atoms.items():
-            if atom.truth_value:
-                confidence = atom.truth_value.get('confidence', 1.0)
-                if confidence < 0.3:
-                    low_confidence_atoms.append((atom_id, atom, confidence))
+        low_confidence_atoms = atomspace.find_low_confidence_atoms(0.3)
         
         if low_confidence_atoms:
             output += f"Atoms with low confidence ({len(low_confidence_atoms)} found):\n"
-            for atom_id, atom, confidence in low_confidence_atoms[:5]:
+            for atom_id in low_confidence_atoms[:5]:
+                atom = atomspace.get_atom(atom_id)
+                confidence = atom.truth_value.get('confidence', 1.0)
                 output += f"- {atom.type}('{atom.name}') confidence: {confidence:.3f}\n"
             if len(low_confidence_atoms) > 5:
                 output += f"... and {len(low_confidence_atoms) - 5} more\n"
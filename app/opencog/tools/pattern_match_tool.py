@@ -5,9 +5,29 @@ Provides tool interface for advanced pattern matching operations on the AtomSpac
 """
 
 import json
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, ClassVar, Dict, List, Optional
 from app.tool.base import BaseTool, ToolResult
 from app.logger import logger
+from app.opencog.tools.json_utils import MAX_LISTED_RESULTS, dump_json, parse_json
+
+
+# Number of converted patterns kept per tool, keyed by their JSON string
+PATTERN_CACHE_SIZE = 128
+
+# Number of match result lists kept per tool, valid until the AtomSpace changes
+MATCH_CACHE_SIZE = 256
+
+# Shared results for argument validation failures. Tool results are never
+# mutated after being returned, so one instance per message is enough.
+_ERR_NOT_INITIALIZED = ToolResult(error="Pattern matcher not initialized")
+_ERR_NO_PATTERN = ToolResult(error="pattern parameter required")
+_ERR_BAD_PATTERN = ToolResult(error="Could not create pattern from dictionary")
+_ERR_NO_QUERY = ToolResult(error="query parameter required")
+_ERR_NO_TARGET = ToolResult(error="target_atom_id parameter required")
+_ERR_NO_VARIABLE_NAME = ToolResult(error="variable_name parameter required")
+_ERR_NO_MATCH_RESULT = ToolResult(error="match_result parameter required")
 
 
 class PatternMatchTool(BaseTool):
@@ -60,8 +80,9 @@ class PatternMatchTool(BaseTool):
                 "description": "Maximum depth for connection traversal"
             },
             "connection_types": {
-                "type": "string",
-                "description": "Connection types to follow (JSON array)"
+                "type": ["string", "array"],
+                "items": {"type": "string"},
+                "description": "Connection types to follow (array or JSON array string)"
             },
             "variable_name": {
                 "type": "string", 
@@ -89,87 +110,70 @@ class PatternMatchTool(BaseTool):
         "required": ["operation"]
     }
     
+    # Operation name -> handler method name
+    _OPS: ClassVar[Dict[str, str]] = {
+        "match_pattern": "_match_pattern",
+        "match_query": "_match_query",
+        "find_similar": "_find_similar",
+        "find_connected": "_find_connected",
+        "create_variable": "_create_variable",
+        "explain_match": "_explain_match",
+    }
+    
     def __init__(self, **data):
         super().__init__(**data)
         self._pattern_matcher = None
+        self._pattern_cache = OrderedDict()
+        self._match_cache = OrderedDict()
     
     def set_pattern_matcher(self, pattern_matcher):
         """Set the pattern matcher instance to operate on."""
         self._pattern_matcher = pattern_matcher
+        self._pattern_cache.clear()
+        self._match_cache.clear()
     
     async def execute(self, **kwargs) -> ToolResult:
         """Execute pattern matching operation."""
         if not self._pattern_matcher:
-            return ToolResult(error="Pattern matcher not initialized")
+            return _ERR_NOT_INITIALIZED
         
         operation = kwargs.get("operation")
         
-        # Set max_results if provided
-        max_results = kwargs.get("max_results")
-        if max_results:
-            original_max = self._pattern_matcher.max_results
-            self._pattern_matcher.max_results = max_results
+        handler_name = self._OPS.get(operation)
+        if handler_name is None:
+            return ToolResult(error=f"Unknown operation: {operation}")
         
         try:
-            if operation == "match_pattern":
-                result = await self._match_pattern(kwargs)
-            elif operation == "match_query":
-                result = await self._match_query(kwargs)
-            elif operation == "find_similar":
-                result = await self._find_similar(kwargs)
-            elif operation == "find_connected":
-                result = await self._find_connected(kwargs)
-            elif operation == "create_variable":
-                result = await self._create_variable(kwargs)
-            elif operation == "explain_match":
-                result = await self._explain_match(kwargs)
-            else:
-                result = ToolResult(error=f"Unknown operation: {operation}")
-            
-            # Restore original max_results
-            if max_results:
-                self._pattern_matcher.max_results = original_max
-                
-            return result
+            return await getattr(self, handler_name)(kwargs)
                 
         except Exception as e:
-            logger.error(f"Pattern match tool error: {e}")
-            if max_results:
-                self._pattern_matcher.max_results = original_max
+            logger.error("Pattern match tool error: {}", e)
             return ToolResult(error=str(e))
     
     async def _match_pattern(self, kwargs: Dict[str, Any]) -> ToolResult:
         """Match a structured pattern against atoms."""
         pattern_str = kwargs.get("pattern")
         if not pattern_str:
-            return ToolResult(error="pattern parameter required")
+            return _ERR_NO_PATTERN
         
         try:
-            pattern_dict = json.loads(pattern_str)
+            pattern = self._pattern_from_json(pattern_str)
         except json.JSONDecodeError as e:
             return ToolResult(error=f"Invalid pattern JSON: {e}")
         
-        # Convert dictionary to Pattern object
-        pattern = self._dict_to_pattern(pattern_dict)
         if not pattern:
-            return ToolResult(error="Could not create pattern from dictionary")
+            return _ERR_BAD_PATTERN
         
-        matches = self._pattern_matcher.match_pattern(pattern)
+        max_results = kwargs.get("max_results")
+        matches = self._cached_matches(
+            ("pattern", pattern_str, max_results),
+            lambda: self._pattern_matcher.match_pattern(pattern, max_results=max_results)
+        )
         
         if matches:
-            output = f"Pattern matching found {len(matches)} matches:\n\n"
-            
-            for i, match in enumerate(matches, 1):
-                atom = self._pattern_matcher.atomspace.get_atom(match.atom_id)
-                if atom:
-                    output += f"{i}. {atom.type}('{atom.name}') [ID: {match.atom_id}]\n"
-                    output += f"   Score: {match.score:.3f}\n"
-                    
-                    if match.bindings:
-                        output += f"   Bindings: {match.bindings}\n"
-                    output += "\n"
-            
-            return ToolResult(output=output)
+            parts = [f"Pattern matching found {len(matches)} matches:\n\n"]
+            truncated = self._format_matches(parts, matches)
+            return ToolResult(output="".join(parts), truncated=truncated)
         else:
             return ToolResult(output="No matches found for the pattern")
     
@@ -177,24 +181,18 @@ class PatternMatchTool(BaseTool):
         """Match a string query pattern."""
         query = kwargs.get("query")
         if not query:
-            return ToolResult(error="query parameter required")
+            return _ERR_NO_QUERY
         
-        matches = self._pattern_matcher.match_query(query)
+        max_results = kwargs.get("max_results")
+        matches = self._cached_matches(
+            ("query", query, max_results),
+            lambda: self._pattern_matcher.match_query(query, max_results=max_results)
+        )
         
         if matches:
-            output = f"Query '{query}' found {len(matches)} matches:\n\n"
-            
-            for i, match in enumerate(matches, 1):
-                atom = self._pattern_matcher.atomspace.get_atom(match.atom_id)
-                if atom:
-                    output += f"{i}. {atom.type}('{atom.name}') [ID: {match.atom_id}]\n"
-                    output += f"   Score: {match.score:.3f}\n"
-                    
-                    if match.bindings:
-                        output += f"   Bindings: {match.bindings}\n"
-                    output += "\n"
-            
-            return ToolResult(output=output)
+            parts = [f"Query '{query}' found {len(matches)} matches:\n\n"]
+            truncated = self._format_matches(parts, matches)
+            return ToolResult(output="".join(parts), truncated=truncated)
         else:
             return ToolResult(output=f"No matches found for query '{query}'")
     
@@ -202,7 +200,7 @@ class PatternMatchTool(BaseTool):
         """Find atoms similar to a target atom."""
         target_atom_id = kwargs.get("target_atom_id")
         if target_atom_id is None:
-            return ToolResult(error="target_atom_id parameter required")
+            return _ERR_NO_TARGET
         
         similarity_threshold = kwargs.get("similarity_threshold", 0.7)
         
@@ -211,20 +209,28 @@ class PatternMatchTool(BaseTool):
             return ToolResult(error=f"Target atom {target_atom_id} not found")
         
         similar_atoms = self._pattern_matcher.find_similar_atoms(
-            target_atom_id, similarity_threshold
+            target_atom_id, similarity_threshold, max_results=kwargs.get("max_results")
         )
         
         if similar_atoms:
-            output = f"Found {len(similar_atoms)} atoms similar to "
-            output += f"{target_atom.type}('{target_atom.name}'):\n\n"
+            parts = [
+                f"Found {len(similar_atoms)} atoms similar to ",
+                f"{target_atom.type}('{target_atom.name}'):\n\n"
+            ]
             
-            for i, match in enumerate(similar_atoms, 1):
-                atom = self._pattern_matcher.atomspace.get_atom(match.atom_id)
+            atoms = self._pattern_matcher.atomspace.get_atoms(
+                [m.atom_id for m in islice(similar_atoms, MAX_LISTED_RESULTS)]
+            )
+            for i, (match, atom) in enumerate(zip(similar_atoms, atoms), 1):
                 if atom:
-                    output += f"{i}. {atom.type}('{atom.name}') [ID: {match.atom_id}]\n"
-                    output += f"   Similarity: {match.score:.3f}\n\n"
+                    parts.append(f"{i}. {atom.type}('{atom.name}') [ID: {match.atom_id}]\n")
+                    parts.append(f"   Similarity: {match.score:.3f}\n\n")
+            
+            truncated = len(similar_atoms) > MAX_LISTED_RESULTS
+            if truncated:
+                parts.append(f"... and {len(similar_atoms) - MAX_LISTED_RESULTS} more atoms")
             
-            return ToolResult(output=output)
+            return ToolResult(output="".join(parts), truncated=truncated)
         else:
             return ToolResult(output=f"No similar atoms found (threshold: {similarity_threshold})")
     
@@ -232,15 +238,14 @@ class PatternMatchTool(BaseTool):
         """Find atoms connected through links."""
         target_atom_id = kwargs.get("target_atom_id")
         if target_atom_id is None:
-            return ToolResult(error="target_atom_id parameter required")
+            return _ERR_NO_TARGET
         
         max_depth = kwargs.get("max_depth", 3)
-        connection_types_str = kwargs.get("connection_types")
+        connection_types = kwargs.get("connection_types") or None
         
-        connection_types = None
-        if connection_types_str:
+        if isinstance(connection_types, str):
             try:
-                connection_types = json.loads(connection_types_str)
+                connection_types = parse_json(connection_types)
             except json.JSONDecodeError as e:
                 return ToolResult(error=f"Invalid connection_types JSON: {e}")
         
@@ -249,25 +254,33 @@ class PatternMatchTool(BaseTool):
             return ToolResult(error=f"Target atom {target_atom_id} not found")
         
         connected_atoms = self._pattern_matcher.find_connected_atoms(
-            target_atom_id, max_depth, connection_types
+            target_atom_id, max_depth, connection_types, max_results=kwargs.get("max_results")
         )
         
         if connected_atoms:
-            output = f"Found {len(connected_atoms)} atoms connected to "
-            output += f"{target_atom.type}('{target_atom.name}'):\n\n"
+            parts = [
+                f"Found {len(connected_atoms)} atoms connected to ",
+                f"{target_atom.type}('{target_atom.name}'):\n\n"
+            ]
             
-            for i, match in enumerate(connected_atoms, 1):
-                atom = self._pattern_matcher.atomspace.get_atom(match.atom_id)
+            atoms = self._pattern_matcher.atomspace.get_atoms(
+                [m.atom_id for m in islice(connected_atoms, MAX_LISTED_RESULTS)]
+            )
+            for i, (match, atom) in enumerate(zip(connected_atoms, atoms), 1):
                 if atom:
-                    output += f"{i}. {atom.type}('{atom.name}') [ID: {match.atom_id}]\n"
-                    output += f"   Distance Score: {match.score:.3f}\n"
+                    parts.append(f"{i}. {atom.type}('{atom.name}') [ID: {match.atom_id}]\n")
+                    parts.append(f"   Distance Score: {match.score:.3f}\n")
                     
                     depth = match.bindings.get("depth")
                     if depth:
-                        output += f"   Depth: {depth}\n"
-                    output += "\n"
+                        parts.append(f"   Depth: {depth}\n")
+                    parts.append("\n")
+            
+            truncated = len(connected_atoms) > MAX_LISTED_RESULTS
+            if truncated:
+                parts.append(f"... and {len(connected_atoms) - MAX_LISTED_RESULTS} more atoms")
             
-            return ToolResult(output=output)
+            return ToolResult(output="".join(parts), truncated=truncated)
         else:
             return ToolResult(output=f"No connected atoms found within depth {max_depth}")
     
@@ -275,7 +288,7 @@ class PatternMatchTool(BaseTool):
         """Create a pattern matching variable."""
         variable_name = kwargs.get("variable_name")
         if not variable_name:
-            return ToolResult(error="variable_name parameter required")
+            return _ERR_NO_VARIABLE_NAME
         
         type_constraint = kwargs.get("type_constraint")
         value_constraint = kwargs.get("value_constraint")
@@ -297,7 +310,7 @@ class PatternMatchTool(BaseTool):
             "value_constraint": variable.value_constraint
         }
         
-        output += f"\nVariable JSON: {json.dumps(variable_json)}"
+        output += f"\nVariable JSON: {dump_json(variable_json)}"
         
         return ToolResult(output=output)
     
@@ -305,10 +318,10 @@ class PatternMatchTool(BaseTool):
         """Explain how a match was found."""
         match_result_str = kwargs.get("match_result")
         if not match_result_str:
-            return ToolResult(error="match_result parameter required")
+            return _ERR_NO_MATCH_RESULT
         
         try:
-            match_data = json.loads(match_result_str)
+            match_data = parse_json(match_result_str)
             # Create a mock MatchResult for explanation
             from app.opencog.pattern_matcher import MatchResult
             match_result = MatchResult(
@@ -336,8 +349,83 @@ class PatternMatchTool(BaseTool):
         
         return ToolResult(output=output)
     
-    def _dict_to_pattern(self, pattern_dict: Dict[str, Any]):
-        """Convert a dictionary to a Pattern object."""
+    def _format_matches(self, parts: List[str], matches: List[Any]) -> bool:
+        """
+        Append formatted entries for the leading match results to parts.
+        
+        Returns:
+            True if some matches were only summarized by count
+        """
+        atoms = self._pattern_matcher.atomspace.get_atoms(
+            [m.atom_id for m in islice(matches, MAX_LISTED_RESULTS)]
+        )
+        for i, (match, atom) in enumerate(zip(matches, atoms), 1):
+            if atom:
+                parts.append(f"{i}. {atom.type}('{atom.name}') [ID: {match.atom_id}]\n")
+                parts.append(f"   Score: {match.score:.3f}\n")
+                
+                if match.bindings:
+                    parts.append(f"   Bindings: {match.bindings}\n")
+                parts.append("\n")
+        
+        truncated = len(matches) > MAX_LISTED_RESULTS
+        if truncated:
+            parts.append(f"... and {len(matches) - MAX_LISTED_RESULTS} more matches")
+        return truncated
+    
+    def _pattern_from_json(self, pattern_str: str):
+        """Convert a JSON pattern string to a Pattern object, reusing recent conversions."""
+        pattern = self._pattern_cache.get(pattern_str)
+        if pattern is not None:
+            self._pattern_cache.move_to_end(pattern_str)
+            return pattern
+        
+        pattern = self._dict_to_pattern(parse_json(pattern_str))
+        if pattern is not None:
+            self._pattern_cache[pattern_str] = pattern
+            if len(self._pattern_cache) > PATTERN_CACHE_SIZE:
+                self._pattern_cache.popitem(last=False)
+        
+        return pattern
+    
+    def _cached_matches(self, key: tuple, run_match) -> List[Any]:
+        """
+        Return match results for key, running run_match only on a cache miss.
+        
+        Entries are tagged with the AtomSpace version, so any mutation of the
+        AtomSpace invalidates them, and keyed on the matcher settings that
+        change results, so changing those does not return stale matches.
+        """
+        matcher = self._pattern_matcher
+        key = (matcher.enable_fuzzy_matching, matcher.fuzzy_threshold, matcher.max_results, *key)
+        atomspace = matcher.atomspace
+        version = (id(atomspace), atomspace.version)
+        cached = self._match_cache.get(key)
+        if cached is not None and cached[0] == version:
+            self._match_cache.move_to_end(key)
+            return list(cached[1])
+        
+        matches = run_match()
+        self._match_cache[key] = (version, list(matches))
+        self._match_cache.move_to_end(key)
+        if len(self._match_cache) > MATCH_CACHE_SIZE:
+            self._match_cache.popitem(last=False)
+        
+        return matches
+    
+    def _dict_to_pattern(self, pattern_dict: Dict[str, Any],
+                         vars_cache: Optional[Dict[tuple, Any]] = None):
+        """
+        Convert a dictionary to a Pattern object.
+        
+        Args:
+            pattern_dict: Pattern in the tool's JSON dictionary form
+            vars_cache: Variables already created for this pattern, so repeated
+                references to one variable share a single object
+        """
+        if vars_cache is None:
+            vars_cache = {}
+        
         try:
             atom_type = pattern_dict.get("type")
             name = pattern_dict.get("name")
@@ -345,12 +433,7 @@ class PatternMatchTool(BaseTool):
             
             # Handle variables in name
             if isinstance(name, dict) and name.get("variable"):
-                var_data = name["variable"]
-                name = self._pattern_matcher.create_variable(
-                    var_data["name"],
-                    var_data.get("type_constraint"),
-                    var_data.get("value_constraint")
-                )
+                name = self._variable_from_dict(name["variable"], vars_cache)
             
             # Handle variables in outgoing
             if outgoing:
@@ -358,16 +441,11 @@ class PatternMatchTool(BaseTool):
                 for item in outgoing:
                     if isinstance(item, dict):
                         if item.get("variable"):
-                            var_data = item["variable"]
-                            var = self._pattern_matcher.create_variable(
-                                var_data["name"],
-                                var_data.get("type_constraint"),
-                                var_data.get("value_constraint")
-                            )
+                            var = self._variable_from_dict(item["variable"], vars_cache)
                             processed_outgoing.append(var)
                         else:
                             # Recursive pattern
-                            sub_pattern = self._dict_to_pattern(item)
+                            sub_pattern = self._dict_to_pattern(item, vars_cache)
                             if sub_pattern:
                                 processed_outgoing.append(sub_pattern)
                     else:
@@ -377,5 +455,18 @@ class PatternMatchTool(BaseTool):
             return self._pattern_matcher.create_pattern(atom_type, name, outgoing)
             
         except Exception as e:
-            logger.error(f"Error converting dict to pattern: {e}")
-            return None
\ No newline at end of file
+            logger.error("Error converting dict to pattern: {}", e)
+            return None
+    
+    def _variable_from_dict(self, var_data: Dict[str, Any], vars_cache: Dict[tuple, Any]):
+        """Create a variable, reusing an identical one from vars_cache."""
+        key = (
+            var_data["name"],
+            var_data.get("type_constraint"),
+            var_data.get("value_constraint")
+        )
+        var = vars_cache.get(key)
+        if var is None:
+            var = self._pattern_matcher.create_variable(*key)
+            vars_cache[key] = var
+        return var
\ No newline at end of file
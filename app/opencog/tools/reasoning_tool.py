@@ -6,9 +6,22 @@ chaining, backward chaining, and rule management.
 """
 
 import json
-from typing import Any, Dict, List, Optional
+from copy import deepcopy
+from itertools import islice
+from typing import Any, ClassVar, Dict, List, Optional
 from app.tool.base import BaseTool, ToolResult
 from app.logger import logger
+from app.opencog.tools.json_utils import MAX_LISTED_RESULTS, parse_json
+
+
+# Shared results for argument validation failures. Tool results are never
+# mutated after being returned, so one instance per message is enough.
+_ERR_NOT_INITIALIZED = ToolResult(error="Reasoning engine not initialized")
+_ERR_NO_GOAL_PATTERN = ToolResult(error="goal_pattern parameter required")
+_ERR_INCOMPLETE_RULE = ToolResult(error="rule_name, premises, and conclusion parameters required")
+_ERR_NO_QUERY = ToolResult(error="query parameter required")
+_ERR_NO_ATOM_ID = ToolResult(error="atom_id parameter required")
+_ERR_NO_THRESHOLD = ToolResult(error="confidence_threshold parameter required")
 
 
 class ReasoningTool(BaseTool):
@@ -58,12 +71,13 @@ class ReasoningTool(BaseTool):
                 "description": "Name of the reasoning rule"
             },
             "premises": {
-                "type": "string",
-                "description": "Rule premises (JSON array format)"
+                "type": ["string", "array"],
+                "items": {"type": "object"},
+                "description": "Rule premises (array or JSON array string)"
             },
             "conclusion": {
-                "type": "string", 
-                "description": "Rule conclusion (JSON object format)"
+                "type": ["string", "object"],
+                "description": "Rule conclusion (object or JSON object string)"
             },
             "rule_confidence": {
                 "type": "number",
@@ -89,6 +103,17 @@ class ReasoningTool(BaseTool):
         "required": ["operation"]
     }
     
+    # Operation name -> handler method name
+    _OPS: ClassVar[Dict[str, str]] = {
+        "forward_chain": "_forward_chain",
+        "backward_chain": "_backward_chain",
+        "add_rule": "_add_rule",
+        "list_rules": "_list_rules",
+        "query_knowledge": "_query_knowledge",
+        "explain": "_explain",
+        "set_confidence_threshold": "_set_confidence_threshold",
+    }
+    
     def __init__(self, **data):
         super().__init__(**data)
         self._reasoning_engine = None
@@ -100,30 +125,19 @@ class ReasoningTool(BaseTool):
     async def execute(self, **kwargs) -> ToolResult:
         """Execute reasoning operation."""
         if not self._reasoning_engine:
-            return ToolResult(error="Reasoning engine not initialized")
+            return _ERR_NOT_INITIALIZED
         
         operation = kwargs.get("operation")
         
+        handler_name = self._OPS.get(operation)
+        if handler_name is None:
+            return ToolResult(error=f"Unknown operation: {operation}")
+        
         try:
-            if operation == "forward_chain":
-                return await self._forward_chain(kwargs)
-            elif operation == "backward_chain":
-                return await self._backward_chain(kwargs)
-            elif operation == "add_rule":
-                return await self._add_rule(kwargs)
-            elif operation == "list_rules":
-                return await self._list_rules(kwargs)
-            elif operation == "query_knowledge":
-                return await self._query_knowledge(kwargs)
-            elif operation == "explain":
-                return await self._explain(kwargs)
-            elif operation == "set_confidence_threshold":
-                return await self._set_confidence_threshold(kwargs)
-            else:
-                return ToolResult(error=f"Unknown operation: {operation}")
+            return await getattr(self, handler_name)(kwargs)
                 
         except Exception as e:
-            logger.error(f"Reasoning tool error: {e}")
+            logger.error("Reasoning tool error: {}", e)
             return ToolResult(error=str(e))
     
     async def _forward_chain(self, kwargs: Dict[str, Any]) -> ToolResult:
@@ -133,18 +147,9 @@ class ReasoningTool(BaseTool):
         inferences = self._reasoning_engine.forward_chain(max_inferences)
         
         if inferences:
-            output = f"Forward chaining completed: {len(inferences)} new inferences\n\n"
-            
-            for i, inference in enumerate(inferences[:10], 1):  # Show first 10
-                atom = self._reasoning_engine.atomspace.get_atom(inference.atom_id)
-                if atom:
-                    output += f"{i}. {atom.type}('{atom.name}') "
-                    output += f"[Rule: {inference.rule_name}, Confidence: {inference.confidence:.3f}]\n"
-            
-            if len(inferences) > 10:
-                output += f"... and {len(inferences) - 10} more inferences"
-                
-            return ToolResult(output=output)
+            parts = [f"Forward chaining completed: {len(inferences)} new inferences\n\n"]
+            truncated = self._format_inferences(parts, inferences)
+            return ToolResult(output="".join(parts), truncated=truncated)
         else:
             return ToolResult(output="No new inferences generated")
     
@@ -152,44 +157,42 @@ class ReasoningTool(BaseTool):
         """Perform backward chaining to prove a goal."""
         goal_pattern_str = kwargs.get("goal_pattern")
         if not goal_pattern_str:
-            return ToolResult(error="goal_pattern parameter required")
+            return _ERR_NO_GOAL_PATTERN
         
         max_depth = kwargs.get("max_depth", 5)
         
         try:
-            goal_pattern = json.loads(goal_pattern_str)
+            goal_pattern = parse_json(goal_pattern_str)
         except json.JSONDecodeError as e:
             return ToolResult(error=f"Invalid goal pattern JSON: {e}")
         
         results = self._reasoning_engine.backward_chain(goal_pattern, max_depth)
         
         if results:
-            output = f"Backward chaining found {len(results)} proof steps:\n\n"
-            
-            for i, result in enumerate(results, 1):
-                atom = self._reasoning_engine.atomspace.get_atom(result.atom_id)
-                if atom:
-                    output += f"{i}. {atom.type}('{atom.name}') "
-                    output += f"[Rule: {result.rule_name}, Confidence: {result.confidence:.3f}]\n"
-            
-            return ToolResult(output=output)
+            parts = [f"Backward chaining found {len(results)} proof steps:\n\n"]
+            truncated = self._format_inferences(parts, results)
+            return ToolResult(output="".join(parts), truncated=truncated)
         else:
             return ToolResult(output="Goal could not be proven with available knowledge")
     
     async def _add_rule(self, kwargs: Dict[str, Any]) -> ToolResult:
         """Add a custom reasoning rule."""
         rule_name = kwargs.get("rule_name")
-        premises_str = kwargs.get("premises")
-        conclusion_str = kwargs.get("conclusion")
+        premises = kwargs.get("premises")
+        conclusion = kwargs.get("conclusion")
         
-        if not all([rule_name, premises_str, conclusion_str]):
-            return ToolResult(error="rule_name, premises, and conclusion parameters required")
+        if not all([rule_name, premises, conclusion]):
+            return _ERR_INCOMPLETE_RULE
         
         rule_confidence = kwargs.get("rule_confidence", 1.0)
         
         try:
-            premises = json.loads(premises_str)
-            conclusion = json.loads(conclusion_str)
+            # The rule outlives this call, so it gets its own copies of the
+            # shared objects parse_json returns
+            if isinstance(premises, str):
+                premises = deepcopy(parse_json(premises))
+            if isinstance(conclusion, str):
+                conclusion = deepcopy(parse_json(conclusion))
         except json.JSONDecodeError as e:
             return ToolResult(error=f"Invalid JSON in rule definition: {e}")
         
@@ -204,38 +207,39 @@ class ReasoningTool(BaseTool):
         if not rules:
             return ToolResult(output="No reasoning rules defined")
         
-        output = f"Reasoning rules ({len(rules)} total):\n\n"
+        parts = [f"Reasoning rules ({len(rules)} total):\n\n"]
         
         for i, rule in enumerate(rules, 1):
-            output += f"{i}. {rule.name} (confidence: {rule.confidence})\n"
-            output += f"   Premises: {len(rule.premises)} conditions\n"
-            output += f"   Conclusion: {rule.conclusion.get('type', 'Unknown')}\n\n"
+            parts.append(f"{i}. {rule.name} (confidence: {rule.confidence})\n")
+            parts.append(f"   Premises: {len(rule.premises)} conditions\n")
+            parts.append(f"   Conclusion: {rule.conclusion.get('type', 'Unknown')}\n\n")
         
-        return ToolResult(output=output)
+        return ToolResult(output="".join(parts))
     
     async def _query_knowledge(self, kwargs: Dict[str, Any]) -> ToolResult:
         """Query knowledge with reasoning."""
         query = kwargs.get("query")
         if not query:
-            return ToolResult(error="query parameter required")
+            return _ERR_NO_QUERY
         
         results = self._reasoning_engine.query_knowledge(query)
         
         if results:
-            output = f"Knowledge query results for '{query}':\n\n"
+            parts = [f"Knowledge query results for '{query}':\n\n"]
             
-            for i, result in enumerate(results[:10], 1):
-                output += f"{i}. {result.get('type', 'Unknown')}('{result.get('name', '')}')\n"
+            for i, result in enumerate(islice(results, MAX_LISTED_RESULTS), 1):
+                parts.append(f"{i}. {result.get('type', 'Unknown')}('{result.get('name', '')}')\n")
                 truth_value = result.get('truth_value', {})
                 if truth_value:
-                    output += f"   Truth: strength={truth_value.get('strength', 1.0):.3f}, "
-                    output += f"confidence={truth_value.get('confidence', 1.0):.3f}\n"
-                output += f"   Relevance: {result.get('relevance', 1.0):.3f}\n\n"
+                    parts.append(f"   Truth: strength={truth_value.get('strength', 1.0):.3f}, ")
+                    parts.append(f"confidence={truth_value.get('confidence', 1.0):.3f}\n")
+                parts.append(f"   Relevance: {result.get('relevance', 1.0):.3f}\n\n")
             
-            if len(results) > 10:
-                output += f"... and {len(results) - 10} more results"
+            truncated = len(results) > MAX_LISTED_RESULTS
+            if truncated:
+                parts.append(f"... and {len(results) - MAX_LISTED_RESULTS} more results")
                 
-            return ToolResult(output=output)
+            return ToolResult(output="".join(parts), truncated=truncated)
         else:
             return ToolResult(output=f"No knowledge found for query '{query}'")
     
@@ -243,7 +247,7 @@ class ReasoningTool(BaseTool):
         """Explain how knowledge was derived."""
         atom_id = kwargs.get("atom_id")
         if atom_id is None:
-            return ToolResult(error="atom_id parameter required")
+            return _ERR_NO_ATOM_ID
         
         explanation = self._reasoning_engine.explain_inference(atom_id)
         
@@ -267,8 +271,28 @@ class ReasoningTool(BaseTool):
         """Set minimum confidence threshold for inferences."""
         threshold = kwargs.get("confidence_threshold")
         if threshold is None:
-            return ToolResult(error="confidence_threshold parameter required")
+            return _ERR_NO_THRESHOLD
         
         self._reasoning_engine.min_confidence = threshold
         
-        return ToolResult(output=f"Set confidence threshold to {threshold}")
\ No newline at end of file
+        return ToolResult(output=f"Set confidence threshold to {threshold}")
+    
+    def _format_inferences(self, parts: List[str], inferences: List[Any]) -> bool:
+        """
+        Append formatted lines for the leading inference results to parts.
+        
+        Returns:
+            True if some inferences were only summarized by count
+        """
+        atoms = self._reasoning_engine.atomspace.get_atoms(
+            [r.atom_id for r in islice(inferences, MAX_LISTED_RESULTS)]
+        )
+        for i, (inference, atom) in enumerate(zip(inferences, atoms), 1):
+            if atom:
+                parts.append(f"{i}. {atom.type}('{atom.name}') ")
+                parts.append(f"[Rule: {inference.rule_name}, Confidence: {inference.confidence:.3f}]\n")
+        
+        truncated = len(inferences) > MAX_LISTED_RESULTS
+        if truncated:
+            parts.append(f"... and {len(inferences) - MAX_LISTED_RESULTS} more inferences")
+        return truncated
\ No newline at end of file
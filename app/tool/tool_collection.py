@@ -15,12 +15,24 @@ class ToolCollection:
     def __init__(self, *tools: BaseTool):
         self.tools = tools
         self.tool_map = {tool.name: tool for tool in tools}
+        # (tools tuple, schemas) from the last to_params call
+        self._params = None
 
     def __iter__(self):
         return iter(self.tools)
 
     def to_params(self) -> List[Dict[str, Any]]:
-        return [tool.to_param() for tool in self.tools]
+        """Return the function call schemas of all tools.
+
+        Agents ask for the schemas on every step, so the list is built once
+        per tool set and shared between calls; callers must not modify it.
+        Adding or replacing tools assigns a new tools tuple, which triggers
+        a rebuild.
+        """
+        cached = self._params
+        if cached is None or cached[0] is not self.tools:
+            cached = self._params = (self.tools, [tool.to_param() for tool in self.tools])
+        return cached[1]
 
     async def execute(
         self, *, name: str, tool_input: Dict[str, Any] = None
@@ -6,159 +6,159 @@ symbolic reasoning, knowledge representation, and pattern matching.
 """
 
 import asyncio
+import io
+import sys
+from typing import Optional, TextIO
 from app.opencog.cognitive_agent import CognitiveAgent
+from app.opencog.kb_cache import load_or_build
 from app.logger import logger
 
 
-async def demonstrate_basic_knowledge():
+def add_cached_knowledge(agent, **knowledge):
+    """Add demo knowledge in bulk, reusing the knowledge base cached by an earlier run."""
+    load_or_build(agent, knowledge, lambda: agent.add_knowledge_bulk(**knowledge))
+
+
+async def demonstrate_basic_knowledge(agent: CognitiveAgent, out: Optional[TextIO] = None):
     """Demonstrate basic knowledge representation and querying."""
-    print("\n=== Basic Knowledge Representation ===")
-    
-    agent = CognitiveAgent()
-    
-    # Add some basic concepts
-    agent.add_knowledge("concept", "Artificial Intelligence")
-    agent.add_knowledge("concept", "Machine Learning")
-    agent.add_knowledge("concept", "Deep Learning")
-    agent.add_knowledge("concept", "Neural Networks")
-    
-    # Add relationships
-    agent.add_knowledge("relation", "Machine Learning", object_="Artificial Intelligence")
-    agent.add_knowledge("relation", "Deep Learning", object_="Machine Learning")
-    agent.add_knowledge("relation", "Neural Networks", object_="Deep Learning")
-    
-    # Add facts
-    agent.add_knowledge("fact", "Artificial Intelligence", "can_solve", "complex_problems")
-    agent.add_knowledge("fact", "Machine Learning", "learns_from", "data")
-    agent.add_knowledge("fact", "Deep Learning", "uses", "Neural Networks")
+    print("\n=== Basic Knowledge Representation ===", file=out)
+    
+    add_cached_knowledge(
+        agent,
+        # Add some basic concepts
+        concepts=["Artificial Intelligence", "Machine Learning", "Deep Learning", "Neural Networks"],
+        # Add relationships
+        relations=[
+            ("Machine Learning", "Artificial Intelligence"),
+            ("Deep Learning", "Machine Learning"),
+            ("Neural Networks", "Deep Learning"),
+        ],
+        # Add facts
+        facts=[
+            ("Artificial Intelligence", "can_solve", "complex_problems"),
+            ("Machine Learning", "learns_from", "data"),
+            ("Deep Learning", "uses", "Neural Networks"),
+        ],
+    )
     
     # Query the knowledge
     results = agent.query_knowledge("Artificial Intelligence")
-    print(f"Found {len(results)} items related to 'Artificial Intelligence':")
+    print(f"Found {len(results)} items related to 'Artificial Intelligence':", file=out)
     for i, result in enumerate(results[:5], 1):
-        print(f"  {i}. {result.get('type', 'Unknown')}('{result.get('name', '')}')")
+        print(f"  {i}. {result.get('type', 'Unknown')}('{result.get('name', '')}')", file=out)
     
     # Get cognitive status
     status = agent.get_cognitive_status()
-    print(f"\nKnowledge Base Statistics:")
-    print(f"  Total atoms: {status['total_atoms']}")
-    print(f"  Concept nodes: {status['concept_nodes']}")
-    print(f"  Inheritance links: {status['inheritance_links']}")
+    print(f"\nKnowledge Base Statistics:", file=out)
+    print(f"  Total atoms: {status['total_atoms']}", file=out)
+    print(f"  Concept nodes: {status['concept_nodes']}", file=out)
+    print(f"  Inheritance links: {status['inheritance_links']}", file=out)
     
 
-async def demonstrate_reasoning():
+async def demonstrate_reasoning(agent: CognitiveAgent, out: Optional[TextIO] = None):
     """Demonstrate symbolic reasoning capabilities."""
-    print("\n=== Symbolic Reasoning ===")
-    
-    agent = CognitiveAgent()
+    print("\n=== Symbolic Reasoning ===", file=out)
     
     # Build a knowledge base about animals
-    agent.add_knowledge("concept", "Animal")
-    agent.add_knowledge("concept", "Mammal")
-    agent.add_knowledge("concept", "Dog")
-    agent.add_knowledge("concept", "Poodle")
-    
-    # Add inheritance hierarchy
-    agent.add_knowledge("relation", "Mammal", object_="Animal")
-    agent.add_knowledge("relation", "Dog", object_="Mammal")
-    agent.add_knowledge("relation", "Poodle", object_="Dog")
-    
-    # Add properties
-    agent.add_knowledge("fact", "Animal", "has", "metabolism")
-    agent.add_knowledge("fact", "Mammal", "has", "fur")
-    agent.add_knowledge("fact", "Dog", "makes", "bark_sound")
-    
-    print("Knowledge base built. Performing reasoning...")
+    add_cached_knowledge(
+        agent,
+        concepts=["Animal", "Mammal", "Dog", "Poodle"],
+        # Add inheritance hierarchy
+        relations=[("Mammal", "Animal"), ("Dog", "Mammal"), ("Poodle", "Dog")],
+        # Add properties
+        facts=[
+            ("Animal", "has", "metabolism"),
+            ("Mammal", "has", "fur"),
+            ("Dog", "makes", "bark_sound"),
+        ],
+    )
+    
+    print("Knowledge base built. Performing reasoning...", file=out)
     
     # Query with reasoning
     results = agent.query_knowledge("Poodle")
-    print(f"\nKnowledge about 'Poodle':")
+    print(f"\nKnowledge about 'Poodle':", file=out)
     for result in results[:3]:
-        print(f"  - {result.get('type', 'Unknown')}('{result.get('name', '')}')")
+        print(f"  - {result.get('type', 'Unknown')}('{result.get('name', '')}')", file=out)
     
     # The reasoning engine should infer that Poodle inherits properties from Animal
-    print("\nAfter reasoning, Poodle should inherit properties from Animal, Mammal, and Dog")
+    print("\nAfter reasoning, Poodle should inherit properties from Animal, Mammal, and Dog", file=out)
 
 
-async def demonstrate_pattern_matching():
+async def demonstrate_pattern_matching(agent: CognitiveAgent, out: Optional[TextIO] = None):
     """Demonstrate pattern matching capabilities."""
-    print("\n=== Pattern Matching ===")
-    
-    agent = CognitiveAgent()
+    print("\n=== Pattern Matching ===", file=out)
     
     # Add knowledge about different programming languages
     languages = ["Python", "JavaScript", "Java", "C++", "Go", "Rust"]
     paradigms = ["Object-Oriented", "Functional", "Procedural"]
     
-    for lang in languages:
-        agent.add_knowledge("concept", lang)
-        agent.add_knowledge("relation", lang, object_="Programming Language")
-    
-    for paradigm in paradigms:
-        agent.add_knowledge("concept", paradigm)
-        agent.add_knowledge("relation", paradigm, object_="Programming Paradigm")
-    
-    # Add specific relationships
-    agent.add_knowledge("fact", "Python", "supports", "Object-Oriented")
-    agent.add_knowledge("fact", "Python", "supports", "Functional")
-    agent.add_knowledge("fact", "JavaScript", "supports", "Object-Oriented")
-    agent.add_knowledge("fact", "JavaScript", "supports", "Functional")
-    agent.add_knowledge("fact", "Java", "supports", "Object-Oriented")
-    
-    print("Knowledge base built with programming language information.")
+    add_cached_knowledge(
+        agent,
+        concepts=languages + paradigms,
+        relations=[(lang, "Programming Language") for lang in languages]
+        + [(paradigm, "Programming Paradigm") for paradigm in paradigms],
+        # Add specific relationships
+        facts=[
+            ("Python", "supports", "Object-Oriented"),
+            ("Python", "supports", "Functional"),
+            ("JavaScript", "supports", "Object-Oriented"),
+            ("JavaScript", "supports", "Functional"),
+            ("Java", "supports", "Object-Oriented"),
+        ],
+    )
+    
+    print("Knowledge base built with programming language information.", file=out)
     
     # Query for languages that support Object-Oriented programming
     results = agent.query_knowledge("Object-Oriented")
-    print(f"\nFound {len(results)} items related to 'Object-Oriented':")
+    print(f"\nFound {len(results)} items related to 'Object-Oriented':", file=out)
     for result in results[:5]:
-        print(f"  - {result.get('name', '')}")
+        print(f"  - {result.get('name', '')}", file=out)
 
 
-async def demonstrate_knowledge_analysis():
+async def demonstrate_knowledge_analysis(agent: CognitiveAgent, out: Optional[TextIO] = None):
     """Demonstrate knowledge analysis and insights."""
-    print("\n=== Knowledge Analysis ===")
-    
-    agent = CognitiveAgent()
+    print("\n=== Knowledge Analysis ===", file=out)
     
     # Build a more complex knowledge base
     # Technology domains
     domains = ["AI", "Robotics", "Blockchain", "IoT", "Cybersecurity"]
     applications = ["Healthcare", "Finance", "Transportation", "Education", "Entertainment"]
     
-    for domain in domains:
-        agent.add_knowledge("concept", domain)
-        agent.add_knowledge("relation", domain, object_="Technology")
-    
-    for app in applications:
-        agent.add_knowledge("concept", app)
-        agent.add_knowledge("relation", app, object_="Application Domain")
-    
-    # Add cross-domain relationships
-    agent.add_knowledge("fact", "AI", "used_in", "Healthcare")
-    agent.add_knowledge("fact", "AI", "used_in", "Finance")
-    agent.add_knowledge("fact", "Robotics", "used_in", "Healthcare")
-    agent.add_knowledge("fact", "Robotics", "used_in", "Transportation")
-    agent.add_knowledge("fact", "Blockchain", "used_in", "Finance")
-    agent.add_knowledge("fact", "IoT", "used_in", "Healthcare")
-    agent.add_knowledge("fact", "Cybersecurity", "used_in", "Finance")
-    
-    print("Complex knowledge base built.")
+    add_cached_knowledge(
+        agent,
+        concepts=domains + applications,
+        relations=[(domain, "Technology") for domain in domains]
+        + [(app, "Application Domain") for app in applications],
+        # Add cross-domain relationships
+        facts=[
+            ("AI", "used_in", "Healthcare"),
+            ("AI", "used_in", "Finance"),
+            ("Robotics", "used_in", "Healthcare"),
+            ("Robotics", "used_in", "Transportation"),
+            ("Blockchain", "used_in", "Finance"),
+            ("IoT", "used_in", "Healthcare"),
+            ("Cybersecurity", "used_in", "Finance"),
+        ],
+    )
+    
+    print("Complex knowledge base built.", file=out)
     
     # Analyze the knowledge
     status = agent.get_cognitive_status()
-    print(f"\nFinal Knowledge Base Statistics:")
-    print(f"  Total atoms: {status['total_atoms']}")
-    print(f"  Concept nodes: {status['concept_nodes']}")
-    print(f"  Predicate nodes: {status['predicate_nodes']}")
-    print(f"  Evaluation links: {status['evaluation_links']}")
-    print(f"  Inheritance links: {status['inheritance_links']}")
+    print(f"\nFinal Knowledge Base Statistics:", file=out)
+    print(f"  Total atoms: {status['total_atoms']}", file=out)
+    print(f"  Concept nodes: {status['concept_nodes']}", file=out)
+    print(f"  Predicate nodes: {status['predicate_nodes']}", file=out)
+    print(f"  Evaluation links: {status['evaluation_links']}", file=out)
+    print(f"  Inheritance links: {status['inheritance_links']}", file=out)
     
     # Query for most connected concepts
-    healthcare_results = agent.query_knowledge("Healthcare")
-    finance_results = agent.query_knowledge("Finance")
+    healthcare_results, finance_results = agent.query_knowledge_batch(["Healthcare", "Finance"])
     
-    print(f"\nHealthcare-related technologies: {len(healthcare_results)} found")
-    print(f"Finance-related technologies: {len(finance_results)} found")
+    print(f"\nHealthcare-related technologies: {len(healthcare_results)} found", file=out)
+    print(f"Finance-related technologies: {len(finance_results)} found", file=out)
 
 
 async def main():
@@ -167,10 +167,24 @@ async def main():
     print("=" * 40)
     
     try:
-        await demonstrate_basic_knowledge()
-        await demonstrate_reasoning()
-        await demonstrate_pattern_matching()
-        await demonstrate_knowledge_analysis()
+        # Share one agent across the demonstrations, resetting its knowledge
+        # in between instead of paying agent construction for each one
+        agent = CognitiveAgent()
+        demos = [
+            demonstrate_basic_knowledge,
+            demonstrate_reasoning,
+            demonstrate_pattern_matching,
+            demonstrate_knowledge_analysis,
+        ]
+        for i, demo in enumerate(demos):
+            if i:
+                agent.reset_knowledge()
+            # Collect each demonstration's output and write it in one call
+            out = io.StringIO()
+            try:
+                await demo(agent, out)
+            finally:
+                sys.stdout.write(out.getvalue())
         
         print("\n=== Demonstration Complete ===")
         print("The OpenCog Cognitive Agent successfully demonstrated:")
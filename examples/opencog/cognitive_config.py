@@ -5,7 +5,8 @@ This file demonstrates various configuration options and setups for the
 OpenCog-powered Cognitive Agent in different use cases.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+from app.opencog.kb_cache import load_or_build
 
 
 def get_basic_config() -> Dict[str, Any]:
@@ -105,35 +106,42 @@ SAMPLE_KNOWLEDGE_DOMAINS = {
 }
 
 
-def initialize_knowledge_domain(agent, domain_name: str):
+# SAMPLE_KNOWLEDGE_DOMAINS as add_knowledge_bulk arguments, built once at import:
+# domain name -> (concepts, relations, facts)
+_DOMAIN_INSERTIONS: Dict[str, Tuple[tuple, tuple, tuple]] = {
+    name: (
+        tuple(domain["concepts"]),
+        tuple(domain["relationships"]),
+        tuple(domain["facts"])
+    )
+    for name, domain in SAMPLE_KNOWLEDGE_DOMAINS.items()
+}
+
+
+def initialize_knowledge_domain(agent, domain_name: str, use_cache: bool = True):
     """
     Initialize agent with knowledge from a specific domain.
     
     Args:
         agent: CognitiveAgent instance
         domain_name: Name of domain from SAMPLE_KNOWLEDGE_DOMAINS
+        use_cache: Restore the resulting knowledge base from the on-disk
+            cache when it was built before
     """
-    if domain_name not in SAMPLE_KNOWLEDGE_DOMAINS:
+    insertions = _DOMAIN_INSERTIONS.get(domain_name)
+    if insertions is None:
         raise ValueError(f"Unknown domain: {domain_name}")
     
-    domain = SAMPLE_KNOWLEDGE_DOMAINS[domain_name]
-    
-    # Add concepts
-    for concept in domain["concepts"]:
-        agent.add_knowledge("concept", concept)
-    
-    # Add relationships  
-    for child, parent in domain["relationships"]:
-        agent.add_knowledge("relation", child, object_=parent)
-    
-    # Add facts
-    for subject, predicate, object_ in domain["facts"]:
-        agent.add_knowledge("fact", subject, predicate, object_)
+    if use_cache:
+        load_or_build(agent, insertions, lambda: agent.add_knowledge_bulk(*insertions))
+    else:
+        agent.add_knowledge_bulk(*insertions)
     
+    concepts, relations, facts = insertions
     print(f"Initialized {domain_name} knowledge domain with:")
-    print(f"  - {len(domain['concepts'])} concepts")
-    print(f"  - {len(domain['relationships'])} relationships")
-    print(f"  - {len(domain['facts'])} facts")
+    print(f"  - {len(concepts)} concepts")
+    print(f"  - {len(relations)} relationships")
+    print(f"  - {len(facts)} facts")
 
 
 # Example usage patterns
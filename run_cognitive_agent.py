@@ -7,12 +7,31 @@ with symbolic reasoning capabilities.
 
 import argparse
 import asyncio
-from app.opencog.cognitive_agent import CognitiveAgent
+import io
+import sys
+from typing import List, Optional
 from app.logger import logger
 
 
-async def main():
-    """Main function to run the Cognitive Agent."""
+# Demonstration knowledge as add_knowledge_bulk arguments, built once at
+# import: (concepts, relations, facts)
+_DEMO_KNOWLEDGE = (
+    ("Artificial Intelligence", "Machine Learning", "Neural Networks", "Deep Learning"),
+    (
+        ("Machine Learning", "Artificial Intelligence"),
+        ("Deep Learning", "Machine Learning"),
+        ("Neural Networks", "Deep Learning"),
+    ),
+    (
+        ("Neural Networks", "inspired_by", "biological_neurons"),
+        ("Deep Learning", "uses", "multiple_layers"),
+        ("Machine Learning", "learns_from", "data"),
+    ),
+)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
     parser = argparse.ArgumentParser(description="Run OpenCog Cognitive Agent")
     parser.add_argument(
         "--prompt", 
@@ -33,15 +52,36 @@ async def main():
     parser.add_argument(
         "--load-knowledge",
         type=str,
-        help="Load knowledge from file"
+        help="Load knowledge from file (.npz for the compressed columnar format, else JSON)"
     )
     parser.add_argument(
         "--save-knowledge",
         type=str,
-        help="Save knowledge to file"
+        help="Save knowledge to file (.npz for the compressed columnar format, else JSON)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rebuild the demonstration knowledge base instead of using the on-disk cache"
     )
+    return parser
+
+
+# Built once at import, so repeated main() calls reuse it
+_PARSER = _build_parser()
+
+
+async def main(argv: Optional[List[str]] = None):
+    """
+    Main function to run the Cognitive Agent.
     
-    args = parser.parse_args()
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+    """
+    args = _PARSER.parse_args(argv)
+    
+    # Imported after parsing so --help does not load the agent stack
+    from app.opencog.cognitive_agent import CognitiveAgent, read_knowledge_file, write_knowledge_file
     
     # Create Cognitive Agent
     agent_config = {
@@ -50,12 +90,21 @@ async def main():
         "max_reasoning_iterations": 5
     }
     
+    # Read the knowledge file on a worker thread while the agent is set up
+    loop = asyncio.get_running_loop()
+    knowledge_future = (
+        loop.run_in_executor(None, read_knowledge_file, args.load_knowledge)
+        if args.load_knowledge else None
+    )
+    
     agent = CognitiveAgent(**agent_config)
+    save_future = None
     
     try:
         # Load knowledge if specified
-        if args.load_knowledge:
-            success = agent.load_knowledge(args.load_knowledge)
+        if knowledge_future is not None:
+            knowledge_data = await knowledge_future
+            success = knowledge_data is not None and agent.import_knowledge(knowledge_data)
             if success:
                 logger.info(f"Loaded knowledge from {args.load_knowledge}")
             else:
@@ -63,7 +112,7 @@ async def main():
         
         # Run demonstration if requested
         if args.demo:
-            await run_demonstration(agent)
+            await run_demonstration(agent, use_cache=not args.no_cache)
             return
         
         # Handle prompt input
@@ -90,13 +139,12 @@ async def main():
         logger.info("Processing request with symbolic AI capabilities...")
         await agent.run(context_prompt)
         
-        # Save knowledge if specified
+        # Save knowledge if specified. The snapshot is taken now and written
+        # on a worker thread while the agent cleans up.
         if args.save_knowledge:
-            success = agent.save_knowledge(args.save_knowledge)
-            if success:
-                logger.info(f"Saved knowledge to {args.save_knowledge}")
-            else:
-                logger.warning(f"Failed to save knowledge to {args.save_knowledge}")
+            save_future = loop.run_in_executor(
+                None, write_knowledge_file, args.save_knowledge, agent.atomspace.export_to_dict()
+            )
         
         logger.info("Request processing completed.")
         
@@ -106,63 +154,77 @@ async def main():
         logger.error(f"Error running Cognitive Agent: {e}")
     finally:
         await agent.cleanup()
+        
+        if save_future is not None:
+            if await save_future:
+                logger.info(f"Saved knowledge to {args.save_knowledge}")
+            else:
+                logger.warning(f"Failed to save knowledge to {args.save_knowledge}")
 
 
-async def run_demonstration(agent):
-    """Run a demonstration of OpenCog capabilities."""
-    print("OpenCog Cognitive Agent Demonstration")
-    print("=" * 40)
-    
-    # Build knowledge base
-    print("\n1. Building Knowledge Base...")
-    agent.add_knowledge("concept", "Artificial Intelligence")
-    agent.add_knowledge("concept", "Machine Learning") 
-    agent.add_knowledge("concept", "Neural Networks")
-    agent.add_knowledge("concept", "Deep Learning")
-    
-    agent.add_knowledge("relation", "Machine Learning", object_="Artificial Intelligence")
-    agent.add_knowledge("relation", "Deep Learning", object_="Machine Learning")
-    agent.add_knowledge("relation", "Neural Networks", object_="Deep Learning")
-    
-    agent.add_knowledge("fact", "Neural Networks", "inspired_by", "biological_neurons")
-    agent.add_knowledge("fact", "Deep Learning", "uses", "multiple_layers")
-    agent.add_knowledge("fact", "Machine Learning", "learns_from", "data")
-    
-    # Query knowledge
-    print("\n2. Querying Knowledge...")
-    results = agent.query_knowledge("Artificial Intelligence")
-    print(f"Found {len(results)} items related to 'Artificial Intelligence'")
-    for i, result in enumerate(results[:3], 1):
-        print(f"  {i}. {result.get('type', 'Unknown')}('{result.get('name', '')}')")
-    
-    # Show reasoning
-    print("\n3. Symbolic Reasoning...")
-    await agent._perform_cognitive_reasoning()
-    
-    # Get insights
-    print("\n4. Knowledge Analysis...")
-    status = agent.get_cognitive_status()
-    print(f"Knowledge Base contains:")
-    print(f"  - {status['concept_nodes']} concepts")
-    print(f"  - {status['inheritance_links']} inheritance relationships")
-    print(f"  - {status['evaluation_links']} facts")
-    print(f"  - {status['reasoning_rules']} reasoning rules")
+async def run_demonstration(agent, use_cache: bool = True):
+    """
+    Run a demonstration of OpenCog capabilities.
     
-    # Show some example atoms  
-    print("\n   Sample Knowledge Items:")
-    ai_atoms = agent.atomspace.find_atoms_by_name("Artificial Intelligence")
-    if ai_atoms:
-        ai_atom = agent.atomspace.get_atom(ai_atoms[0])
-        if ai_atom:
-            print(f"   - {ai_atom.type}: '{ai_atom.name}' (confidence: {ai_atom.truth_value.get('confidence', 1.0):.2f})")
+    Args:
+        agent: CognitiveAgent instance
+        use_cache: Restore the demonstration knowledge base from the on-disk
+            cache when it was built before
+    """
+    from app.opencog.kb_cache import load_or_build
     
-    # Show reasoning insights
-    insights = agent._extract_reasoning_insights()
-    if insights:
-        print(f"\n   Reasoning Insights: {insights}")
+    # Collect the output of the quick steps and write it in one call before
+    # the agent run, instead of flushing print by print
+    out = io.StringIO()
     
-    # Demonstrate tool usage
-    print("\n5. Using Cognitive Tools...")
+    try:
+        print("OpenCog Cognitive Agent Demonstration", file=out)
+        print("=" * 40, file=out)
+        
+        # Build knowledge base
+        print("\n1. Building Knowledge Base...", file=out)
+        if use_cache:
+            load_or_build(agent, _DEMO_KNOWLEDGE, lambda: agent.add_knowledge_bulk(*_DEMO_KNOWLEDGE))
+        else:
+            agent.add_knowledge_bulk(*_DEMO_KNOWLEDGE)
+        
+        # Query knowledge
+        print("\n2. Querying Knowledge...", file=out)
+        results = agent.query_knowledge("Artificial Intelligence")
+        print(f"Found {len(results)} items related to 'Artificial Intelligence'", file=out)
+        for i, result in enumerate(results[:3], 1):
+            print(f"  {i}. {result.get('type', 'Unknown')}('{result.get('name', '')}')", file=out)
+        
+        # Show reasoning
+        print("\n3. Symbolic Reasoning...", file=out)
+        await agent._perform_cognitive_reasoning()
+        
+        # Get insights
+        print("\n4. Knowledge Analysis...", file=out)
+        status = agent.get_cognitive_status()
+        print(f"Knowledge Base contains:", file=out)
+        print(f"  - {status['concept_nodes']} concepts", file=out)
+        print(f"  - {status['inheritance_links']} inheritance relationships", file=out)
+        print(f"  - {status['evaluation_links']} facts", file=out)
+        print(f"  - {status['reasoning_rules']} reasoning rules", file=out)
+        
+        # Show some example atoms  
+        print("\n   Sample Knowledge Items:", file=out)
+        ai_atoms = agent.atomspace.find_atoms_by_name("Artificial Intelligence")
+        if ai_atoms:
+            ai_atom = agent.atomspace.get_atom(ai_atoms[0])
+            if ai_atom:
+                print(f"   - {ai_atom.type}: '{ai_atom.name}' (confidence: {ai_atom.truth_value.get('confidence', 1.0):.2f})", file=out)
+        
+        # Show reasoning insights
+        insights = agent._extract_reasoning_insights()
+        if insights:
+            print(f"\n   Reasoning Insights: {insights}", file=out)
+        
+        # Demonstrate tool usage
+        print("\n5. Using Cognitive Tools...", file=out)
+    finally:
+        sys.stdout.write(out.getvalue())
     
     demo_prompt = """
     Using my OpenCog capabilities, let me analyze the knowledge about AI:
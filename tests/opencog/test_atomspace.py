@@ -2,6 +2,15 @@
 Tests for AtomSpace implementation.
 """
 
+import copy
+import gc
+import json
+import pickle
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pytest
 from app.opencog.atomspace import AtomSpaceManager, Atom
 
@@ -9,21 +18,30 @@ from app.opencog.atomspace import AtomSpaceManager, Atom
 class TestAtomSpaceManager:
     """Test cases for AtomSpaceManager."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.atomspace = AtomSpaceManager()
+    @pytest.fixture(autouse=True)
+    def setup_atomspace(self, atomspace):
+        """Set up test fixtures on the module's cleared AtomSpace."""
+        self.atomspace = atomspace
     
-    def test_add_concept(self):
-        """Test adding a concept to the AtomSpace."""
-        atom_id = self.atomspace.add_concept("AI")
+    @pytest.mark.parametrize(
+        "adder, name, atom_type",
+        [
+            ("add_concept", "AI", "ConceptNode"),
+            ("add_predicate", "can_think", "PredicateNode"),
+        ],
+        ids=["concept", "predicate"]
+    )
+    def test_add_node(self, adder, name, atom_type):
+        """Test adding a node to the AtomSpace."""
+        atom_id = getattr(self.atomspace, adder)(name)
         
         assert atom_id == 1
         assert self.atomspace.size() == 1
         
         atom = self.atomspace.get_atom(atom_id)
         assert atom is not None
-        assert atom.type == "ConceptNode"
-        assert atom.name == "AI"
+        assert atom.type == atom_type
+        assert atom.name == name
         assert atom.truth_value["strength"] == 1.0
         assert atom.truth_value["confidence"] == 1.0
     
@@ -36,21 +54,124 @@ class TestAtomSpaceManager:
         assert atom.truth_value["strength"] == 0.8
         assert atom.truth_value["confidence"] == 0.9
     
-    def test_add_duplicate_concept(self):
-        """Test that duplicate concepts return the same ID."""
-        id1 = self.atomspace.add_concept("AI")
-        id2 = self.atomspace.add_concept("AI")
+    @pytest.mark.parametrize("adder", ["add_concept", "add_predicate"], ids=["concept", "predicate"])
+    def test_add_duplicate_node(self, adder):
+        """Test that duplicate nodes return the same ID."""
+        id1 = getattr(self.atomspace, adder)("AI")
+        id2 = getattr(self.atomspace, adder)("AI")
         
         assert id1 == id2
         assert self.atomspace.size() == 1
     
-    def test_add_predicate(self):
-        """Test adding a predicate to the AtomSpace."""
-        atom_id = self.atomspace.add_predicate("can_think")
+    def test_bulk_add_concepts_matches_single(self):
+        """Test that bulk insertion builds the same AtomSpace as single inserts."""
+        names = [f"Concept {i % 9000}" for i in range(10_000)]
+        self.atomspace.add_concept("Concept 5")
         
-        atom = self.atomspace.get_atom(atom_id)
-        assert atom.type == "PredicateNode"
-        assert atom.name == "can_think"
+        single = AtomSpaceManager()
+        single.add_concept("Concept 5")
+        single_ids = [single.add_concept(name) for name in names]
+        
+        assert self.atomspace.add_concepts_bulk(names) == single_ids
+        assert self.atomspace.atoms == single.atoms
+        assert self.atomspace.next_id == single.next_id
+        assert self.atomspace.name_index == single.name_index
+        assert self.atomspace.type_index == single.type_index
+        assert self.atomspace.find_atoms_by_name_substring("cept 89") == \
+            single.find_atoms_by_name_substring("cept 89")
+        
+        # Later single inserts see the bulk-added atoms
+        assert self.atomspace.add_concept("Concept 1") == single.add_concept("Concept 1")
+        assert self.atomspace.add_concept("New") == single.add_concept("New")
+    
+    def test_bulk_add_matches_loop(self):
+        """Test that bulk insertion gives the same IDs and atoms as a loop of add_concept calls."""
+        names = [f"Concept {i}" for i in range(5000)]
+        
+        loop_atomspace = AtomSpaceManager()
+        loop_ids = [loop_atomspace.add_concept(name) for name in names]
+        
+        assert self.atomspace.add_concepts_bulk(names) == loop_ids
+        assert self.atomspace.atoms == loop_atomspace.atoms
+        assert self.atomspace.name_index == loop_atomspace.name_index
+        assert self.atomspace.type_index == loop_atomspace.type_index
+    
+    @pytest.mark.benchmark
+    def test_bulk_add_faster_than_loop(self):
+        """Benchmark bulk insertion against a loop of add_concept calls."""
+        names = [f"Concept {i}" for i in range(5000)]
+        
+        # Keep garbage collection pauses, which grow with the live heap, out of
+        # the comparison the way timeit does
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            loop_atomspace = AtomSpaceManager()
+            for name in names:
+                loop_atomspace.add_concept(name)
+            loop_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            self.atomspace.add_concepts_bulk(names)
+            bulk_time = time.perf_counter() - start
+        finally:
+            gc.enable()
+        
+        assert bulk_time <= 0.3 * loop_time
+    
+    def test_soa_memory_footprint(self):
+        """Test that the column store takes a few bytes per atom added through the public API."""
+        for i in range(1000):
+            self.atomspace.add_concept(f"Single {i}", {"strength": 0.5, "confidence": 0.5})
+        self.atomspace.add_concepts_bulk(
+            [f"Bulk {i}" for i in range(49_000)], {"strength": 0.5, "confidence": 0.5}
+        )
+        count = self.atomspace.size()
+        
+        columns = [
+            self.atomspace._row_ids,
+            self.atomspace._type_column,
+            self.atomspace._name_column,
+            self.atomspace._tv_packed,
+        ]
+        row_bytes = sum(column.itemsize for column in columns)
+        assert self.atomspace._tv_packed.itemsize == 2
+        assert row_bytes == 18
+        # Capacity at most doubles past the rows in use
+        assert all(count <= len(column) <= 2 * count for column in columns)
+        assert sum(column.nbytes for column in columns) / count <= 2 * row_bytes
+    
+    def test_add_duplicate_link(self):
+        """Test that links are deduplicated on type and outgoing set."""
+        id1 = self.atomspace.add_inheritance("AI", "Technology")
+        id2 = self.atomspace.add_inheritance("AI", "Technology")
+        id3 = self.atomspace.add_inheritance("Technology", "AI")
+        
+        assert id1 == id2
+        assert id3 != id1
+        
+        # Imported atoms are found as duplicates too
+        imported = AtomSpaceManager()
+        imported.import_from_dict(self.atomspace.export_to_dict())
+        assert imported.add_inheritance("AI", "Technology") == id1
+        assert imported.size() == self.atomspace.size()
+    
+    def test_duplicate_evaluation_returns_same_id(self):
+        """Test that evaluations and their argument lists are deduplicated by fingerprint."""
+        id1 = self.atomspace.add_evaluation("helps", "AI", "Human")
+        size = self.atomspace.size()
+        id2 = self.atomspace.add_evaluation("helps", "AI", "Human")
+        id3 = self.atomspace.add_evaluation("helps", "Human", "AI")
+        
+        assert id1 == id2
+        assert id3 != id1
+        assert self.atomspace.size() == size + 2
+        
+        # The link is found through its (type, name, outgoing) key
+        pred_id, list_id = self.atomspace.get_outgoing(id1)
+        assert self.atomspace._atom_keys[("EvaluationLink", "", (pred_id, list_id))] == id1
+        list_key = ("ListLink", "", tuple(self.atomspace.get_outgoing(list_id)))
+        assert self.atomspace._atom_keys[list_key] == list_id
     
     def test_add_inheritance(self):
         """Test adding an inheritance relationship."""
@@ -68,6 +189,22 @@ class TestAtomSpaceManager:
         assert len(tech_atoms) == 1
         assert atom.outgoing == [ai_atoms[0], tech_atoms[0]]
     
+    def test_add_inheritance_uses_key_index(self, monkeypatch):
+        """Test that links resolve their concepts through the atom key index, not lookups."""
+        ai_id = self.atomspace.add_concept("AI")
+        
+        def fail(*args):
+            raise AssertionError("add_inheritance should not scan the name or type index")
+        monkeypatch.setattr(AtomSpaceManager, "find_atoms_by_name", fail)
+        monkeypatch.setattr(AtomSpaceManager, "find_atoms_by_type", fail)
+        
+        link_id = self.atomspace.add_inheritance("AI", "Technology")
+        assert self.atomspace.add_inheritance("AI", "Technology") == link_id
+        
+        tech_id = self.atomspace._atom_keys[("ConceptNode", "Technology", ())]
+        assert self.atomspace.get_outgoing(link_id) == [ai_id, tech_id]
+        assert self.atomspace._atom_keys[("InheritanceLink", "", (ai_id, tech_id))] == link_id
+    
     def test_add_evaluation_single_arg(self):
         """Test adding an evaluation with single argument."""
         atom_id = self.atomspace.add_evaluation("exists", "AI")
@@ -89,19 +226,112 @@ class TestAtomSpaceManager:
         assert list_atom.type == "ListLink"
         assert len(list_atom.outgoing) == 2
     
-    def test_find_atoms_by_name(self):
+    def test_get_atoms(self):
+        """Test batched atom lookup."""
+        ai_id = self.atomspace.add_concept("AI")
+        ml_id = self.atomspace.add_concept("ML")
+        
+        atoms = self.atomspace.get_atoms([ml_id, 999, ai_id])
+        
+        assert [atom.name if atom else None for atom in atoms] == ["ML", None, "AI"]
+    
+    @pytest.mark.parametrize(
+        "query, expected_count",
+        [("AI", 1), ("ML", 1), ("Missing", 0)],
+        ids=["duplicated", "single", "missing"]
+    )
+    def test_find_atoms_by_name(self, query, expected_count):
         """Test finding atoms by name."""
         self.atomspace.add_concept("AI")
         self.atomspace.add_concept("ML")
         self.atomspace.add_concept("AI")  # Duplicate
         
-        ai_atoms = self.atomspace.find_atoms_by_name("AI")
-        ml_atoms = self.atomspace.find_atoms_by_name("ML")
-        missing_atoms = self.atomspace.find_atoms_by_name("Missing")
+        assert len(self.atomspace.find_atoms_by_name(query)) == expected_count
+    
+    def test_find_cached_between_mutations(self):
+        """Test that name lookups are memoized until the AtomSpace changes."""
+        ai_id = self.atomspace.add_concept("AI")
         
-        assert len(ai_atoms) == 1
-        assert len(ml_atoms) == 1
-        assert len(missing_atoms) == 0
+        first = self.atomspace.find_atoms_by_name("AI")
+        assert first == [ai_id]
+        assert self.atomspace.find_atoms_by_name("AI") is first
+        
+        predicate_id = self.atomspace.add_predicate("AI")
+        second = self.atomspace.find_atoms_by_name("AI")
+        assert second is not first
+        assert sorted(second) == [ai_id, predicate_id]
+        
+        self.atomspace.clear()
+        assert self.atomspace.find_atoms_by_name("AI") == []
+    
+    def test_find_by_name_short_circuits_misses(self, monkeypatch):
+        """Test that names no atom has are answered without the lock or the memo."""
+        names = [f"Concept {i}" for i in range(100)]
+        ids = self.atomspace.add_concepts_bulk(names)
+        misses = [f"Missing {i}" for i in range(100)]
+        
+        class NoLock:
+            def __enter__(self):
+                raise AssertionError("misses should not take the lock")
+            
+            def __exit__(self, *args):
+                return False
+        
+        monkeypatch.setattr(self.atomspace, "_lock", NoLock())
+        assert all(self.atomspace.find_atoms_by_name(name) == [] for name in misses)
+        assert not any(name in self.atomspace._name_lookups for name in misses)
+        with pytest.raises(AssertionError):
+            self.atomspace.find_atoms_by_name("Concept 1")
+        monkeypatch.undo()
+        
+        assert self.atomspace.find_atoms_by_name("Concept 1") == [ids[1]]
+        assert "Concept 1" in self.atomspace._name_lookups
+    
+    def test_index_lookups_do_not_scan(self, monkeypatch):
+        """Test that name and type lookups read single index entries without scanning."""
+        for i in range(1000):
+            self.atomspace.add_concept(f"Concept {i}")
+        mid_id = self.atomspace.add_predicate("mid")
+        
+        class NoScanDict(dict):
+            def __iter__(self):
+                raise AssertionError("table was scanned")
+            
+            def items(self):
+                raise AssertionError("table was scanned")
+            
+            def keys(self):
+                raise AssertionError("table was scanned")
+            
+            def values(self):
+                raise AssertionError("table was scanned")
+        
+        for field in ("atoms", "_name_index", "_type_index"):
+            monkeypatch.setattr(self.atomspace, field, NoScanDict(getattr(self.atomspace, field)))
+        
+        # Start from an empty memo so the index itself is read
+        self.atomspace.version += 1
+        assert self.atomspace.find_atoms_by_name("mid") == [mid_id]
+        assert self.atomspace.find_atoms_by_name("missing") == []
+        assert self.atomspace.find_atoms_by_type("PredicateNode") == [mid_id]
+        assert self.atomspace.find_atoms_by_type("ListLink") == []
+    
+    def test_find_atoms_by_name_substring(self):
+        """Test case-insensitive substring search over atom names."""
+        dog_id = self.atomspace.add_concept("Dog")
+        hotdog_id = self.atomspace.add_predicate("HotDog")
+        self.atomspace.add_concept("Cat")
+        
+        assert self.atomspace.find_atoms_by_name_substring("dog") == [dog_id, hotdog_id]
+        assert self.atomspace.find_atoms_by_name_substring("OTD") == [hotdog_id]
+        assert self.atomspace.find_atoms_by_name_substring("g") == [dog_id, hotdog_id]
+        assert self.atomspace.find_atoms_by_name_substring("bird") == []
+        
+        # Short texts must not see names from before a clear
+        self.atomspace.clear()
+        cat_id = self.atomspace.add_concept("Cat")
+        assert self.atomspace.find_atoms_by_name_substring("g") == []
+        assert self.atomspace.find_atoms_by_name_substring("CA") == [cat_id]
     
     def test_find_atoms_by_type(self):
         """Test finding atoms by type."""
@@ -132,6 +362,63 @@ class TestAtomSpaceManager:
         outgoing = self.atomspace.get_outgoing(inheritance_id)
         assert ai_id in outgoing
     
+    def test_hub_incoming_set_at_scale(self):
+        """Test incoming set lookups and storage for a node with many links."""
+        size = 20_000
+        thing_id = self.atomspace.add_concept("Thing")
+        child_ids = self.atomspace.add_concepts_bulk([f"Concept {i}" for i in range(size)])
+        link_ids = [
+            self.atomspace.add_inheritance_ids(child_id, thing_id) for child_id in child_ids
+        ]
+        
+        incoming = self.atomspace.get_incoming(thing_id)
+        assert incoming == link_ids
+        # One pointer per entry: the IDs are the same objects that key the atom table
+        assert sys.getsizeof(incoming) < 9 * size
+        
+        assert self.atomspace.get_incoming_view(thing_id).tolist() == link_ids
+        values, offsets = self.atomspace.get_incoming_bulk([child_ids[0], thing_id, child_ids[-1]])
+        assert offsets.tolist() == [0, 1, size + 1, size + 2]
+        assert values[offsets[1]:offsets[2]].tolist() == link_ids
+        assert values[[0, -1]].tolist() == [link_ids[0], link_ids[-1]]
+    
+    def test_csr_view_is_zero_copy(self):
+        """Test that outgoing and incoming views share the CSR arrays."""
+        link_id = self.atomspace.add_inheritance("AI", "Technology")
+        eval_id = self.atomspace.add_evaluation("helps", "AI", "Human")
+        ai_id = self.atomspace.find_atoms_by_name("AI")[0]
+        
+        view = self.atomspace.get_outgoing_view(link_id)
+        assert view.obj is self.atomspace._csr_arrays["outgoing"][1]
+        assert view.readonly
+        assert view.tolist() == self.atomspace.get_outgoing(link_id)
+        assert self.atomspace.get_incoming_view(ai_id).tolist() == self.atomspace.get_incoming(ai_id)
+        assert self.atomspace.get_outgoing_view(999).tolist() == []
+        
+        # Reused until atoms are added, not rebuilt by truth value updates
+        self.atomspace.update_truth_value(link_id, {"strength": 0.5, "confidence": 0.5})
+        assert self.atomspace.get_outgoing_view(eval_id).obj is view.obj
+        self.atomspace.add_inheritance("AI", "Science")
+        assert self.atomspace.get_outgoing_view(link_id).obj is not view.obj
+        assert self.atomspace.get_incoming_view(ai_id).tolist() == self.atomspace.get_incoming(ai_id)
+    
+    def test_outgoing_bulk_matches_lists(self):
+        """Test that bulk gathers match the per-atom sets, including unknown IDs."""
+        self.atomspace.add_inheritance("AI", "Technology")
+        self.atomspace.add_evaluation("helps", "AI", "Human")
+        atom_ids = list(range(self.atomspace.next_id + 1)) + [-1, 3]
+        
+        for bulk, single in [
+            (self.atomspace.get_outgoing_bulk, self.atomspace.get_outgoing),
+            (self.atomspace.get_incoming_bulk, self.atomspace.get_incoming),
+        ]:
+            values, offsets = bulk(atom_ids)
+            assert values.dtype == np.int32
+            assert len(offsets) == len(atom_ids) + 1
+            assert [
+                values[offsets[i]:offsets[i + 1]].tolist() for i in range(len(atom_ids))
+            ] == [single(atom_id) for atom_id in atom_ids]
+    
     def test_update_truth_value(self):
         """Test updating truth values."""
         atom_id = self.atomspace.add_concept("AI")
@@ -143,6 +430,85 @@ class TestAtomSpaceManager:
         assert atom.truth_value["strength"] == 0.7
         assert atom.truth_value["confidence"] == 0.8
     
+    def test_find_low_confidence_atoms(self):
+        """Test finding atoms below a confidence threshold."""
+        low_id = self.atomspace.add_concept("Rumor", {"strength": 0.5, "confidence": 0.1})
+        high_id = self.atomspace.add_concept("Fact", {"strength": 0.9, "confidence": 0.9})
+        
+        assert self.atomspace.find_low_confidence_atoms(0.3) == [low_id]
+        
+        # Updated truth values are reflected in later scans
+        self.atomspace.update_truth_value(high_id, {"strength": 0.9, "confidence": 0.2})
+        assert self.atomspace.find_low_confidence_atoms(0.3) == [low_id, high_id]
+        
+        self.atomspace.clear()
+        assert self.atomspace.find_low_confidence_atoms(0.3) == []
+    
+    def test_find_atoms_by_truth_value(self):
+        """Test vectorized filtering on truth values and type."""
+        strong_id = self.atomspace.add_concept("Fact", {"strength": 0.7, "confidence": 0.9})
+        rumor_id = self.atomspace.add_concept("Rumor", {"strength": 0.2, "confidence": 0.9})
+        link_id = self.atomspace.add_atom("InheritanceLink", "", {"strength": 0.9, "confidence": 0.7})
+        
+        assert self.atomspace.find_atoms_by_truth_value(min_strength=0.7) == [strong_id, link_id]
+        assert self.atomspace.find_atoms_by_truth_value(
+            min_strength=0.7, atom_type="ConceptNode"
+        ) == [strong_id]
+        assert self.atomspace.find_atoms_by_truth_value(min_confidence=0.8) == [strong_id, rumor_id]
+        assert self.atomspace.find_atoms_by_truth_value(atom_type="Missing") == []
+        
+        self.atomspace.update_truth_value(strong_id, {"strength": 0.1, "confidence": 0.9})
+        assert self.atomspace.find_atoms_by_truth_value(min_strength=0.7) == [link_id]
+    
+    def test_truth_value_uint16_storage(self):
+        """Test that packed truth values keep threshold queries exact."""
+        exact_id = self.atomspace.add_concept("Exact", {"strength": 0.3, "confidence": 0.3})
+        close_id = self.atomspace.add_concept("Close", {"strength": 0.301, "confidence": 0.301})
+        wide_id = self.atomspace.add_concept("Wide", {"strength": 2.0, "confidence": -1.0})
+        
+        assert self.atomspace._tv_packed.dtype == np.uint16
+        
+        # Neighbouring values share a quantization level but still compare exactly
+        assert self.atomspace.find_low_confidence_atoms(0.3) == [wide_id]
+        assert self.atomspace.find_low_confidence_atoms(0.301) == [exact_id, wide_id]
+        assert self.atomspace.find_atoms_by_truth_value(0.301, 0.301) == [close_id]
+        assert self.atomspace.find_atoms_by_truth_value(1.5, -2.0) == [wide_id]
+        
+        # The Atom keeps its unquantized truth value
+        assert self.atomspace.get_atom(close_id).truth_value["strength"] == 0.301
+    
+    def test_version_tracks_mutations(self):
+        """Test that the version counter moves only when the AtomSpace changes."""
+        version = self.atomspace.version
+        atom_id = self.atomspace.add_concept("AI")
+        assert self.atomspace.version > version
+        
+        # Re-adding an existing atom is not a mutation
+        version = self.atomspace.version
+        self.atomspace.add_concept("AI")
+        assert self.atomspace.version == version
+        
+        self.atomspace.update_truth_value(atom_id, {"strength": 0.5, "confidence": 0.5})
+        assert self.atomspace.version > version
+        
+        version = self.atomspace.version
+        self.atomspace.clear()
+        assert self.atomspace.version > version
+    
+    def test_generation_tracks_removals(self):
+        """Test that the generation counter moves only when atoms may be removed."""
+        generation = self.atomspace.generation
+        atom_id = self.atomspace.add_concept("AI")
+        self.atomspace.update_truth_value(atom_id, {"strength": 0.5, "confidence": 0.5})
+        assert self.atomspace.generation == generation
+        
+        self.atomspace.import_from_dict(self.atomspace.export_to_dict())
+        assert self.atomspace.generation > generation
+        
+        generation = self.atomspace.generation
+        self.atomspace.clear()
+        assert self.atomspace.generation > generation
+    
     def test_export_import(self):
         """Test exporting and importing AtomSpace."""
         # Add some atoms
@@ -163,6 +529,53 @@ class TestAtomSpaceManager:
         assert len(new_atomspace.find_atoms_by_name("AI")) == 1
         assert len(new_atomspace.find_atoms_by_type("InheritanceLink")) == 1
     
+    @pytest.mark.parametrize("size", [100, 10_000])
+    def test_export_import_bytes(self, size):
+        """Test the bytes round trip and that it matches the export_to_dict JSON path."""
+        self.atomspace.add_concepts_bulk(
+            [f"Concept {i}" for i in range(size)], {"strength": 0.9, "confidence": 0.8}
+        )
+        for i in range(0, size, 10):
+            self.atomspace.add_inheritance(f"Concept {i}", "Concept 0")
+        
+        data = self.atomspace.export_to_bytes()
+        assert json.loads(data) == json.loads(json.dumps(self.atomspace.export_to_dict()))
+        
+        restored = AtomSpaceManager()
+        restored.import_from_bytes(data)
+        assert restored.atoms == self.atomspace.atoms
+        assert restored.next_id == self.atomspace.next_id
+        assert restored.find_atoms_by_type("InheritanceLink") == \
+            self.atomspace.find_atoms_by_type("InheritanceLink")
+    
+    def test_import_builds_indexes_lazily(self):
+        """Test that imports defer the name and type indexes to their first use."""
+        concept_ids = self.atomspace.add_concepts_bulk(
+            [f"Concept {i}" for i in range(2_500)], {"strength": 0.9, "confidence": 0.8}
+        )
+        for child_id, parent_id in zip(concept_ids, concept_ids[1:]):
+            self.atomspace.add_inheritance_ids(child_id, parent_id)
+        data = self.atomspace.export_to_dict()
+        
+        restored = AtomSpaceManager()
+        restored.import_from_dict(data)
+        assert gc.isenabled()
+        
+        # The indexes are built on first use, and read as built even then
+        assert restored._indexes_stale
+        assert restored.name_index == self.atomspace.name_index
+        assert not restored._indexes_stale
+        assert restored.type_index == self.atomspace.type_index
+        assert restored.find_atoms_by_name_substring("cept 2499") == \
+            self.atomspace.find_atoms_by_name_substring("cept 2499")
+        
+        # Built indexes are maintained by later inserts
+        new_id = restored.add_concept("New")
+        assert restored.find_atoms_by_name("New") == [new_id]
+        assert restored.add_concept("Concept 7") == concept_ids[7]
+        assert restored.find_atoms_by_type("InheritanceLink") == \
+            self.atomspace.find_atoms_by_type("InheritanceLink")
+    
     def test_clear(self):
         """Test clearing the AtomSpace."""
         self.atomspace.add_concept("AI")
@@ -177,6 +590,125 @@ class TestAtomSpaceManager:
         assert len(self.atomspace.name_index) == 0
         assert len(self.atomspace.type_index) == 0
         assert self.atomspace.next_id == 1
+    
+    def test_atom_ids_stay_contiguous(self):
+        """Test that atom IDs are always exactly 1..next_id - 1."""
+        def assert_contiguous(atomspace):
+            assert atomspace.next_id == len(atomspace.atoms) + 1
+            assert sorted(atomspace.atoms) == list(range(1, atomspace.next_id))
+        
+        operations = [
+            lambda: self.atomspace.add_concept("AI"),
+            lambda: self.atomspace.add_concept("AI"),
+            lambda: self.atomspace.add_predicate("can_think"),
+            lambda: self.atomspace.add_inheritance("AI", "Technology"),
+            lambda: self.atomspace.add_evaluation("can_think", "AI", "Human"),
+            lambda: self.atomspace.add_concepts_bulk(["ML", "AI", "ML", "DL"]),
+            lambda: self.atomspace.update_truth_value(1, {"strength": 0.5, "confidence": 0.5}),
+        ]
+        assert_contiguous(self.atomspace)
+        for operation in operations:
+            operation()
+            assert_contiguous(self.atomspace)
+        
+        restored = AtomSpaceManager()
+        restored.import_from_dict(self.atomspace.export_to_dict())
+        assert_contiguous(restored)
+        
+        self.atomspace.clear()
+        assert_contiguous(self.atomspace)
+    
+    def test_atom_type_interned(self):
+        """Test that equal atom types and names share one string object."""
+        # Build every string at runtime so none is interned by the compiler
+        for i in range(10_000):
+            self.atomspace.add_atom("".join(["Concept", "Node"]), f"concept_{i}")
+        self.atomspace.add_atom("".join(["Predicate", "Node"]), "".join(["concept_", "0"]))
+        
+        atoms = list(self.atomspace.atoms.values())
+        assert all(atom.type is atoms[0].type for atom in atoms[:10_000])
+        assert atoms[-1].name is atoms[0].name
+        
+        restored = AtomSpaceManager()
+        restored.import_from_bytes(self.atomspace.export_to_bytes())
+        restored_atoms = list(restored.atoms.values())
+        assert all(atom.type is atoms[0].type for atom in restored_atoms[:10_000])
+        assert restored_atoms[-1].name is atoms[0].name
+        
+        bulk_ids = self.atomspace.add_concepts_bulk(["".join(["new_", "concept"]), "".join(["new", "_concept"])])
+        assert bulk_ids[0] == bulk_ids[1]
+        assert self.atomspace.get_atom(bulk_ids[0]).name is sys.intern("new_concept")
+    
+    def test_concurrent_inserts(self):
+        """Test that inserts from many threads get unique IDs and consistent indexes."""
+        
+        def insert(thread_id):
+            atom_ids = [self.atomspace.add_concept(f"c-{thread_id}-{i}") for i in range(5000)]
+            # Shared atoms must still be created once
+            shared_id = self.atomspace.add_inheritance("Shared", "Root")
+            return atom_ids, shared_id
+        
+        # Switch threads often so unsynchronized updates would interleave
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(insert, range(8)))
+        finally:
+            sys.setswitchinterval(switch_interval)
+        
+        all_ids = [atom_id for atom_ids, _ in results for atom_id in atom_ids]
+        assert len(set(all_ids)) == 40_000
+        assert len({shared_id for _, shared_id in results}) == 1
+        assert self.atomspace.size() == 40_003
+        assert sorted(self.atomspace.atoms) == list(range(1, self.atomspace.next_id))
+        assert len(self.atomspace.type_index["ConceptNode"]) == 40_002
+        assert self.atomspace.find_atoms_by_name("c-7-4999") == [all_ids[-1]]
+        assert len(self.atomspace._rows) == 40_003
+    
+    def test_construct_from_model_dump(self):
+        """Test that a manager rebuilt from model_dump is equal and fully queryable."""
+        dog_id = self.atomspace.add_concept("Dog", {"strength": 0.9, "confidence": 0.2})
+        self.atomspace.add_inheritance("Dog", "Animal")
+        
+        restored = AtomSpaceManager(**self.atomspace.model_dump())
+        
+        assert restored == self.atomspace
+        assert "name_index" not in self.atomspace.model_dump()
+        assert restored.type_index == self.atomspace.type_index
+        assert restored.find_atoms_by_name_substring("dog") == [dog_id]
+        assert restored.find_low_confidence_atoms(0.5) == \
+            self.atomspace.find_low_confidence_atoms(0.5)
+        assert restored.add_concept("Dog") == dog_id
+        assert restored.add_inheritance("Dog", "Animal") == self.atomspace.next_id - 1
+        
+        restored.add_concept("Cat")
+        assert restored != self.atomspace
+        assert self.atomspace != "not an AtomSpace"
+    
+    @pytest.mark.parametrize("copier", [
+        lambda m: m.model_copy(deep=True),
+        copy.deepcopy,
+        lambda m: pickle.loads(pickle.dumps(m)),
+    ], ids=["model_copy", "deepcopy", "pickle"])
+    def test_copies_get_their_own_lock(self, copier):
+        """Test that deep copies and pickles work and do not share state or the lock."""
+        dog_id = self.atomspace.add_concept("Dog")
+        self.atomspace.add_inheritance("Dog", "Animal")
+        
+        copied = copier(self.atomspace)
+        
+        assert copied._lock is not self.atomspace._lock
+        assert copied.atoms is not self.atomspace.atoms
+        cat_id = copied.add_concept("Cat")
+        assert copied.find_atoms_by_name_substring("cat") == [cat_id]
+        assert copied.find_atoms_by_name("Dog") == [dog_id]
+        assert self.atomspace.find_atoms_by_name("Cat") == []
+        assert self.atomspace.size() == 3
+        
+        # The copy's lock is a working reentrant lock of its own
+        with copied._lock:
+            assert copied.add_concept("Bird") == cat_id + 1
 
 
 class TestAtom:
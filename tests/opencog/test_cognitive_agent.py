@@ -0,0 +1,311 @@
+"""
+Tests for CognitiveAgent knowledge handling.
+"""
+
+import pytest
+from app.agent.toolcall import ToolCallAgent
+from app.llm import LLM
+from app.opencog import cognitive_agent
+from app.opencog.atomspace import AtomSpaceManager
+from app.opencog.cognitive_agent import CognitiveAgent
+from app.schema import AgentState
+
+
+@pytest.fixture
+def agent():
+    """A CognitiveAgent with an unconfigured LLM, which would need a tokenizer download."""
+    return CognitiveAgent(
+        llm=object.__new__(LLM), enable_auto_reasoning=False, knowledge_persistence=False
+    )
+
+
+@pytest.fixture
+def run_queries(monkeypatch):
+    """Record the queries that reach _run_query, bypassing the result cache."""
+    queries = []
+    run_query = CognitiveAgent._run_query
+    
+    def counting_run_query(self, query, fields):
+        queries.append(query)
+        return run_query(self, query, fields)
+    
+    monkeypatch.setattr(CognitiveAgent, "_run_query", counting_run_query)
+    return queries
+
+
+class TestQueryCache:
+    """Test cases for the query_knowledge result cache."""
+    
+    def test_repeated_query_is_cached(self, agent, run_queries):
+        """Test that a repeated query is answered from the cache with fresh copies."""
+        agent.add_knowledge("concept", "Dog")
+        
+        first = agent.query_knowledge("ConceptNode(Dog)")
+        first[0]["name"] = "changed"
+        second = agent.query_knowledge("ConceptNode(Dog)")
+        
+        assert run_queries == ["ConceptNode(Dog)"]
+        assert second[0]["name"] == "Dog"
+    
+    def test_mutation_invalidates_cache(self, agent, run_queries):
+        """Test that queries are re-run after the AtomSpace changes or is replaced."""
+        agent.query_knowledge("ConceptNode($x)")
+        agent.add_knowledge("concept", "Dog")
+        results = agent.query_knowledge("ConceptNode($x)")
+        
+        assert run_queries == ["ConceptNode($x)"] * 2
+        assert "Dog" in {item["name"] for item in results}
+        
+        agent.atomspace = agent.atomspace.model_copy(deep=True)
+        agent.query_knowledge("ConceptNode($x)")
+        assert len(run_queries) == 3
+    
+    def test_fields_projection(self, agent, run_queries):
+        """Test that results hold only the requested fields and are cached per field set."""
+        agent.add_knowledge("concept", "Dog")
+        
+        projected = agent.query_knowledge("ConceptNode(Dog)", fields={"atom_id", "name"})
+        full = agent.query_knowledge("ConceptNode(Dog)")
+        
+        assert projected == [{"atom_id": full[0]["atom_id"], "name": "Dog"}]
+        assert set(full[0]) == cognitive_agent.QUERY_RESULT_FIELDS
+        assert agent.query_knowledge("ConceptNode(Dog)", fields=frozenset({"name", "atom_id"})) == projected
+        assert len(run_queries) == 2
+    
+    def test_least_recently_used_query_is_evicted(self, agent, run_queries, monkeypatch):
+        """Test that the cache holds at most QUERY_CACHE_SIZE queries, dropping the oldest."""
+        monkeypatch.setattr(cognitive_agent, "QUERY_CACHE_SIZE", 2)
+        
+        agent.query_knowledge("Agent")
+        agent.query_knowledge("Human")
+        agent.query_knowledge("Agent")
+        agent.query_knowledge("Task")
+        assert list(agent._query_cache) == [("Agent", None), ("Task", None)]
+        
+        agent.query_knowledge("Agent")
+        agent.query_knowledge("Human")
+        assert run_queries == ["Agent", "Human", "Task", "Human"]
+    
+    def test_batch_runs_each_query_once(self, agent, run_queries):
+        """Test that batched queries run once each and every position gets its own items."""
+        agent.add_knowledge("concept", "Dog")
+        
+        results = agent.query_knowledge_batch(
+            ["ConceptNode(Dog)", "Human", "ConceptNode(Dog)"], fields={"name"}
+        )
+        
+        assert run_queries == ["ConceptNode(Dog)", "Human"]
+        assert results[0] == results[2] == [{"name": "Dog"}]
+        assert results[0][0] is not results[2][0]
+        assert results[1] == agent.query_knowledge("Human", fields={"name"})
+        assert len(run_queries) == 2
+
+
+class TestKnowledgeDeduplication:
+    """Test cases for skipping knowledge that was already added."""
+    
+    @pytest.fixture
+    def inserts(self, monkeypatch):
+        """Record the inheritance links actually inserted into any AtomSpace."""
+        links = []
+        add_inheritance = AtomSpaceManager.add_inheritance
+        
+        def counting_add_inheritance(self, child, parent, *args, **kwargs):
+            links.append((child, parent))
+            return add_inheritance(self, child, parent, *args, **kwargs)
+        
+        monkeypatch.setattr(AtomSpaceManager, "add_inheritance", counting_add_inheritance)
+        return links
+    
+    def test_duplicate_add_is_skipped(self, agent, inserts):
+        """Test that adding the same knowledge twice inserts it once."""
+        agent.add_knowledge("relation", "Dog", "is_a", "Animal")
+        agent.add_knowledge("relation", "Dog", "is_a", "Animal")
+        
+        assert inserts == [("Dog", "Animal")]
+        assert ("relation", "Dog", "Animal") in agent._current_seen_knowledge()
+        
+        # Bulk adds share the same record
+        agent.add_knowledge_bulk(concepts=["Cat"], relations=[("Dog", "Animal")])
+        assert agent.atomspace.find_atoms_by_name("Cat")
+        assert inserts == [("Dog", "Animal")]
+    
+    def test_swapped_atomspace_forgets_added_knowledge(self, agent, inserts):
+        """Test that knowledge is added again to a replacement AtomSpace."""
+        agent.add_knowledge("relation", "Dog", "is_a", "Animal")
+        
+        agent.atomspace = AtomSpaceManager()
+        assert agent._current_seen_knowledge() == set()
+        agent.add_knowledge("relation", "Dog", "is_a", "Animal")
+        
+        assert inserts == [("Dog", "Animal")] * 2
+        assert agent.atomspace.find_atoms_by_type("InheritanceLink")
+    
+    def test_cleared_atomspace_forgets_added_knowledge(self, agent, inserts):
+        """Test that knowledge is added again after the AtomSpace is cleared."""
+        agent.add_knowledge("relation", "Dog", "is_a", "Animal")
+        agent.atomspace.clear()
+        agent.add_knowledge("relation", "Dog", "is_a", "Animal")
+        
+        assert inserts == [("Dog", "Animal")] * 2
+        assert len(agent.atomspace.find_atoms_by_type("InheritanceLink")) == 1
+    
+    def test_reset_knowledge(self, agent, inserts):
+        """Test that reset_knowledge restores the default knowledge and forgets additions."""
+        default_size = agent.atomspace.size()
+        agent.add_knowledge("relation", "Dog", "is_a", "Animal")
+        agent.query_knowledge("Dog")
+        
+        agent.reset_knowledge()
+        
+        assert agent.atomspace.size() == default_size
+        assert agent.atomspace.find_atoms_by_name("Dog") == []
+        assert agent._query_cache == {}
+        agent.add_knowledge("relation", "Dog", "is_a", "Animal")
+        assert inserts.count(("Dog", "Animal")) == 2
+
+
+class TestInheritanceCycles:
+    """Test cases for inheritance cycle detection."""
+    
+    def test_components_of_cycle(self, agent):
+        """Test that atoms on a cycle share a component and the rest do not."""
+        parents = {1: [2], 2: [3], 3: [1, 4], 4: []}
+        components = agent._inheritance_components(parents)
+        
+        assert set(components) == {1, 2, 3, 4}
+        assert components[1] == components[2] == components[3]
+        assert components[4] != components[1]
+        assert agent._has_inheritance_path(1, 3, parents)
+        assert agent._has_inheritance_path(3, 4, parents)
+        assert not agent._has_inheritance_path(4, 1, parents)
+    
+    def test_self_loop(self, agent):
+        """Test that a self-loop is reported as circular on its own."""
+        self_id = agent.atomspace.add_inheritance("Ouroboros", "Ouroboros")
+        agent.add_knowledge("relation", "Dog", "is_a", "Animal")
+        
+        parents = agent._inheritance_parents()
+        ouroboros_id = agent.atomspace.get_atom(self_id).outgoing[0]
+        assert parents[ouroboros_id] == [ouroboros_id]
+        assert agent._has_inheritance_path(ouroboros_id, ouroboros_id, parents)
+        
+        validation = agent.validate_knowledge_consistency()
+        assert not validation["consistent"]
+        assert validation["issues"][0]["items"] == ["Ouroboros -> Ouroboros"]
+    
+    def test_deep_chain(self, agent):
+        """Test a chain deeper than the recursion limit, then closed into a cycle."""
+        depth = 5000
+        parents = {i: [i + 1] for i in range(depth)}
+        parents[depth] = []
+        
+        components = agent._inheritance_components(parents)
+        assert len(set(components.values())) == depth + 1
+        assert agent._has_inheritance_path(0, depth, parents)
+        assert not agent._has_inheritance_path(depth, 0, parents)
+        
+        parents[depth] = [0]
+        components = agent._inheritance_components(parents)
+        assert set(components.values()) == {components[0]}
+        assert agent._has_inheritance_path(depth, 0, parents)
+    
+    def test_validation_reports_cycle_links(self, agent):
+        """Test that every link on a cycle is reported, and links off it are not."""
+        agent.add_knowledge_bulk(relations=[("A", "B"), ("B", "C"), ("C", "A"), ("C", "D")])
+        
+        validation = agent.validate_knowledge_consistency()
+        assert not validation["consistent"]
+        assert sorted(validation["issues"][0]["items"]) == ["A -> B", "B -> C", "C -> A"]
+
+
+class TestCognitiveStatus:
+    """Test cases for get_cognitive_status."""
+    
+    def test_status_follows_atomspace_changes(self, agent, monkeypatch):
+        """Test that cached atom counts are reused until the AtomSpace mutates."""
+        status = agent.get_cognitive_status()
+        
+        sizes = []
+        size = AtomSpaceManager.size
+        monkeypatch.setattr(AtomSpaceManager, "size", lambda self: sizes.append(1) or size(self))
+        
+        assert agent.get_cognitive_status() == status
+        assert sizes == []
+        
+        agent.add_knowledge("concept", "Dog")
+        updated = agent.get_cognitive_status()
+        assert updated["concept_nodes"] == status["concept_nodes"] + 1
+        assert updated["total_atoms"] == status["total_atoms"] + 1
+        assert sizes == [1]
+        
+        agent.atomspace = AtomSpaceManager()
+        assert agent.get_cognitive_status()["total_atoms"] == 0
+        
+        # Settings outside the AtomSpace are read on every call
+        agent.enable_auto_reasoning = True
+        assert agent.get_cognitive_status()["auto_reasoning"] is True
+
+
+class TestRunMany:
+    """Test cases for run_many."""
+    
+    @pytest.fixture
+    def runs(self, monkeypatch):
+        """Stub the agent step, finishing each request in one step and recording what it saw."""
+        calls = []
+        
+        async def fake_step(self):
+            request = self.memory.messages[-1].content
+            if request == "fail":
+                raise RuntimeError("request failed")
+            calls.append((request, self.current_step, self.atomspace.find_atoms_by_name("Dog")))
+            self.add_knowledge("concept", "Dog")
+            self.state = AgentState.FINISHED
+            return f"done: {request}"
+        
+        monkeypatch.setattr(CognitiveAgent, "step", fake_step)
+        return calls
+    
+    @pytest.fixture
+    def cleanups(self, monkeypatch):
+        """Count calls to the tool cleanup that CognitiveAgent.cleanup ends with."""
+        calls = []
+        
+        async def counting_cleanup(self):
+            calls.append(self.atomspace.size())
+        
+        monkeypatch.setattr(ToolCallAgent, "cleanup", counting_cleanup)
+        return calls
+    
+    @pytest.mark.asyncio
+    async def test_requests_share_one_session(self, agent, runs, cleanups):
+        """Test that requests run in order on shared knowledge with one cleanup at the end."""
+        results = await agent.run_many(["first", "second"])
+        
+        assert results == ["Step 1: done: first", "Step 1: done: second"]
+        assert [(request, step) for request, step, _ in runs] == [("first", 1), ("second", 1)]
+        # Knowledge added by the first request is still there for the second
+        assert runs[0][2] == []
+        assert runs[1][2] != []
+        # The AtomSpace is cleared once, after the last request
+        assert cleanups == [0]
+        assert agent.atomspace.size() == 0
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_runs_once_on_failure(self, agent, runs, cleanups):
+        """Test that a failing request stops the batch and still cleans up once."""
+        with pytest.raises(RuntimeError):
+            await agent.run_many(["first", "fail", "never"])
+        
+        assert [request for request, _, _ in runs] == ["first"]
+        assert cleanups == [0]
+    
+    @pytest.mark.asyncio
+    async def test_single_run_still_cleans_up(self, agent, runs, cleanups):
+        """Test that run() cleans up after its request again once a batch is done."""
+        await agent.run_many(["first"])
+        await agent.run("second")
+        
+        assert [request for request, _, _ in runs] == ["first", "second"]
+        assert cleanups == [0, 0]
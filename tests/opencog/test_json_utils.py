@@ -0,0 +1,89 @@
+"""
+Tests for the JSON helpers shared by the OpenCog tools.
+"""
+
+import json
+
+import orjson
+import pytest
+from app.opencog.atomspace import AtomSpaceManager
+from app.opencog.pattern_matcher import PatternMatcher
+from app.opencog.reasoning import ReasoningEngine
+from app.opencog.tools import json_utils
+from app.opencog.tools.json_utils import parse_json
+from app.opencog.tools.pattern_match_tool import PatternMatchTool
+from app.opencog.tools.reasoning_tool import ReasoningTool
+
+
+PREMISES = '[{"type": "InheritanceLink", "outgoing": ["$A", "$B"]}]'
+CONCLUSION = '{"type": "InheritanceLink", "outgoing": ["$B", "$A"]}'
+GOAL = '{"type": "InheritanceLink", "outgoing": ["Dog", "Animal"]}'
+PATTERN = '{"type": "ConceptNode", "name": {"variable": {"name": "x"}}}'
+CONNECTION_TYPES = '["InheritanceLink"]'
+
+
+class TestParseJson:
+    """Test cases for parse_json."""
+    
+    def test_repeated_text_shares_result(self, monkeypatch):
+        """Test that short strings share one parsed object and long ones are parsed afresh."""
+        assert parse_json(PREMISES) is parse_json(PREMISES)
+        
+        monkeypatch.setattr(json_utils, "MAX_CACHED_JSON_LENGTH", 8)
+        assert parse_json(PREMISES) == parse_json(PREMISES)
+        assert parse_json(PREMISES) is not parse_json(PREMISES)
+    
+    @pytest.mark.asyncio
+    async def test_tools_treat_results_as_read_only(self):
+        """Test that the tools never modify the shared objects parse_json returns."""
+        atomspace = AtomSpaceManager()
+        atomspace.add_inheritance("Dog", "Animal")
+        engine = ReasoningEngine(atomspace=atomspace)
+        reasoning_tool = ReasoningTool()
+        reasoning_tool.set_reasoning_engine(engine)
+        pattern_tool = PatternMatchTool()
+        pattern_tool.set_pattern_matcher(PatternMatcher(atomspace=atomspace))
+        dog_id = atomspace.find_atoms_by_name("Dog")[0]
+        
+        texts = [PREMISES, CONCLUSION, GOAL, PATTERN, CONNECTION_TYPES]
+        shared = [parse_json(text) for text in texts]
+        
+        results = [
+            await reasoning_tool.execute(
+                operation="add_rule", rule_name="symmetry", premises=PREMISES, conclusion=CONCLUSION
+            ),
+            await reasoning_tool.execute(operation="forward_chain"),
+            await reasoning_tool.execute(operation="backward_chain", goal_pattern=GOAL),
+            await pattern_tool.execute(operation="match_pattern", pattern=PATTERN),
+            await pattern_tool.execute(
+                operation="find_connected", target_atom_id=dog_id, connection_types=CONNECTION_TYPES
+            ),
+        ]
+        assert all(result.error is None for result in results)
+        
+        # Rules keep their own copies, so later changes cannot reach the cache
+        engine.rules[-1].premises[0]["type"] = "changed"
+        engine.rules[-1].conclusion["outgoing"].append("$C")
+        
+        assert [parse_json(text) for text in texts] == [orjson.loads(text) for text in texts]
+        assert all(parse_json(text) is result for text, result in zip(texts, shared))
+    
+    @pytest.mark.parametrize("text", ["{bad", "[1, 2", "", "x" * 20_000])
+    def test_invalid_json_raises_decode_error(self, text):
+        """Test that malformed input raises an error the stdlib exception catches."""
+        with pytest.raises(json.JSONDecodeError):
+            parse_json(text)
+    
+    @pytest.mark.asyncio
+    async def test_tools_report_invalid_json(self):
+        """Test that tools turn malformed JSON arguments into error results."""
+        reasoning_tool = ReasoningTool()
+        reasoning_tool.set_reasoning_engine(ReasoningEngine(atomspace=AtomSpaceManager()))
+        
+        result = await reasoning_tool.execute(operation="backward_chain", goal_pattern="{bad")
+        assert result.error.startswith("Invalid goal pattern JSON")
+        
+        result = await reasoning_tool.execute(
+            operation="add_rule", rule_name="broken", premises="[", conclusion=CONCLUSION
+        )
+        assert result.error.startswith("Invalid JSON in rule definition")
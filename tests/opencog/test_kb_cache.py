@@ -0,0 +1,117 @@
+"""
+Tests for the knowledge base disk cache.
+"""
+
+import os
+from types import SimpleNamespace
+
+from app.opencog import kb_cache
+from app.opencog.atomspace import AtomSpaceManager
+from app.opencog.reasoning import ReasoningEngine
+from app.opencog.kb_cache import cache_key, load_or_build
+
+
+def make_agent():
+    """Build a minimal stand-in exposing the agent attributes the cache reads."""
+    atomspace = AtomSpaceManager()
+    atomspace.add_concept("Agent")
+    return SimpleNamespace(
+        atomspace=atomspace,
+        reasoning_engine=ReasoningEngine(atomspace=atomspace),
+        enable_auto_reasoning=False
+    )
+
+
+class TestKnowledgeBaseCache:
+    """Test cases for load_or_build."""
+    
+    def test_restores_built_knowledge(self, tmp_path):
+        """Test that a second run restores the AtomSpace without building."""
+        insertions = {"relations": [("Dog", "Animal")]}
+        
+        first = make_agent()
+        built = load_or_build(
+            first, insertions, lambda: first.atomspace.add_inheritance("Dog", "Animal"), tmp_path
+        )
+        assert built is False
+        
+        def fail():
+            raise AssertionError("builder should not run on a cache hit")
+        
+        second = make_agent()
+        assert load_or_build(second, insertions, fail, tmp_path) is True
+        assert second.atomspace.export_to_dict() == first.atomspace.export_to_dict()
+    
+    def test_key_depends_on_existing_knowledge(self, tmp_path):
+        """Test that snapshots are not reused for a different starting AtomSpace."""
+        insertions = {"relations": [("Dog", "Animal")]}
+        
+        first = make_agent()
+        load_or_build(first, insertions, lambda: first.atomspace.add_inheritance("Dog", "Animal"), tmp_path)
+        
+        second = make_agent()
+        second.atomspace.add_concept("Cat")
+        built = []
+        assert load_or_build(second, insertions, lambda: built.append(True), tmp_path) is False
+        assert built == [True]
+        assert len(second.atomspace.find_atoms_by_name("Cat")) == 1
+    
+    def test_writers_use_their_own_temporary_files(self, tmp_path, monkeypatch):
+        """Test that each write goes through a distinct temporary file that is not left behind."""
+        sources = []
+        replace = os.replace
+        
+        def recording_replace(src, dst):
+            sources.append(src)
+            replace(src, dst)
+        
+        monkeypatch.setattr(kb_cache.os, "replace", recording_replace)
+        for _ in range(2):
+            agent = make_agent()
+            load_or_build(agent, "dogs", lambda: agent.atomspace.add_inheritance("Dog", "Animal"), tmp_path)
+            # Drop the snapshot so the next agent writes it again
+            for snapshot in tmp_path.iterdir():
+                snapshot.unlink()
+        
+        assert len(set(sources)) == 2
+        
+        # A failed write removes its temporary file and falls back to the built knowledge
+        def failing_replace(src, dst):
+            raise OSError("disk full")
+        
+        monkeypatch.setattr(kb_cache.os, "replace", failing_replace)
+        agent = make_agent()
+        assert load_or_build(agent, "dogs", lambda: agent.atomspace.add_inheritance("Dog", "Animal"), tmp_path) is False
+        assert agent.atomspace.find_atoms_by_name("Dog")
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_chained_loads_do_not_serialize(self, tmp_path, monkeypatch):
+        """Test that keying a load after another reuses the recorded state digest."""
+        agent = make_agent()
+        load_or_build(agent, "dogs", lambda: agent.atomspace.add_inheritance("Dog", "Animal"), tmp_path)
+        
+        def fail(*args):
+            raise AssertionError("the AtomSpace should not be serialized for the key")
+        
+        monkeypatch.setattr(AtomSpaceManager, "export_to_dict", fail)
+        key = cache_key(agent, "cats")
+        assert cache_key(agent, "cats") == key
+        monkeypatch.undo()
+        
+        # A restored chain reaches the same key as the built one
+        restored = make_agent()
+        assert load_or_build(restored, "dogs", fail, tmp_path) is True
+        monkeypatch.setattr(AtomSpaceManager, "export_to_dict", fail)
+        assert cache_key(restored, "cats") == key
+        monkeypatch.undo()
+        
+        # Changes made outside load_or_build are picked up
+        restored.atomspace.add_concept("Bird")
+        assert cache_key(restored, "cats") != key
+    
+    def test_key_includes_format_version(self, monkeypatch):
+        """Test that bumping the snapshot format invalidates existing keys."""
+        agent = make_agent()
+        key = cache_key(agent, "dogs")
+        monkeypatch.setattr(kb_cache, "CACHE_FORMAT_VERSION", kb_cache.CACHE_FORMAT_VERSION + 1)
+        assert cache_key(agent, "dogs") != key
@@ -0,0 +1,38 @@
+"""
+Tests for columnar knowledge base storage.
+"""
+
+import json
+
+from app.opencog.atomspace import AtomSpaceManager
+from app.opencog import kb_io
+
+
+class TestColumnarKnowledgeIO:
+    """Test cases for kb_io save and load."""
+    
+    def test_round_trip_matches_json_export(self, tmp_path):
+        """Test that loading a saved archive reproduces the exported data."""
+        atomspace = AtomSpaceManager()
+        atomspace.add_inheritance("Dog", "Animal", {"strength": 0.9, "confidence": 0.8})
+        atomspace.add_evaluation("barks", "Dog")
+        atomspace.add_concept("Café ☕")
+        odd_id = atomspace.add_concept("Unscored")
+        atomspace.atoms[odd_id].truth_value = None
+        
+        data = atomspace.export_to_dict()
+        path = tmp_path / "knowledge.npz"
+        kb_io.save(data, path)
+        
+        assert kb_io.load(path) == json.loads(json.dumps(data))
+        
+        restored = AtomSpaceManager()
+        restored.import_from_dict(kb_io.load(path))
+        assert restored.export_to_dict() == data
+    
+    def test_empty_atomspace(self, tmp_path):
+        """Test that an empty AtomSpace round-trips."""
+        path = tmp_path / "empty.npz"
+        kb_io.save(AtomSpaceManager().export_to_dict(), path)
+        
+        assert kb_io.load(path) == {"atoms": {}, "next_id": 1}
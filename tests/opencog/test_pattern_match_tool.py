@@ -0,0 +1,105 @@
+"""
+Tests for the pattern matching tool.
+"""
+
+import pytest
+from app.opencog.pattern_matcher import PatternMatcher
+from app.opencog.tools import pattern_match_tool
+from app.opencog.tools.pattern_match_tool import PatternMatchTool
+
+
+class TestPatternMatchTool:
+    """Test cases for PatternMatchTool caching."""
+    
+    @pytest.fixture(autouse=True)
+    def setup_tool(self, atomspace, monkeypatch):
+        """Set up a tool on the module's cleared AtomSpace, counting matcher runs."""
+        self.atomspace = atomspace
+        self.pattern_matcher = PatternMatcher(atomspace=atomspace, enable_fuzzy_matching=False)
+        self.tool = PatternMatchTool()
+        self.tool.set_pattern_matcher(self.pattern_matcher)
+        
+        self.queries = []
+        match_query = PatternMatcher.match_query
+        
+        def counting_match_query(matcher, query, max_results=None):
+            self.queries.append(query)
+            return match_query(matcher, query, max_results=max_results)
+        
+        monkeypatch.setattr(PatternMatcher, "match_query", counting_match_query)
+    
+    async def match(self, query):
+        """Run match_query through the tool and return its output."""
+        result = await self.tool.execute(operation="match_query", query=query)
+        assert result.error is None
+        return result.output
+    
+    @pytest.mark.asyncio
+    async def test_match_cache_invalidated_by_version(self):
+        """Test that cached matches are reused until the AtomSpace changes."""
+        self.atomspace.add_concept("Dog")
+        
+        first = await self.match("ConceptNode($x)")
+        assert await self.match("ConceptNode($x)") == first
+        assert self.queries == ["ConceptNode($x)"]
+        
+        self.atomspace.add_concept("Cat")
+        assert "Cat" in await self.match("ConceptNode($x)")
+        assert len(self.queries) == 2
+    
+    @pytest.mark.asyncio
+    async def test_match_cache_keyed_on_matcher_settings(self):
+        """Test that changing the fuzzy matching settings does not return stale matches."""
+        self.atomspace.add_concept("Dog")
+        self.atomspace.add_concept("Dogs")
+        
+        assert "Dogs" not in await self.match("ConceptNode(Dog)")
+        
+        self.pattern_matcher.enable_fuzzy_matching = True
+        self.pattern_matcher.fuzzy_threshold = 0.5
+        assert "Dogs" in await self.match("ConceptNode(Dog)")
+        
+        self.pattern_matcher.fuzzy_threshold = 0.9
+        assert "Dogs" not in await self.match("ConceptNode(Dog)")
+        assert len(self.queries) == 3
+    
+    @pytest.mark.asyncio
+    async def test_match_cache_evicts_least_recently_used(self, monkeypatch):
+        """Test that the match cache keeps at most MATCH_CACHE_SIZE entries."""
+        monkeypatch.setattr(pattern_match_tool, "MATCH_CACHE_SIZE", 2)
+        self.atomspace.add_concept("Dog")
+        
+        await self.match("ConceptNode(Dog)")
+        await self.match("ConceptNode(Cat)")
+        await self.match("ConceptNode(Dog)")
+        await self.match("ConceptNode(Bird)")
+        assert len(self.tool._match_cache) == 2
+        
+        await self.match("ConceptNode(Dog)")
+        await self.match("ConceptNode(Cat)")
+        assert self.queries == [
+            "ConceptNode(Dog)", "ConceptNode(Cat)", "ConceptNode(Bird)", "ConceptNode(Cat)"
+        ]
+    
+    def test_pattern_from_json(self, monkeypatch):
+        """Test JSON pattern conversion, its cache and shared variables."""
+        monkeypatch.setattr(pattern_match_tool, "PATTERN_CACHE_SIZE", 2)
+        pattern_str = (
+            '{"type": "InheritanceLink", "outgoing": ['
+            '{"variable": {"name": "x", "type_constraint": "ConceptNode"}}, '
+            '{"variable": {"name": "x", "type_constraint": "ConceptNode"}}]}'
+        )
+        
+        pattern = self.tool._pattern_from_json(pattern_str)
+        assert pattern.type == "InheritanceLink"
+        assert pattern.outgoing[0] is pattern.outgoing[1]
+        assert pattern.outgoing[0].type_constraint == "ConceptNode"
+        assert self.tool._pattern_from_json(pattern_str) is pattern
+        
+        # Invalid patterns are not cached, and the oldest conversion is evicted
+        unnamed_variable = '{"type": "ListLink", "outgoing": [{"variable": {"type_constraint": "ConceptNode"}}]}'
+        assert self.tool._pattern_from_json(unnamed_variable) is None
+        self.tool._pattern_from_json('{"type": "ConceptNode"}')
+        self.tool._pattern_from_json('{"type": "PredicateNode"}')
+        assert list(self.tool._pattern_cache) == ['{"type": "ConceptNode"}', '{"type": "PredicateNode"}']
+        assert self.tool._pattern_from_json(pattern_str) is not pattern
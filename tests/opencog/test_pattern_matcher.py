@@ -0,0 +1,130 @@
+"""
+Tests for Pattern Matcher implementation.
+"""
+
+import pytest
+from app.opencog.pattern_matcher import PatternMatcher
+
+
+class TestPatternMatcher:
+    """Test cases for PatternMatcher."""
+    
+    @pytest.fixture(autouse=True)
+    def setup_matcher(self, atomspace):
+        """Set up test fixtures on the module's cleared AtomSpace."""
+        self.atomspace = atomspace
+        self.pattern_matcher = PatternMatcher(atomspace=self.atomspace)
+    
+    def test_find_path_length(self):
+        """Test finding the shortest path between two concepts."""
+        # Dog -> Mammal -> Animal
+        self.atomspace.add_inheritance("Dog", "Mammal")
+        self.atomspace.add_inheritance("Mammal", "Animal")
+        
+        dog_id = self.atomspace.find_atoms_by_name("Dog")[0]
+        mammal_id = self.atomspace.find_atoms_by_name("Mammal")[0]
+        animal_id = self.atomspace.find_atoms_by_name("Animal")[0]
+        
+        # Concept -> link -> concept is two hops
+        assert self.pattern_matcher.find_path_length(dog_id, mammal_id) == 2
+        assert self.pattern_matcher.find_path_length(dog_id, animal_id) == 4
+        assert self.pattern_matcher.find_path_length(dog_id, dog_id) == 0
+    
+    def test_find_path_length_respects_max_depth(self):
+        """Test that targets beyond max_depth are not reported."""
+        self.atomspace.add_inheritance("Dog", "Mammal")
+        self.atomspace.add_inheritance("Mammal", "Animal")
+        
+        dog_id = self.atomspace.find_atoms_by_name("Dog")[0]
+        animal_id = self.atomspace.find_atoms_by_name("Animal")[0]
+        
+        assert self.pattern_matcher.find_path_length(dog_id, animal_id, max_depth=3) is None
+    
+    def test_find_path_length_unreachable(self):
+        """Test that disconnected atoms have no path."""
+        dog_id = self.atomspace.add_concept("Dog")
+        car_id = self.atomspace.add_concept("Car")
+        
+        assert self.pattern_matcher.find_path_length(dog_id, car_id) is None
+        assert self.pattern_matcher.find_path_length(999, car_id) is None
+    
+    def test_max_results_per_call(self):
+        """Test that a per-call result limit leaves the matcher default unchanged."""
+        for name in ["Dog", "Cat", "Bird"]:
+            self.atomspace.add_concept(name)
+        
+        pattern = self.pattern_matcher.create_pattern(atom_type="ConceptNode")
+        
+        assert len(self.pattern_matcher.match_pattern(pattern, max_results=2)) == 2
+        assert len(self.pattern_matcher.match_pattern(pattern)) == 3
+        assert self.pattern_matcher.max_results == 100
+    
+    def test_find_connected_atoms_uses_shortest_depth(self):
+        """Test that connected atoms are reported at their shortest distance."""
+        # Dog -> Mammal -> Animal, plus a direct Dog -> Animal shortcut
+        self.atomspace.add_inheritance("Dog", "Mammal")
+        self.atomspace.add_inheritance("Mammal", "Animal")
+        self.atomspace.add_inheritance("Dog", "Animal")
+        
+        dog_id = self.atomspace.find_atoms_by_name("Dog")[0]
+        animal_id = self.atomspace.find_atoms_by_name("Animal")[0]
+        
+        results = self.pattern_matcher.find_connected_atoms(dog_id, max_depth=2)
+        depths = {r.atom_id: r.bindings["depth"] for r in results}
+        
+        assert dog_id not in depths
+        assert depths[animal_id] == 2
+        assert set(depths.values()) == {1, 2}
+    
+    def test_find_connected_atoms_skips_unknown_ids(self):
+        """Test that dangling and out-of-range neighbour IDs are skipped."""
+        a_id = self.atomspace.add_concept("A")
+        link_id = self.atomspace.add_atom("ListLink", "", outgoing=[a_id, 999, -1])
+        
+        results = self.pattern_matcher.find_connected_atoms(a_id)
+        assert [r.atom_id for r in results] == [link_id]
+        
+        # An atom that appears past the traversal's ID range, as with an
+        # insert from another thread, is left out instead of failing
+        self.atomspace.get_atom(a_id).incoming.append(self.atomspace.next_id + 5)
+        results = self.pattern_matcher.find_connected_atoms(a_id)
+        assert [r.atom_id for r in results] == [link_id]
+    
+    def test_find_connected_atoms_wide_frontier(self):
+        """Test that every atom of a wide neighbourhood is reported once, at its depth."""
+        for i in range(100):
+            self.atomspace.add_inheritance(f"Breed{i}", "Dog")
+            self.atomspace.add_inheritance(f"Breed{i}", f"Group{i % 7}")
+        
+        dog_id = self.atomspace.find_atoms_by_name("Dog")[0]
+        results = self.pattern_matcher.find_connected_atoms(dog_id, max_depth=4, max_results=1000)
+        
+        depths = [r.bindings["depth"] for r in results]
+        assert len({r.atom_id for r in results}) == len(results)
+        assert [depths.count(depth) for depth in range(1, 5)] == [100, 100, 100, 7]
+    
+    def test_match_query(self):
+        """Test string queries, including repeated and variable forms."""
+        self.atomspace.add_concept("Dog")
+        self.atomspace.add_concept("Cat")
+        self.atomspace.add_predicate("barks")
+        
+        for _ in range(2):
+            assert len(self.pattern_matcher.match_query("ConceptNode(Dog)")) == 1
+        
+        matches = self.pattern_matcher.match_query(" ConceptNode($x) ")
+        assert {m.bindings["x"] for m in matches} == {"Dog", "Cat"}
+        
+        assert self.pattern_matcher.match_query("$x") == []
+    
+    def test_find_similar_atoms(self):
+        """Test similarity search ranks same-type atoms with close names."""
+        dog_id = self.atomspace.add_concept("Dog")
+        dogs_id = self.atomspace.add_concept("Dogs")
+        self.atomspace.add_concept("Elephant")
+        self.atomspace.add_predicate("Dog")
+        
+        results = self.pattern_matcher.find_similar_atoms(dog_id, similarity_threshold=0.7)
+        
+        assert [r.atom_id for r in results] == [dogs_id]
+        assert results[0].score == pytest.approx(0.5 * 0.75 + 0.3 + 0.2)
@@ -2,7 +2,12 @@
 Tests for Reasoning Engine implementation.
 """
 
+import time
+import tracemalloc
+
+import numpy as np
 import pytest
+from app.opencog import reasoning
 from app.opencog.atomspace import AtomSpaceManager
 from app.opencog.reasoning import ReasoningEngine, Rule, InferenceResult
 
@@ -10,9 +15,10 @@ from app.opencog.reasoning import ReasoningEngine, Rule, InferenceResult
 class TestReasoningEngine:
     """Test cases for ReasoningEngine."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.atomspace = AtomSpaceManager()
+    @pytest.fixture(autouse=True)
+    def setup_engine(self, atomspace):
+        """Set up test fixtures on the module's cleared AtomSpace."""
+        self.atomspace = atomspace
         self.reasoning_engine = ReasoningEngine(atomspace=self.atomspace)
     
     def test_initialization(self):
@@ -59,6 +65,101 @@ class TestReasoningEngine:
         # Should return empty list when no rules are available
         assert len(inferences) == 0
     
+    def test_forward_chain_retries_premises_satisfied_later(self):
+        """Test that bindings rejected in one round are retried once their premises appear."""
+        self.atomspace.add_concept("AI")
+        self.atomspace.add_atom("ListLink", "L")
+        
+        # Needs a PredicateNode "AI", which only the second rule derives
+        self.reasoning_engine.add_rule(
+            "gate",
+            [{"type": "ListLink", "name": "$X"}, {"type": "PredicateNode", "name": "AI"}],
+            {"type": "SchemaNode", "name": "$X"}
+        )
+        self.reasoning_engine.add_rule(
+            "promote",
+            [{"type": "ConceptNode", "name": "$X"}],
+            {"type": "PredicateNode", "name": "$X"}
+        )
+        
+        inferences = self.reasoning_engine.forward_chain(10)
+        
+        assert [inference.rule_name for inference in inferences] == ["promote", "gate"]
+        assert len(self.atomspace.find_atoms_by_type("SchemaNode")) == 1
+        
+        # Everything derivable has been derived
+        assert self.reasoning_engine.forward_chain(10) == []
+    
+    def test_premises_without_new_variables_keep_bindings(self):
+        """Test that premises binding nothing new do not multiply the bindings."""
+        size = 60
+        self.atomspace.add_concepts_bulk(f"Concept {i}" for i in range(size))
+        for i in range(size):
+            self.atomspace.add_predicate(f"Predicate {i}")
+        
+        bindings = self.reasoning_engine._find_variable_bindings([
+            {"type": "ConceptNode", "name": "$X"},
+            {"type": "PredicateNode"},
+            {"type": "PredicateNode"}
+        ])
+        assert len(bindings) == size
+        assert len({binding["$X"] for binding in bindings}) == size
+        
+        # One binding per implication, however many evaluations match its premise
+        a_id = self.atomspace.add_concept("A")
+        b_id = self.atomspace.add_concept("B")
+        self.atomspace.add_atom("ImplicationLink", "", outgoing=[a_id, b_id])
+        for i in range(5):
+            self.atomspace.add_atom("EvaluationLink", f"e{i}", outgoing=[a_id])
+        bindings = self.reasoning_engine._find_variable_bindings([
+            {"type": "ImplicationLink", "outgoing": ["$A", "$B"]},
+            {"type": "EvaluationLink", "outgoing": ["$A"]}
+        ])
+        assert bindings == [{"$A": a_id, "$B": b_id}]
+        
+        # Premises that bind new variables still yield each distinct extension once
+        self.atomspace.add_atom("EvaluationLink", "", outgoing=[a_id, b_id])
+        self.atomspace.add_atom("EvaluationLink", "other", outgoing=[a_id, b_id])
+        bindings = self.reasoning_engine._find_variable_bindings([
+            {"type": "ImplicationLink", "outgoing": ["$A", "$B"]},
+            {"type": "EvaluationLink", "outgoing": ["$A", "$C"]}
+        ])
+        assert bindings == [{"$A": a_id, "$B": b_id, "$C": b_id}]
+    
+    def test_forward_chain_transitive_fixed_point(self, monkeypatch):
+        """Test that chaining reaches the closure once, without rescanning old atoms."""
+        self.reasoning_engine.add_rule(
+            "trans",
+            [
+                {"type": "InheritanceLink", "outgoing": ["$A", "$B"]},
+                {"type": "InheritanceLink", "outgoing": ["$B", "$C"]}
+            ],
+            {"type": "InheritanceLink", "outgoing": ["$A", "$C"]},
+            0.9
+        )
+        for child, parent in [("A", "B"), ("B", "C"), ("C", "D")]:
+            self.atomspace.add_inheritance(child, parent)
+        
+        scanned = []
+        apply_rule_forward = self.reasoning_engine._apply_rule_forward
+        def recording_apply(rule, candidate_ids=None, *args):
+            scanned.extend(candidate_ids)
+            return apply_rule_forward(rule, candidate_ids, *args)
+        monkeypatch.setattr(self.reasoning_engine, "_apply_rule_forward", recording_apply)
+        
+        inferences = self.reasoning_engine.forward_chain(10)
+        
+        names = {
+            tuple(self.atomspace.get_atom(out).name for out in self.atomspace.get_outgoing(inference.atom_id))
+            for inference in inferences
+        }
+        assert len(inferences) == 3
+        assert names == {("A", "C"), ("B", "D"), ("A", "D")}
+        assert len(self.atomspace.find_atoms_by_type("InheritanceLink")) == 6
+        
+        # Each link is a candidate at most once per premise position
+        assert max(scanned.count(atom_id) for atom_id in set(scanned)) <= 2
+    
     def test_query_knowledge(self):
         """Test querying knowledge base."""
         # Add some knowledge
@@ -110,27 +211,130 @@ class TestReasoningEngine:
         pattern = {"type": "ConceptNode", "name": "Nonexistent"}
         assert not self.reasoning_engine._pattern_exists(pattern)
     
+    @pytest.mark.benchmark
+    def test_pattern_exists_on_large_atomspace(self):
+        """Test that pattern lookups stay fast next to 50k unrelated atoms."""
+        self.atomspace.add_concepts_bulk(f"Concept {i}" for i in range(50_000))
+        self.atomspace.add_predicate("p")
+        
+        patterns = [
+            {"type": "PredicateNode", "name": "p"},
+            {"type": "ConceptNode", "name": "Concept 25000"},
+            {"type": "ConceptNode", "name": "Missing"},
+        ]
+        for pattern, expected in zip(patterns, [True, True, False]):
+            best = float("inf")
+            for _ in range(5):
+                start = time.perf_counter()
+                found = self.reasoning_engine._pattern_exists(pattern)
+                best = min(best, time.perf_counter() - start)
+            assert found == expected
+            assert best < 0.001
+    
+    def test_pattern_exists_does_not_scan_type_bucket(self, monkeypatch):
+        """Test that typed, named lookups intersect indexes instead of walking the type bucket."""
+        self.atomspace.add_concepts_bulk(f"Concept {i}" for i in range(10_000))
+        self.atomspace.add_concept("x")
+        self.atomspace.add_predicate("x")
+        
+        class NoScanSet(set):
+            def __iter__(self):
+                raise AssertionError("type bucket was scanned")
+        
+        type_index = self.atomspace.type_index
+        monkeypatch.setitem(type_index, "ConceptNode", NoScanSet(type_index["ConceptNode"]))
+        
+        assert self.reasoning_engine._pattern_exists({"type": "ConceptNode", "name": "x"})
+        assert self.reasoning_engine._pattern_exists({"type": "PredicateNode", "name": "x"})
+        assert not self.reasoning_engine._pattern_exists({"type": "ConceptNode", "name": "Missing"})
+    
+    def test_pattern_exists_uses_indexes_only(self, monkeypatch):
+        """Test that pattern lookups never scan the atom table."""
+        self.atomspace.add_concept("AI")
+        self.atomspace.add_predicate("p")
+        
+        class NoScanDict(dict):
+            def __iter__(self):
+                raise AssertionError("atom table was scanned")
+            
+            def items(self):
+                raise AssertionError("atom table was scanned")
+            
+            def values(self):
+                raise AssertionError("atom table was scanned")
+        
+        monkeypatch.setattr(self.atomspace, "atoms", NoScanDict(self.atomspace.atoms))
+        
+        assert self.reasoning_engine._pattern_exists({"type": "PredicateNode", "name": "p"})
+        assert self.reasoning_engine._pattern_exists({"type": "ConceptNode", "name": "$X"})
+        assert not self.reasoning_engine._pattern_exists({"type": "ConceptNode", "name": "p"})
+        assert not self.reasoning_engine._pattern_exists({"type": "ListLink"})
+    
     def test_atom_matches_pattern(self):
         """Test atom pattern matching."""
         atom_id = self.atomspace.add_concept("AI")
         atom = self.atomspace.get_atom(atom_id)
         
         # Exact match
-        pattern = {"type": "ConceptNode", "name": "AI"}
+        pattern = reasoning._compile_pattern({"type": "ConceptNode", "name": "AI"})
         assert self.reasoning_engine._atom_matches_pattern(atom, pattern)
         
         # Type mismatch
-        pattern = {"type": "PredicateNode", "name": "AI"}
+        pattern = reasoning._compile_pattern({"type": "PredicateNode", "name": "AI"})
         assert not self.reasoning_engine._atom_matches_pattern(atom, pattern)
         
         # Name mismatch
-        pattern = {"type": "ConceptNode", "name": "ML"}
+        pattern = reasoning._compile_pattern({"type": "ConceptNode", "name": "ML"})
         assert not self.reasoning_engine._atom_matches_pattern(atom, pattern)
         
         # Variable pattern (should match)
-        pattern = {"type": "ConceptNode", "name": "$X"}
+        pattern = reasoning._compile_pattern({"type": "ConceptNode", "name": "$X"})
         assert self.reasoning_engine._atom_matches_pattern(atom, pattern)
     
+    def test_pattern_compiled_once_per_scan(self, monkeypatch):
+        """Test that the first premise is compiled once, not once per candidate."""
+        for i in range(50):
+            self.atomspace.add_concept(f"Concept {i}")
+        
+        compiled = []
+        compile_pattern = reasoning._compile_pattern
+        def counting_compile(pattern):
+            compiled.append(pattern)
+            return compile_pattern(pattern)
+        monkeypatch.setattr(reasoning, "_compile_pattern", counting_compile)
+        
+        bindings = self.reasoning_engine._find_variable_bindings([{"type": "ConceptNode", "name": "$X"}])
+        assert len(bindings) == 50
+        assert len(compiled) == 1
+    
+    def test_bulk_match_matches_scalar(self):
+        """Test that _matching_ids agrees with _atom_matches_pattern on every atom."""
+        self.atomspace.add_concept("AI")
+        self.atomspace.add_concept("ML")
+        self.atomspace.add_predicate("AI")
+        self.atomspace.add_inheritance("ML", "AI")
+        self.atomspace.add_evaluation("AI", "ML")
+        atom_ids = sorted(self.atomspace.atoms) + [999]
+        
+        patterns = [
+            {"type": "ConceptNode", "name": "AI"},
+            {"type": "ConceptNode", "name": "$X"},
+            {"type": "ConceptNode"},
+            {"type": "PredicateNode", "name": "AI"},
+            {"type": "InheritanceLink", "name": "", "outgoing": ["$A", "$B"]},
+            {"type": "ListLink", "name": "$X"},
+            {"name": "AI"},
+        ]
+        for pattern in patterns:
+            compiled = reasoning._compile_pattern(pattern)
+            expected = [
+                atom_id for atom_id in atom_ids
+                if atom_id in self.atomspace.atoms
+                and self.reasoning_engine._atom_matches_pattern(self.atomspace.atoms[atom_id], compiled)
+            ]
+            assert self.reasoning_engine._matching_ids(compiled, reversed(atom_ids)) == expected
+            assert self.reasoning_engine._matching_ids(compiled) == expected
+    
     def test_calculate_inference_confidence(self):
         """Test confidence calculation for inferences."""
         # Add atoms with truth values
@@ -149,6 +353,54 @@ class TestReasoningEngine:
         assert 0 <= confidence <= 1
         assert confidence <= rule_confidence  # Should not exceed rule confidence
     
+    def confidence_batch_inputs(self):
+        """Add 200 atoms with random truth values and return a 10k x 4 premise ID matrix."""
+        rng = np.random.default_rng(0)
+        atom_ids = [
+            self.atomspace.add_concept(
+                f"Concept {i}",
+                {"strength": float(strength), "confidence": float(confidence)}
+            )
+            for i, (strength, confidence) in enumerate(rng.random((200, 2)))
+        ]
+        atom_ids.append(self.atomspace.add_atom("ConceptNode", "Untyped"))
+        self.atomspace.get_atom(atom_ids[-1]).truth_value = None
+        atom_ids.append(10_000)  # Not in the AtomSpace
+        return rng.choice(atom_ids, size=(10_000, 4))
+    
+    def test_calculate_inference_confidence_batch(self):
+        """Test that batched confidences match the scalar calculation."""
+        premise_matrix = self.confidence_batch_inputs()
+        
+        expected = [
+            self.reasoning_engine._calculate_inference_confidence(0.8, premise_ids)
+            for premise_ids in premise_matrix.tolist()
+        ]
+        confidences = self.reasoning_engine.calculate_inference_confidence_batch(0.8, premise_matrix)
+        np.testing.assert_allclose(confidences, expected, rtol=1e-12)
+        
+        empty = self.reasoning_engine.calculate_inference_confidence_batch(0.8, np.empty((3, 0)))
+        assert empty.tolist() == [0.8] * 3
+    
+    @pytest.mark.benchmark
+    def test_calculate_inference_confidence_batch_faster(self):
+        """Test that batched confidences beat the scalar calculation by 20x."""
+        premise_matrix = self.confidence_batch_inputs()
+        
+        start = time.perf_counter()
+        for premise_ids in premise_matrix.tolist():
+            self.reasoning_engine._calculate_inference_confidence(0.8, premise_ids)
+        scalar_time = time.perf_counter() - start
+        
+        # Best of several rounds, so one-off warm-up costs stay out of the ratio
+        batch_time = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            self.reasoning_engine.calculate_inference_confidence_batch(0.8, premise_matrix)
+            batch_time = min(batch_time, time.perf_counter() - start)
+        
+        assert batch_time * 20 < scalar_time
+    
     def test_instantiate_pattern(self):
         """Test pattern instantiation with variable bindings."""
         pattern = {
@@ -168,6 +420,32 @@ class TestReasoningEngine:
         assert instantiated["type"] == "ConceptNode"
         assert instantiated["name"] == "AI"
         assert instantiated["outgoing"] == [1, 2]
+    
+    def test_instantiate_pattern_reuses_storage(self):
+        """Test that instantiating into caller storage allocates nothing per call."""
+        pattern = {"type": "InheritanceLink", "name": "$X", "outgoing": ["$A", 7, "$B"]}
+        bindings_list = [{"$X": f"name_{i}", "$A": i, "$B": i + 1} for i in range(10_000)]
+        count = len(bindings_list)
+        engine = self.reasoning_engine
+        
+        out = {}
+        assert engine._instantiate_pattern_into(pattern, bindings_list[0], out) is out
+        outgoing = out["outgoing"]
+        
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            for bindings in bindings_list:
+                engine._instantiate_pattern_into(pattern, bindings, out)
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        
+        growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        assert growth < count * 200
+        assert out["outgoing"] is outgoing
+        assert out == engine._instantiate_pattern(pattern, bindings_list[-1])
+        assert pattern["outgoing"] == ["$A", 7, "$B"]
 
 
 class TestRule:
@@ -0,0 +1,55 @@
+from app.llm import TokenCounter
+
+
+class FakeTokenizer:
+    """Tokenizer with one token per word that records every text it encodes."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text):
+        self.encoded.append(text)
+        return text.split()
+
+
+def test_count_text_encodes_each_text_once():
+    tokenizer = FakeTokenizer()
+    counter = TokenCounter(tokenizer)
+
+    assert counter.count_text("you are a helpful agent") == 5
+    assert counter.count_text("you are a helpful agent") == 5
+    assert counter.count_text("hello there") == 2
+    assert counter.count_text("") == 0
+    assert tokenizer.encoded == ["you are a helpful agent", "hello there"]
+
+
+def test_repeated_history_is_not_re_encoded():
+    tokenizer = FakeTokenizer()
+    counter = TokenCounter(tokenizer)
+    history = [
+        {"role": "system", "content": "you are a helpful agent"},
+        {"role": "user", "content": [{"text": "hello there"}]},
+    ]
+
+    first = counter.count_message_tokens(history)
+    encoded = len(tokenizer.encoded)
+    history.append({"role": "assistant", "content": "hi"})
+    second = counter.count_message_tokens(history)
+
+    assert second == first + TokenCounter.BASE_MESSAGE_TOKENS + 2
+    # Only the new role and message text are encoded
+    assert tokenizer.encoded[encoded:] == ["assistant", "hi"]
+
+
+def test_memo_is_bounded_and_per_counter(monkeypatch):
+    monkeypatch.setattr(TokenCounter, "TEXT_CACHE_SIZE", 2)
+    tokenizer = FakeTokenizer()
+    counter = TokenCounter(tokenizer)
+
+    for text in ["a", "b", "a", "c", "a", "b"]:
+        counter.count_text(text)
+    assert tokenizer.encoded == ["a", "b", "c", "b"]
+
+    other_tokenizer = FakeTokenizer()
+    TokenCounter(other_tokenizer).count_text("a")
+    assert other_tokenizer.encoded == ["a"]
@@ -0,0 +1,51 @@
+from app.tool.base import BaseTool, ToolResult
+from app.tool.tool_collection import ToolCollection
+
+
+class EchoTool(BaseTool):
+    name: str = "echo"
+    description: str = "Echo the input"
+
+    async def execute(self, **kwargs) -> ToolResult:
+        return ToolResult(output=str(kwargs))
+
+
+def test_to_params_reuses_cached_list():
+    tools = ToolCollection(EchoTool(), EchoTool(name="shout"))
+
+    params = tools.to_params()
+
+    assert [param["function"]["name"] for param in params] == ["echo", "shout"]
+    assert tools.to_params() is params
+
+
+def test_add_tool_rebuilds_params():
+    tools = ToolCollection(EchoTool())
+    params = tools.to_params()
+
+    tools.add_tool(EchoTool(name="shout"))
+    rebuilt = tools.to_params()
+
+    assert rebuilt is not params
+    assert [param["function"]["name"] for param in rebuilt] == ["echo", "shout"]
+    assert tools.to_params() is rebuilt
+
+
+def test_skipped_duplicate_keeps_params():
+    tools = ToolCollection(EchoTool())
+    params = tools.to_params()
+
+    tools.add_tool(EchoTool(description="Another echo"))
+
+    assert tools.to_params() is params
+    assert len(params) == 1
+
+
+def test_replacing_tools_tuple_rebuilds_params():
+    tools = ToolCollection(EchoTool())
+    params = tools.to_params()
+
+    tools.tools = (EchoTool(name="shout"),)
+
+    assert [param["function"]["name"] for param in tools.to_params()] == ["shout"]
+    assert params[0]["function"]["name"] == "echo"